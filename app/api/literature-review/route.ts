@@ -1,11 +1,21 @@
 import { type NextRequest, NextResponse } from "next/server"
-import { spawn } from "child_process"
+import { spawn, type ChildProcess } from "child_process"
 import path from "path"
 
+const SERVICE_HOST = process.env.PYTHON_SERVICE_HOST || "127.0.0.1"
+const SERVICE_PORT = Number(process.env.PYTHON_SERVICE_PORT || 8765)
+const SERVICE_STARTUP_TIMEOUT_MS = 15000
+
+// Keep the daemon handle on globalThis so dev-mode hot reloads reuse it
+const serviceState = globalThis as typeof globalThis & {
+  __literatureReviewService?: { process: ChildProcess | null; ready: Promise<string> | null }
+}
+
 interface LiteratureReviewRequest {
   query: string
   apiKey?: string
   model?: string
+  stream?: boolean
 }
 
 interface Article {
@@ -37,7 +47,7 @@ interface LiteratureReviewResponse {
 export async function POST(request: NextRequest) {
   try {
     const body: LiteratureReviewRequest = await request.json()
-    const { query, apiKey, model } = body
+    const { query, apiKey, model, stream } = body
 
     if (!query || typeof query !== "string") {
       return NextResponse.json({ error: "Invalid query parameter" }, { status: 400 })
@@ -69,6 +79,14 @@ export async function POST(request: NextRequest) {
       !!trimmedApiKey,
     )
 
+    if (stream) {
+      // Relay NDJSON review events (article, synthesis_field, synthesis, done, error) as they arrive
+      const upstream = await streamPythonBackend(query, finalApiKey, finalModel)
+      return new Response(upstream, {
+        headers: { "Content-Type": "application/x-ndjson", "Cache-Control": "no-cache" },
+      })
+    }
+
     // Call Python backend service
     const response = await callPythonBackend(query, finalApiKey, finalModel)
     return NextResponse.json(response)
@@ -80,71 +98,150 @@ export async function POST(request: NextRequest) {
 }
 
 async function callPythonBackend(query: string, apiKey: string, model: string): Promise<LiteratureReviewResponse> {
-  return new Promise((resolve, reject) => {
-    const pythonScriptPath = path.join(process.cwd(), "scripts", "literature_review_service.py")
+  const serviceUrl = await ensurePythonService()
+
+  const response = await fetch(`${serviceUrl}/review`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ query, apiKey, model }),
+  })
 
-    let pythonPath = process.env.PYTHON_PATH || "python"
+  const data = await response.json()
+  if (!response.ok) {
+    console.error("[v0] Python service error:", data.error)
+    throw new Error(`Python service failed: ${data.error || response.statusText}`)
+  }
+
+  console.log("[v0] Successfully received Python service response")
+  return data
+}
+
+async function streamPythonBackend(query: string, apiKey: string, model: string): Promise<ReadableStream<Uint8Array>> {
+  const serviceUrl = await ensurePythonService()
 
-    // Try common Python installation paths on Windows if python3 is not available
-    if (process.platform === "win32") {
-      if (!pythonPath || pythonPath === "python") {
-        pythonPath = "C:\\Users\\user\\anaconda3\\envs\\myenv\\python.exe"
-      }
+  const response = await fetch(`${serviceUrl}/review/stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ query, apiKey, model }),
+  })
+
+  if (!response.ok || !response.body) {
+    const data = await response.json().catch(() => ({}))
+    console.error("[v0] Python service stream error:", data.error)
+    throw new Error(`Python service failed: ${data.error || response.statusText}`)
+  }
+
+  return response.body
+}
+
+async function isServiceHealthy(serviceUrl: string): Promise<boolean> {
+  try {
+    const response = await fetch(`${serviceUrl}/health`, { signal: AbortSignal.timeout(1000) })
+    return response.ok
+  } catch {
+    return false
+  }
+}
+
+function resolvePythonPath(): string {
+  let pythonPath = process.env.PYTHON_PATH || "python"
+
+  // Try common Python installation paths on Windows if python3 is not available
+  if (process.platform === "win32") {
+    if (!pythonPath || pythonPath === "python") {
+      pythonPath = "C:\\Users\\user\\anaconda3\\envs\\myenv\\python.exe"
     }
+  }
+
+  return pythonPath
+}
+
+async function ensurePythonService(): Promise<string> {
+  // An externally managed service takes precedence over the spawned daemon
+  if (process.env.PYTHON_SERVICE_URL) {
+    return process.env.PYTHON_SERVICE_URL.replace(/\/$/, "")
+  }
 
-    console.log("[v0] Spawning Python process with environment variables")
-    console.log("[v0] Python path:", pythonPath)
-
-    const pythonProcess = spawn(pythonPath, [pythonScriptPath], {
-      env: {
-        ...process.env,
-        OPENROUTER_API_KEY: apiKey,
-        QUERY: query,
-        MODEL: model,
-      },
-    })
-
-    let stdout = ""
-    let stderr = ""
-
-    pythonProcess.stdout?.on("data", (data) => {
-      stdout += data.toString()
-      console.log("[v0] Python stdout:", data.toString())
-    })
-
-    pythonProcess.stderr?.on("data", (data) => {
-      stderr += data.toString()
-      console.error("[v0] Python stderr:", data.toString())
-    })
-
-    pythonProcess.on("close", (code) => {
-      if (code !== 0) {
-        console.error("[v0] Python process failed with code:", code, "stderr:", stderr)
-        reject(new Error(`Python process failed: ${stderr || "Unknown error"}`))
-        return
-      }
-
-      try {
-        // Extract JSON from stdout
-        const jsonMatch = stdout.match(/\{[\s\S]*\}/)
-        if (!jsonMatch) {
-          console.error("[v0] No JSON output found in stdout:", stdout)
-          reject(new Error("No JSON output from Python service"))
-          return
-        }
-
-        const result = JSON.parse(jsonMatch[0])
-        console.log("[v0] Successfully parsed Python response")
-        resolve(result)
-      } catch (error) {
-        console.error("[v0] Failed to parse Python output:", error, "stdout:", stdout)
-        reject(new Error(`Failed to parse Python output: ${error}`))
-      }
-    })
-
-    pythonProcess.on("error", (error) => {
-      console.error("[v0] Failed to spawn Python process:", error)
-      reject(new Error(`Failed to spawn Python process: ${error.message}`))
-    })
+  const serviceUrl = `http://${SERVICE_HOST}:${SERVICE_PORT}`
+  const state = (serviceState.__literatureReviewService ??= { process: null, ready: null })
+
+  if (state.ready) {
+    const url = await state.ready
+    if (await isServiceHealthy(url)) {
+      return url
+    }
+    console.warn("[v0] Python service is not responding, restarting")
+    state.process?.kill()
+    state.process = null
+    state.ready = null
+  }
+
+  state.ready = startPythonService(serviceUrl, state).catch((error) => {
+    state.ready = null
+    throw error
+  })
+  return state.ready
+}
+
+async function startPythonService(
+  serviceUrl: string,
+  state: { process: ChildProcess | null },
+): Promise<string> {
+  if (await isServiceHealthy(serviceUrl)) {
+    console.log("[v0] Reusing running Python service at", serviceUrl)
+    return serviceUrl
+  }
+
+  const pythonScriptPath = path.join(process.cwd(), "scripts", "literature_review_service.py")
+  const pythonPath = resolvePythonPath()
+
+  console.log("[v0] Starting persistent Python service")
+  console.log("[v0] Python path:", pythonPath)
+
+  const pythonProcess = spawn(
+    pythonPath,
+    [pythonScriptPath, "--serve", "--host", SERVICE_HOST, "--port", String(SERVICE_PORT)],
+    { env: process.env },
+  )
+  state.process = pythonProcess
+
+  let spawnError: Error | null = null
+
+  pythonProcess.stdout?.on("data", (data) => {
+    console.log("[v0] Python stdout:", data.toString())
   })
+
+  pythonProcess.stderr?.on("data", (data) => {
+    console.error("[v0] Python stderr:", data.toString())
+  })
+
+  pythonProcess.on("exit", (code) => {
+    console.error("[v0] Python service exited with code:", code)
+    if (state.process === pythonProcess) {
+      state.process = null
+    }
+  })
+
+  pythonProcess.on("error", (error) => {
+    console.error("[v0] Failed to spawn Python process:", error)
+    spawnError = new Error(`Failed to spawn Python process: ${error.message}`)
+  })
+
+  const deadline = Date.now() + SERVICE_STARTUP_TIMEOUT_MS
+  while (Date.now() < deadline) {
+    if (spawnError) {
+      throw spawnError
+    }
+    if (pythonProcess.exitCode !== null) {
+      throw new Error(`Python service exited during startup with code ${pythonProcess.exitCode}`)
+    }
+    if (await isServiceHealthy(serviceUrl)) {
+      console.log("[v0] Python service ready at", serviceUrl)
+      return serviceUrl
+    }
+    await new Promise((resolve) => setTimeout(resolve, 200))
+  }
+
+  pythonProcess.kill()
+  throw new Error("Timed out waiting for Python service to start")
 }
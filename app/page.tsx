@@ -53,7 +53,7 @@ export default function Home() {
     setReview(null)
 
     try {
-      const body: any = { query: searchQuery }
+      const body: any = { query: searchQuery, stream: true }
 
       if (customApiKey?.trim()) {
         console.log("[v0] Using custom API key")
@@ -74,14 +74,44 @@ export default function Home() {
         body: JSON.stringify(body),
       })
 
-      const data = await response.json()
-
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
+        const data = await response.json().catch(() => ({}))
         const errorMessage = data.error || `API error: ${response.statusText}`
         throw new Error(errorMessage)
       }
 
-      setReview(data)
+      // Render articles and synthesis fields as soon as the backend emits them
+      const current: LiteratureReview = {
+        articles: [],
+        synthesis: { fieldOverview: "", gapsAndChallenges: "", futureDirections: "" },
+      }
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+      let buffered = ""
+
+      while (true) {
+        const { value, done } = await reader.read()
+        if (done) break
+
+        buffered += value
+        const lines = buffered.split("\n")
+        buffered = lines.pop() ?? ""
+
+        for (const line of lines) {
+          if (!line.trim()) continue
+          const event = JSON.parse(line)
+
+          if (event.type === "article") {
+            current.articles = [...current.articles, event.article]
+          } else if (event.type === "synthesis_field") {
+            current.synthesis = { ...current.synthesis, [event.field]: event.value }
+          } else if (event.type === "synthesis") {
+            current.synthesis = event.synthesis
+          } else if (event.type === "error") {
+            throw new Error(event.error)
+          }
+          setReview({ ...current })
+        }
+      }
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : "Failed to generate literature review"
       setError(errorMessage)
@@ -139,7 +169,7 @@ export default function Home() {
         )}
 
         {/* Loading State */}
-        {loading && (
+        {loading && !review && (
           <div className="flex flex-col items-center justify-center py-16">
             <Spinner className="mb-4" />
             <p className="text-muted-foreground">Generating literature review...</p>
@@ -147,7 +177,7 @@ export default function Home() {
         )}
 
         {/* Results */}
-        {review && !loading && (
+        {review && (
           <div className="space-y-8">
             {/* Articles */}
             <div>
@@ -166,6 +196,13 @@ export default function Home() {
               </div>
               <SynthesisSection synthesis={review.synthesis} />
             </div>
+
+            {loading && (
+              <div className="flex items-center justify-center gap-3 py-8">
+                <Spinner />
+                <p className="text-muted-foreground">Receiving more results...</p>
+              </div>
+            )}
           </div>
         )}
 
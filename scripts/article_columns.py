@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Columnar Article Collections
+Array-backed storage of articles across many reviews, with streaming NDJSON
+and Parquet/Arrow export for bulk runs
+
+Usage:
+    python scripts/article_columns.py articles.parquet               # from the review store
+    python scripts/article_columns.py articles.ndjson --reviews batch.ndjson
+"""
+
+import argparse
+import json
+import os
+import sys
+from array import array
+from typing import IO, Iterable, Iterator
+
+from review_core import ARTICLE_FIELDS, CAMEL_NAMES
+
+# Export columns: review context followed by the canonical snake_case article fields
+REVIEW_COLUMNS = ("query", "generated_at")
+ARTICLE_COLUMNS = ARTICLE_FIELDS
+COLUMNS = REVIEW_COLUMNS + ARTICLE_COLUMNS
+
+_MISSING_YEAR = -1
+
+
+def _field(article: dict, name: str):
+    value = article.get(name)
+    if value is None:
+        # Reviews exported by the service use camelCase field names
+        return article.get(CAMEL_NAMES[name])
+    return value
+
+
+class ArticleColumns:
+    """
+    Column-oriented article collection
+
+    Each field is one Python list (years are a compact int array), so a bulk
+    export holds one list per column instead of one dict per article and can
+    be handed to Arrow without building row objects.
+    """
+
+    def __init__(self):
+        self.columns = {name: [] for name in COLUMNS if name != "publication_year"}
+        self.years = array("i")
+
+    def __len__(self) -> int:
+        return len(self.years)
+
+    def append(self, article: dict, query: str = "", generated_at: str = ""):
+        """Append one article (snake_case or camelCase fields) with its review context"""
+        columns = self.columns
+        columns["query"].append(query)
+        columns["generated_at"].append(generated_at)
+        for name in ARTICLE_COLUMNS:
+            if name == "publication_year":
+                try:
+                    self.years.append(int(_field(article, name)))
+                except (TypeError, ValueError):
+                    self.years.append(_MISSING_YEAR)
+            else:
+                columns[name].append(_field(article, name))
+
+    def extend_review(self, review: dict):
+        """Append every article of a review dict ({"query", "generated_at", "articles"})"""
+        query = review.get("query", "")
+        generated_at = review.get("generated_at", "")
+        for article in review.get("articles", []):
+            self.append(article, query, generated_at)
+
+    def iter_rows(self) -> Iterator[dict]:
+        """Yield one dict per article, built lazily"""
+        names = list(self.columns)
+        for index, values in enumerate(zip(*self.columns.values())):
+            row = dict(zip(names, values))
+            year = self.years[index]
+            row["publication_year"] = None if year == _MISSING_YEAR else year
+            yield row
+
+    def write_ndjson(self, fp: IO[str]) -> int:
+        """Write one JSON object per line; returns the number of rows written"""
+        return write_ndjson(self.iter_rows(), fp)
+
+    def to_arrow(self):
+        """Build a pyarrow Table straight from the column lists"""
+        pa = _import_pyarrow()
+        data = dict(self.columns)
+        data["publication_year"] = pa.array(
+            [None if year == _MISSING_YEAR else year for year in self.years], type=pa.int32()
+        )
+        return pa.table({name: data[name] for name in COLUMNS})
+
+    def write_parquet(self, path: str, compression: str = "zstd"):
+        """Write the collection as a Parquet file"""
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), path, compression=compression)
+
+
+def write_ndjson(rows: Iterable[dict], fp: IO[str]) -> int:
+    """Stream rows to fp as NDJSON without materializing them"""
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    count = 0
+    for row in rows:
+        fp.write(dumps(row))
+        fp.write("\n")
+        count += 1
+    return count
+
+
+def iter_review_rows(reviews: Iterable[dict]) -> Iterator[dict]:
+    """Flatten reviews into export rows, one per article"""
+    for review in reviews:
+        query = review.get("query", "")
+        generated_at = review.get("generated_at", "")
+        for article in review.get("articles", []):
+            row = {"query": query, "generated_at": generated_at}
+            for name in ARTICLE_COLUMNS:
+                row[name] = _field(article, name)
+            yield row
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Parquet/Arrow export requires pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def _iter_batch_reviews(path: str) -> Iterator[dict]:
+    """Read reviews from the async batch generator's NDJSON output"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get("review"):
+                yield record["review"]
+
+
+def main():
+    """Bulk-export stored or batch-generated reviews"""
+    parser = argparse.ArgumentParser(description="Export review collections as NDJSON or Parquet")
+    parser.add_argument("output", help="output path; .parquet selects Parquet, anything else NDJSON ('-' for stdout)")
+    parser.add_argument("--reviews", help="NDJSON output of async_review_generator.py (default: the review store)")
+    parser.add_argument("--store", help="review store path (default: LITREVIEW_STORE_PATH)")
+    args = parser.parse_args()
+
+    if args.reviews:
+        reviews = _iter_batch_reviews(args.reviews)
+    else:
+        from review_store import DEFAULT_STORE_PATH, ReviewStore
+
+        store = ReviewStore(args.store or os.getenv("LITREVIEW_STORE_PATH", DEFAULT_STORE_PATH))
+        reviews = store.iter_reviews()
+
+    if args.output.endswith(".parquet"):
+        columns = ArticleColumns()
+        for review in reviews:
+            columns.extend_review(review)
+        columns.write_parquet(args.output)
+        count = len(columns)
+    elif args.output == "-":
+        count = write_ndjson(iter_review_rows(reviews), sys.stdout)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            count = write_ndjson(iter_review_rows(reviews), f)
+
+    print(f"Exported {count} articles to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
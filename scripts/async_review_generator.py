@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Async Batch Literature Review Generator
+Generates reviews for many queries concurrently with bounded concurrency,
+per-model rate limiting and per-query failure isolation
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import httpx
+
+from literature_review_generator import Colors, LiteratureReviewGenerator
+from openrouter_transport import RETRY_STATUS_CODES, auth_headers
+from query_file import read_queries
+from review_metrics import metrics
+from token_budget import estimate_tokens
+from review_core import DEFAULT_MODEL, LiteratureReview, build_review, normalize_synthesis, parse_articles, parse_synthesis
+
+
+class RateLimiter:
+    """Token-bucket limiter for requests per minute and tokens per minute"""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_allowance = requests_per_minute
+        self._token_allowance = tokens_per_minute
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed_minutes = (now - self._updated) / 60
+        self._updated = now
+        self._request_allowance = min(
+            self.requests_per_minute, self._request_allowance + elapsed_minutes * self.requests_per_minute
+        )
+        self._token_allowance = min(
+            self.tokens_per_minute, self._token_allowance + elapsed_minutes * self.tokens_per_minute
+        )
+
+    async def acquire(self, tokens: int):
+        """Wait until one request and `tokens` tokens fit into the per-minute budget"""
+        # A single request larger than the whole budget would otherwise wait forever
+        tokens = min(tokens, self.tokens_per_minute)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._request_allowance >= 1 and self._token_allowance >= tokens:
+                    self._request_allowance -= 1
+                    self._token_allowance -= tokens
+                    return
+                request_wait = (1 - self._request_allowance) / self.requests_per_minute * 60
+                token_wait = (tokens - self._token_allowance) / self.tokens_per_minute * 60
+                await asyncio.sleep(max(request_wait, token_wait, 0.01))
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one query in a batch run"""
+    query: str
+    review: Optional[LiteratureReview]
+    error: Optional[str]
+    elapsed: float
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP date), if any"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AsyncLiteratureReviewGenerator(LiteratureReviewGenerator):
+    """Asyncio variant of LiteratureReviewGenerator built on httpx"""
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = DEFAULT_MODEL,
+        requests_per_minute: float = 60,
+        tokens_per_minute: float = 200000,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+    ):
+        """
+        Initialize the async generator
+
+        Args:
+            api_key: OpenRouter API key
+            model: LLM model to use
+            requests_per_minute: Request budget for the model
+            tokens_per_minute: Token budget (prompt estimate + max_tokens) for the model
+            max_retries: Retries for connection errors and 429/5xx responses
+            backoff_factor: Exponential backoff base in seconds between retries
+        """
+        # Batch runs never render, so leave the process-wide Colors untouched
+        super().__init__(api_key, model=model)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._limiters: dict[str, RateLimiter] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _limiter_for(self, model: str) -> RateLimiter:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = RateLimiter(self.requests_per_minute, self.tokens_per_minute)
+            self._limiters[model] = limiter
+        return limiter
+
+    async def _make_request_async(
+        self,
+        payload: dict,
+        parse: Callable[[str], object],
+        on_usage: Optional[Callable[[dict], None]] = None,
+    ):
+        """Async counterpart of RequestEngine.complete with rate limiting and retries"""
+        engine = self.engine
+        cached_content = engine.cached(payload)
+        if cached_content is not None:
+            return parse(cached_content)
+
+        # Local prompt estimate plus the completion ceiling
+        estimated_tokens = sum(estimate_tokens(message["content"]) for message in payload["messages"])
+        estimated_tokens += payload["max_tokens"]
+        limiter = self._limiter_for(self.model)
+
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire(estimated_tokens)
+            started = time.perf_counter()
+            delay = self.backoff_factor * (2 ** attempt)
+            try:
+                response = await self._client.post(engine.base_url, headers=auth_headers(engine.api_key), json=payload)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    metrics.record_response(self.model, 0, retries=attempt)
+                    raise Exception(f"API request failed: {str(e)}")
+            else:
+                metrics.record_stage("request", time.perf_counter() - started, model=self.model)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                    if response.status_code != 200:
+                        metrics.record_response(self.model, response.status_code, retries=attempt)
+                        raise Exception(f"OpenRouter API error: {response.status_code} - {response.text}")
+                    try:
+                        data = response.json()
+                    except ValueError:
+                        data = None  # reported as a response without content
+                    return engine.accept_completion(payload, data, response.status_code, attempt, parse, on_usage)
+                delay = max(delay, retry_after(response) or 0.0)
+            await asyncio.sleep(delay)
+
+        raise Exception("API request failed: retries exhausted")
+
+    async def generate_review_async(self, query: str, num_articles: int = 5) -> LiteratureReview:
+        """Generate one literature review without blocking the event loop"""
+        strategy = self.strategy
+        budget = self.engine.budget
+        usage = {}
+        try:
+            articles = await self._make_request_async(
+                strategy.articles_payload(self.engine, query, num_articles), parse_articles, usage.update
+            )
+            budget.observe_articles(len(articles), usage)
+        except json.JSONDecodeError:
+            articles = []
+
+        usage = {}
+        try:
+            synthesis_data = await self._make_request_async(
+                strategy.synthesis_payload(self.engine, query, articles), parse_synthesis, usage.update
+            )
+            budget.observe_synthesis(usage)
+        except json.JSONDecodeError:
+            synthesis_data = normalize_synthesis({})
+
+        return build_review(query, articles[:num_articles], synthesis_data)
+
+    async def generate_reviews(
+        self,
+        queries: list,
+        concurrency: int = 4,
+        num_articles: int = 5,
+        on_result: Optional[Callable[[BatchResult], None]] = None,
+    ) -> list:
+        """
+        Generate reviews for many queries concurrently
+
+        Args:
+            queries: Research queries to review
+            concurrency: Maximum number of reviews in flight
+            num_articles: Number of articles per review
+            on_result: Called with each BatchResult as soon as it completes
+
+        Returns:
+            BatchResult list in the same order as `queries`; a failing query
+            records its error without affecting the others
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2)
+
+        async def run(query: str) -> BatchResult:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    review = await self.generate_review_async(query, num_articles)
+                    result = BatchResult(query, review, None, time.perf_counter() - started)
+                except Exception as e:
+                    result = BatchResult(query, None, str(e), time.perf_counter() - started)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+            self._client = client
+            try:
+                return await asyncio.gather(*(run(query) for query in queries))
+            finally:
+                self._client = None
+
+
+def main():
+    """Batch CLI entry point"""
+    parser = argparse.ArgumentParser(description="Generate literature reviews for many queries concurrently")
+    parser.add_argument("queries_file", nargs="?", default="-", help="file with one query per line (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="NDJSON output file (default: stdout)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("-n", "--num-articles", type=int, default=5)
+    parser.add_argument("--model", default=os.getenv("MODEL", DEFAULT_MODEL))
+    parser.add_argument("--rpm", type=float, default=60, help="requests per minute for the model")
+    parser.add_argument("--tpm", type=float, default=200000, help="tokens per minute for the model")
+    args = parser.parse_args()
+
+    api_key = os.getenv('OPENROUTER_API_KEY')
+    if not api_key:
+        print(f"{Colors.ERROR}Error: OPENROUTER_API_KEY environment variable not set{Colors.RESET}", file=sys.stderr)
+        sys.exit(1)
+
+    queries = read_queries(args.queries_file)
+    generator = AsyncLiteratureReviewGenerator(
+        api_key, model=args.model, requests_per_minute=args.rpm, tokens_per_minute=args.tpm
+    )
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    completed = 0
+    started = time.perf_counter()
+
+    def write_result(result: BatchResult):
+        nonlocal completed
+        completed += 1
+        record = {"query": result.query, "elapsed": round(result.elapsed, 3)}
+        if result.review is not None:
+            record["review"] = vars(result.review)
+        else:
+            record["error"] = result.error
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+        status = "ok" if result.error is None else f"failed: {result.error}"
+        print(f"[{completed}/{len(queries)}] {result.query} ({result.elapsed:.1f}s) {status}", file=sys.stderr)
+
+    try:
+        results = asyncio.run(generator.generate_reviews(
+            queries, concurrency=args.concurrency, num_articles=args.num_articles, on_result=write_result
+        ))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    failures = sum(1 for result in results if result.error is not None)
+    elapsed = time.perf_counter() - started
+    print(
+        f"Completed {len(results) - failures}/{len(results)} reviews in {elapsed:.1f}s "
+        f"({len(results) / elapsed if elapsed else 0:.2f} reviews/s)",
+        file=sys.stderr,
+    )
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
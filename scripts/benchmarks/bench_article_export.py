@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Article Export Benchmark
+Compares memory and throughput of the previous dataclass -> asdict -> indented
+json.dump path against slotted articles with columnar NDJSON/Parquet export
+
+Usage:
+    python scripts/benchmarks/bench_article_export.py [--articles 200000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_columns import ArticleColumns, iter_review_rows, write_ndjson  # noqa: E402
+from review_core import Article, article_to_dict  # noqa: E402
+
+
+@dataclass
+class LegacyArticle:
+    """The article record as it was before __slots__"""
+    title: str
+    authors: list
+    publication_year: int
+    venue: str
+    doi: Optional[str]
+    abstract: str
+    keywords: list
+    research_goal: str
+    methodology: str
+    main_results: str
+    key_contributions: str
+    limitations: str
+    confidence: str
+    source: str
+
+
+def raw_article(index: int) -> dict:
+    return {
+        "title": f"Transformer OCR for Historical Documents {index}",
+        "authors": ["Author One", "Author Two"],
+        "publication_year": 2015 + index % 10,
+        "venue": "ICDAR",
+        "doi": f"10.1000/{index}",
+        "abstract": "We study handwritten text recognition on degraded scans.",
+        "keywords": ["ocr", "transformers"],
+        "research_goal": "Improve recognition accuracy",
+        "methodology": "Encoder-decoder transformer",
+        "main_results": "CER reduced by 12%",
+        "key_contributions": "New pretraining scheme",
+        "limitations": "Limited to Latin scripts",
+        "confidence": "high",
+        "source": "arXiv",
+    }
+
+
+def legacy_path(raw: list, out_path: str):
+    articles = [LegacyArticle(**a) for a in raw]
+    review = {"query": "q", "articles": [asdict(a) for a in articles], "synthesis": {}}
+    # display_review used to rebuild every Article from its dict
+    rebuilt = [LegacyArticle(**a) for a in review["articles"]]
+    with open(out_path, "w") as f:
+        json.dump(review, f, indent=2)
+    return len(rebuilt)
+
+
+def ndjson_path(raw: list, out_path: str):
+    articles = [Article(**a) for a in raw]
+    review = {"query": "q", "generated_at": "", "articles": [article_to_dict(a) for a in articles]}
+    with open(out_path, "w") as f:
+        return write_ndjson(iter_review_rows([review]), f)
+
+
+def parquet_path(raw: list, out_path: str):
+    columns = ArticleColumns()
+    for article in raw:
+        columns.append(article_to_dict(Article(**article)), "q", "")
+    columns.write_parquet(out_path)
+    return len(columns)
+
+
+def measure(fn, raw: list, out_path: str) -> tuple:
+    tracemalloc.start()
+    started = time.perf_counter()
+    fn(raw, out_path)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, os.path.getsize(out_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk article export paths")
+    parser.add_argument("--articles", type=int, default=200000)
+    args = parser.parse_args()
+
+    raw = [raw_article(i) for i in range(args.articles)]
+    paths = {"legacy asdict+indent": legacy_path, "slots+ndjson stream": ndjson_path}
+    try:
+        import pyarrow  # noqa: F401
+        paths["columns+parquet"] = parquet_path
+    except ImportError:
+        print("pyarrow not installed; skipping Parquet", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'path':<24}{'seconds':>10}{'articles/s':>14}{'peak MB':>10}{'file MB':>10}")
+        for name, fn in paths.items():
+            elapsed, peak, size = measure(fn, raw, os.path.join(tmp, name.replace(" ", "_")))
+            print(
+                f"{name:<24}{elapsed:>10.2f}{args.articles / elapsed:>14.0f}"
+                f"{peak / 2**20:>10.1f}{size / 2**20:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
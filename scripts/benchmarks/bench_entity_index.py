@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Entity Index Benchmark
+Feeds synthetic articles with re-spelled duplicate titles, author name
+variants and venue variants into the entity index, and reports insert
+throughput as the index grows, near-duplicate lookup latency, duplicate
+precision/recall and how many spelling variants resolve to one entity
+
+Usage:
+    python scripts/benchmarks/bench_entity_index.py [--records 100000] [--duplicate-rate 0.1]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entity_index import EntityIndex  # noqa: E402
+from semantic_cache import load_numpy  # noqa: E402
+
+VENUE_VARIANTS = [
+    ("NeurIPS {year}", "NIPS", "Advances in Neural Information Processing Systems {volume}"),
+    ("ICML {year}", "Proceedings of the {volume}th International Conference on Machine Learning"),
+    ("CVPR {year}", "IEEE/CVF Conference on Computer Vision and Pattern Recognition (CVPR)"),
+    ("IEEE TPAMI", "IEEE Transactions on Pattern Analysis and Machine Intelligence"),
+    ("ICDAR {year}", "International Conference on Document Analysis and Recognition (ICDAR)"),
+    ("ACL {year}", "Proceedings of the {volume}th Annual Meeting of the Association for Computational Linguistics"),
+    ("Pattern Recognition",),
+    ("Journal of Machine Learning Research", "JMLR"),
+]
+
+
+def make_words(count: int, rng: random.Random) -> list:
+    syllables = [c + v for c in "bcdfghklmnprstvz" for v in "aeiou"]
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def author_variant(given: str, middle: str, family: str, rng: random.Random) -> str:
+    return rng.choice((
+        f"{given} {middle}. {family}",
+        f"{given} {family}",
+        f"{given[0]}. {family}",
+        f"{family}, {given}",
+        f"{family}, {given[0]}. {middle}.",
+    ))
+
+
+def respell(title: str, rng: random.Random) -> str:
+    """A duplicate as another source or model would write it"""
+    variant = rng.choice((title.lower(), title.upper(), title.replace(" ", "-", 1), title + "."))
+    if rng.random() < 0.5:
+        # One typo: two adjacent letters swapped
+        position = rng.randrange(1, len(variant) - 2)
+        variant = variant[:position] + variant[position + 1] + variant[position] + variant[position + 2:]
+    return variant
+
+
+def generate(count: int, duplicate_rate: float, seed: int):
+    """Yield (article, original index or None) pairs"""
+    rng = random.Random(seed)
+    words = make_words(20000, rng)
+    keywords = [" ".join(rng.sample(words, rng.randint(1, 2))) for _ in range(500)]
+    people = [
+        (rng.choice(words).capitalize(), rng.choice("ABCDEFGHJKLMNPRSTW"), rng.choice(words).capitalize())
+        for _ in range(20000)
+    ]
+    originals = []
+    for index in range(count):
+        if originals and rng.random() < duplicate_rate:
+            source_index = rng.randrange(len(originals))
+            original = originals[source_index]
+            article = dict(original, title=respell(original["title"], rng), doi=None)
+            article["authors"] = [author_variant(*person, rng) for person in original["_people"]]
+            yield article, source_index
+            continue
+        people_idx = rng.sample(range(len(people)), rng.randint(1, 5))
+        venue = rng.choice(VENUE_VARIANTS)
+        year = rng.randint(2000, 2025)
+        article = {
+            "title": " ".join(rng.choice(words) for _ in range(rng.randint(6, 12))).capitalize(),
+            "authors": [author_variant(*people[i], rng) for i in people_idx],
+            "_people": [people[i] for i in people_idx],
+            "publication_year": year,
+            "venue": rng.choice(venue).format(year=year, volume=year - 1986),
+            "doi": f"10.9999/bench.{index}",
+            "keywords": rng.sample(keywords[:50], 2) + rng.sample(keywords, rng.randint(1, 3)),
+        }
+        originals.append(article)
+        yield article, None
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark entity resolution over synthetic articles")
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--lookups", type=int, default=500)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    index = EntityIndex(os.path.join(tmpdir.name, "entities.sqlite3"))
+    print(f"MinHash backend: {'numpy' if load_numpy() is not None else 'python'}\n")
+    print(f"{'indexed':>10}{'articles/s':>12}")
+
+    originals = []  # (article, canonical id) of every non-duplicate record, in order
+    counts = {"true_positive": 0, "false_negative": 0, "false_positive": 0, "duplicates": 0}
+    batch = []
+
+    def flush():
+        started = time.perf_counter()
+        results = index.add_many(article for article, _ in batch)
+        rate = len(batch) / (time.perf_counter() - started)
+        for (article, source), result in zip(batch, results):
+            if source is None:
+                originals.append((article, result.canonical_id))
+                counts["false_positive"] += result.duplicate
+            else:
+                counts["duplicates"] += 1
+                found = result.duplicate and result.canonical_id == originals[source][1]
+                counts["true_positive" if found else "false_negative"] += 1
+        print(f"{len(originals) + counts['duplicates']:>10}{rate:>12.0f}")
+        batch.clear()
+
+    for record in generate(args.records, args.duplicate_rate, seed=7):
+        batch.append(record)
+        if len(batch) >= args.batch:
+            flush()
+    if batch:
+        flush()
+
+    rng = random.Random(11)
+    latencies = []
+    for _ in range(args.lookups):
+        title = respell(rng.choice(originals)[0]["title"], rng)
+        started = time.perf_counter()
+        index.similar(title, 5)
+        latencies.append(time.perf_counter() - started)
+    print(
+        f"\nsimilar() latency: p50 {statistics.median(latencies) * 1000:.2f} ms, "
+        f"p95 {percentile(latencies, 0.95) * 1000:.2f} ms"
+    )
+
+    flagged = counts["true_positive"] + counts["false_positive"]
+    print(
+        f"duplicates: recall {counts['true_positive'] / max(1, counts['duplicates']):.1%}, "
+        f"precision {counts['true_positive'] / max(1, flagged):.1%} "
+        f"({counts['false_positive']} originals wrongly merged)"
+    )
+
+    people = {tuple(person) for article, _ in originals[:2000] for person in article["_people"]}
+    unified = sum(
+        1 for person in people
+        if len({index.lookup("author", author_variant(*person, rng))["key"] for _ in range(8)}) == 1
+    )
+    print(f"authors: {unified / len(people):.1%} of {len(people)} authors resolve all spellings to one entity")
+    venue_entities = [
+        len({index.lookup("venue", variant.format(year=2017, volume=31))["key"] for variant in variants})
+        for variants in VENUE_VARIANTS
+    ]
+    print(f"venues: {len(VENUE_VARIANTS)} venues with {sum(map(len, VENUE_VARIANTS))} spellings "
+          f"-> {sum(venue_entities)} entities")
+    print(f"index: {index.stats()}")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
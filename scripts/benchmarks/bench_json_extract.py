@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+JSON Extraction Benchmark
+Compares json_extract against the previous regex/split fallbacks on large,
+wrapped, malformed and truncated completions
+
+Usage:
+    python scripts/benchmarks/bench_json_extract.py [--articles 2000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_extract import extract_json  # noqa: E402
+
+
+def make_article(index: int) -> dict:
+    return {
+        "title": f"Transformer OCR for Historical Documents [{index}]",
+        "authors": ["Author One", "Author Two"],
+        "publication_year": 2015 + index % 10,
+        "venue": "ICDAR",
+        "doi": f"10.1000/{index}",
+        "abstract": "We study {handwritten} text recognition on [degraded] scans. " * 4,
+        "keywords": ["ocr", "transformers", "historical documents"],
+        "research_goal": "Improve recognition accuracy",
+        "methodology": "Encoder-decoder transformer",
+        "main_results": "CER reduced by 12%",
+        "key_contributions": "New pretraining scheme",
+        "limitations": "Limited to Latin scripts",
+        "confidence": "high",
+        "source": "arXiv",
+    }
+
+
+def build_cases(num_articles: int) -> dict:
+    articles = [make_article(i) for i in range(num_articles)]
+    clean = json.dumps(articles, indent=2)
+    prose = "Here are the articles you asked for (see [1] and [2]):\n```json\n" + clean + "\n```\nLet me know [if needed]."
+    trailing = clean.replace("\n  }", ",\n  }").replace('"ocr"', "“ocr”")
+    truncated = clean[: int(len(clean) * 0.9)]
+    return {"clean": clean, "prose+fence": prose, "trailing commas+smart quotes": trailing, "truncated": truncated}
+
+
+def legacy_regex(text: str):
+    """Previous generator fallback: greedy bracket regex"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        match = re.search(r'\[.*\]', text, re.DOTALL)
+        return json.loads(match.group()) if match else []
+
+
+def legacy_split(text: str):
+    """Previous service fallback: split on fences, then first/last brace"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        if "```json" in text:
+            return json.loads(text.split("```json")[1].split("```")[0].strip())
+        elif "```" in text:
+            return json.loads(text.split("```")[1].split("```")[0].strip())
+        elif "[" in text:
+            return json.loads(text[text.find("[") : text.rfind("]") + 1])
+        raise
+
+
+def run(fn, text: str, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        try:
+            result = fn(text)
+        except (json.JSONDecodeError, AttributeError, IndexError):
+            result = None
+        best = min(best, time.perf_counter() - started)
+    recovered = len(result) if isinstance(result, list) else 0
+    return best, recovered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON extraction from LLM output")
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = build_cases(args.articles)
+    extractors = {"json_extract": extract_json, "legacy regex": legacy_regex, "legacy split": legacy_split}
+
+    print(f"{'case':<32}{'extractor':<16}{'size':>10}{'best ms':>10}{'articles':>10}")
+    for case, text in cases.items():
+        for name, fn in extractors.items():
+            elapsed, recovered = run(fn, text, args.repeat)
+            print(f"{case:<32}{name:<16}{len(text) // 1024:>8}KB{elapsed * 1000:>10.1f}{recovered:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Offline Pipeline Benchmark
+Drives the backend service and the CLI generator against the local mock
+OpenRouter server and reports latency percentiles, throughput, parse-failure
+rate and memory per review
+
+Usage:
+    python scripts/benchmarks/bench_pipeline.py --reviews 40 --concurrency 8
+    python scripts/benchmarks/bench_pipeline.py --malformed-rate 0.2 --error-rate 0.05
+    python scripts/benchmarks/bench_pipeline.py --json current.json --baseline baseline.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_openrouter import add_config_arguments, config_from_args, start_mock_server  # noqa: E402
+
+SCENARIOS = ("service", "service-stream", "generator", "generator-pipelined")
+QUERIES = [
+    "transformer-based OCR for historical documents",
+    "federated learning for edge computing",
+    "graph neural networks for drug discovery",
+    "social thermodynamics of learning in reinforcement learning",
+]
+# Metrics where a higher value is a regression, compared against --baseline
+REGRESSION_METRICS = ("p50", "p95", "p99", "parse_failure_rate", "memory_kb")
+
+
+def load_pipeline(base_url: str):
+    """Import the pipeline modules once the environment points them at the mock server"""
+    os.environ["OPENROUTER_BASE_URL"] = base_url
+    os.environ["LITREVIEW_CACHE"] = "0"
+    os.environ["LITREVIEW_STORE"] = "0"
+    os.environ["LITREVIEW_SEMANTIC_CACHE"] = "0"
+    os.environ.setdefault("OPENROUTER_RETRY_BACKOFF", "0.05")
+    os.environ.setdefault("OPENROUTER_POOL_SIZE", "32")
+
+    import literature_review_generator
+    import literature_review_service
+
+    return literature_review_service, literature_review_generator
+
+
+def make_runner(scenario: str, service, generator_module, num_articles: int):
+    """Return a callable that produces one review's article count for a query"""
+    if scenario.startswith("service"):
+        service_generator = service.LiteratureReviewGenerator("benchmark")
+        if scenario == "service":
+            return lambda query: len(service_generator.generate_review(query).articles)
+
+        def stream(query: str) -> int:
+            events = list(service_generator.generate_review_stream(query))
+            return sum(1 for event in events if event["type"] == "article")
+        return stream
+
+    cli_generator = generator_module.LiteratureReviewGenerator("benchmark", dark_mode=False)
+    if scenario == "generator":
+        return lambda query: len(cli_generator.generate_review(query, num_articles).articles)
+    return lambda query: len(cli_generator.generate_review_pipelined(query, num_articles).articles)
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_scenario(runner, reviews: int, concurrency: int, memory_samples: int) -> dict:
+    latencies = []
+    parse_failures = 0
+    request_failures = 0
+
+    def one(index: int):
+        started = time.perf_counter()
+        try:
+            count = runner(QUERIES[index % len(QUERIES)])
+        except Exception as e:
+            return time.perf_counter() - started, "parse" if "JSON" in str(e) or "No articles" in str(e) else "request"
+        # The lenient two-phase path returns an empty review instead of raising
+        return time.perf_counter() - started, None if count else "parse"
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for elapsed, failure in executor.map(one, range(reviews)):
+            if failure is None:
+                latencies.append(elapsed)
+            elif failure == "parse":
+                parse_failures += 1
+            else:
+                request_failures += 1
+    wall = time.perf_counter() - started
+
+    # Peak traced allocation of single reviews, measured serially
+    peaks = []
+    tracemalloc.start()
+    for index in range(memory_samples):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        one(index)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    return {
+        "reviews": reviews,
+        "ok": len(latencies),
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "throughput": len(latencies) / wall if wall else 0.0,
+        "parse_failure_rate": parse_failures / reviews if reviews else 0.0,
+        "request_failure_rate": request_failures / reviews if reviews else 0.0,
+        "memory_kb": sum(peaks) / len(peaks) / 1024 if peaks else 0.0,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return human-readable regressions of results against a baseline report"""
+    regressions = []
+    for scenario, metrics in results.items():
+        previous = baseline.get(scenario)
+        if not previous:
+            continue
+        for name in REGRESSION_METRICS:
+            if metrics[name] > previous[name] * (1 + tolerance) + 1e-9 and metrics[name] - previous[name] > 1e-3:
+                regressions.append(f"{scenario} {name}: {previous[name]:.3f} -> {metrics[name]:.3f}")
+        if metrics["throughput"] < previous["throughput"] * (1 - tolerance):
+            regressions.append(f"{scenario} throughput: {previous['throughput']:.2f} -> {metrics['throughput']:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the review pipeline against a mock OpenRouter server")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"comma-separated subset of {SCENARIOS}")
+    parser.add_argument("--reviews", type=int, default=20, help="reviews per scenario")
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("-n", "--num-articles", type=int, default=5)
+    parser.add_argument("--memory-samples", type=int, default=3)
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--baseline", help="previous --json report; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = start_mock_server(config_from_args(args))
+    service, generator_module = load_pipeline(server.base_url)
+
+    print(
+        f"{'scenario':<22}{'ok':>6}{'p50 s':>8}{'p95 s':>8}{'p99 s':>8}{'rev/s':>8}"
+        f"{'parse fail':>12}{'req fail':>10}{'KB/review':>11}"
+    )
+    results = {}
+    for scenario in args.scenarios.split(","):
+        runner = make_runner(scenario, service, generator_module, args.num_articles)
+        # The pipeline logs and renders as it goes; keep that out of the report
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            metrics = run_scenario(runner, args.reviews, args.concurrency, args.memory_samples)
+        results[scenario] = metrics
+        print(
+            f"{scenario:<22}{metrics['ok']:>6}{metrics['p50']:>8.3f}{metrics['p95']:>8.3f}{metrics['p99']:>8.3f}"
+            f"{metrics['throughput']:>8.2f}{metrics['parse_failure_rate']:>12.1%}"
+            f"{metrics['request_failure_rate']:>10.1%}{metrics['memory_kb']:>11.0f}"
+        )
+    print(
+        f"mock server: {server.requests} requests, {server.errors} errors, {server.malformed} malformed",
+        file=sys.stderr,
+    )
+    server.shutdown()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Retrieval Benchmark
+Builds a BM25 index over synthetic records with a Zipfian vocabulary and
+reports build time, index size and query latency percentiles, plus parallel
+source fetch latency against the stub arXiv/Semantic Scholar server
+
+Usage:
+    python scripts/benchmarks/bench_retrieval.py [--records 200000] [--queries 500]
+    python scripts/benchmarks/bench_retrieval.py --records 1000000 --index /tmp/bench-index.sqlite3
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from retrieval import POSTINGS_DEPTH, ArxivSource, BM25Index, Record, Retriever, SemanticScholarSource  # noqa: E402
+from stub_sources import start_stub_server  # noqa: E402
+
+VOCABULARY = 50000
+TITLE_WORDS = 10
+ABSTRACT_WORDS = 120
+
+
+def make_words(count: int, seed: int) -> list:
+    """Distinct pronounceable pseudo-words"""
+    rng = random.Random(seed)
+    syllables = [c + v for c in "bcdfghklmnprstvz" for v in "aeiou"]
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words, key=lambda word: rng.random())
+
+
+def synthetic_records(count: int, words: list, seed: int):
+    rng = random.Random(seed)
+    cumulative = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    for index in range(count):
+        title = rng.choices(words, cum_weights=cumulative, k=TITLE_WORDS)
+        abstract = rng.choices(words, cum_weights=cumulative, k=ABSTRACT_WORDS)
+        yield Record(
+            id=f"synthetic:{index}",
+            title=" ".join(title).capitalize(),
+            authors=[f"Author {index % 997}"],
+            year=1995 + index % 30,
+            venue="Synthetic",
+            abstract=" ".join(abstract),
+            source="synthetic",
+        )
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report(label: str, latencies: list):
+    print(
+        f"{label:<28}{statistics.median(latencies) * 1000:>9.2f}{percentile(latencies, 0.95) * 1000:>9.2f}"
+        f"{percentile(latencies, 0.99) * 1000:>9.2f}{max(latencies) * 1000:>9.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local BM25 index and parallel source fetch")
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--depth", type=int, default=POSTINGS_DEPTH, help="postings kept per term")
+    parser.add_argument("--index", help="index path to build (reused when it exists); default: a temp file")
+    parser.add_argument("--source-latency", type=float, default=0.2, help="stub API latency in seconds")
+    args = parser.parse_args()
+
+    words = make_words(VOCABULARY, seed=1)
+    tmpdir = tempfile.TemporaryDirectory()
+    path = args.index or os.path.join(tmpdir.name, "bench.sqlite3")
+    if not (args.index and os.path.exists(path)):
+        started = time.perf_counter()
+        BM25Index.build(path, synthetic_records(args.records, words, seed=2), depth=args.depth)
+        print(f"Built {args.records} records in {time.perf_counter() - started:.1f}s "
+              f"({os.path.getsize(path) / 2 ** 20:.0f} MiB)")
+    index = BM25Index(path, depth=args.depth)
+
+    # Queries of 2-5 mid-frequency terms with the odd very common one, like real topic queries
+    rng = random.Random(3)
+    queries = [
+        " ".join(rng.choice(words[:50] if rng.random() < 0.2 else words[50:5000]) for _ in range(rng.randint(2, 5)))
+        for _ in range(args.queries)
+    ]
+    for query in queries[:20]:
+        index.search(query, 10)
+
+    print(f"\n{'query latency (ms)':<28}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for label, search in (("ranking only (ids)", index.search_ids), ("top-10 records", index.search)):
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            search(query, 10)
+            latencies.append(time.perf_counter() - started)
+        report(label, latencies)
+
+    # Sequential vs parallel fetch from two remote sources with the same latency
+    stub = start_stub_server(latency=args.source_latency)
+    sources = [
+        ArxivSource(f"{stub.base_url}/arxiv/api/query"),
+        SemanticScholarSource(f"{stub.base_url}/s2/graph/v1"),
+    ]
+    topics = ["federated learning", "graph neural networks drug discovery", "transformer OCR", "reinforcement learning"]
+    sequential, parallel = [], []
+    retriever = Retriever(sources)
+    for topic in topics * 3:
+        started = time.perf_counter()
+        for source in sources:
+            source.search(topic, 10)
+        sequential.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        retriever.search(topic, 10)
+        parallel.append(time.perf_counter() - started)
+    report("2 sources, sequential", sequential)
+    report("2 sources, parallel", parallel)
+    stub.shutdown()
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
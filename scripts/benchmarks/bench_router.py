@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Model Router Benchmark
+Sends the same completions through a single model and through the hedging
+router against a mock server whose primary model stalls on a fraction of
+requests, and compares tail latency
+
+Usage:
+    python scripts/benchmarks/bench_router.py [--requests 60] [--tail-rate 0.1] [--tail-latency 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_openrouter import MockConfig, start_mock_server  # noqa: E402
+from model_router import ModelRouter  # noqa: E402
+from review_core import RequestEngine, SingleShotStrategy, parse_review  # noqa: E402
+from review_metrics import metrics  # noqa: E402
+
+PRIMARY = "mock/primary"
+BACKUP = "mock/backup"
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+def run(engine: RequestEngine, requests: int, concurrency: int, stream: bool) -> dict:
+    strategy = SingleShotStrategy()
+
+    def one(index: int):
+        payload = strategy.build_payload(engine, f"router benchmark topic {index}", 5)
+        started = time.perf_counter()
+        try:
+            if stream:
+                parse_review("".join(engine.stream(payload)))
+            else:
+                engine.complete(payload, parse=parse_review)
+        except Exception:
+            return None
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one, range(requests)))
+    latencies = [latency for latency in results if latency is not None]
+    return {
+        "ok": len(latencies),
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "max": max(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare tail latency with and without the model router")
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--tail-rate", type=float, default=0.1, help="fraction of stalled requests")
+    parser.add_argument("--tail-latency", type=float, default=5.0)
+    args = parser.parse_args()
+
+    server = start_mock_server(MockConfig(
+        latency=args.latency, jitter=args.latency / 4, tokens_per_second=20000,
+        tail_rate=args.tail_rate, tail_latency=args.tail_latency, seed=7,
+    ))
+    url = f"{server.base_url}/chat/completions"
+
+    print(f"{'mode':<22}{'ok':>5}{'p50 s':>8}{'p95 s':>8}{'p99 s':>8}{'max s':>8}")
+    for mode in ("single", "single-stream", "router", "router-stream"):
+        router = ModelRouter([PRIMARY, BACKUP]) if mode.startswith("router") else None
+        engine = RequestEngine("benchmark", PRIMARY, base_url=url, router=router)
+        engine.cache = None
+        # Warm the router's latency windows so hedging uses observed p90s
+        if router is not None:
+            run(engine, 10, args.concurrency, mode.endswith("stream"))
+        result = run(engine, args.requests, args.concurrency, mode.endswith("stream"))
+        print(
+            f"{mode:<22}{result['ok']:>5}{result['p50']:>8.3f}{result['p95']:>8.3f}"
+            f"{result['p99']:>8.3f}{result['max']:>8.3f}"
+        )
+    print("\n".join(line for line in metrics.render_prometheus().splitlines()
+                    if line.startswith(("litreview_hedged", "litreview_route_wins"))), file=sys.stderr)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Semantic Cache Benchmark
+Measures near-duplicate hit rate, false-hit rate on distinct topics and
+lookup latency as the index grows
+
+Usage:
+    python scripts/benchmarks/bench_semantic_cache.py [--sizes 100,1000,10000] [--threshold 0.9]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from semantic_cache import DEFAULT_THRESHOLD, SemanticCache  # noqa: E402
+
+# (cached query, paraphrase that should reuse it)
+PARAPHRASES = [
+    ("transformer-based OCR for historical documents", "transformer OCR historical documents"),
+    ("federated learning for edge computing", "Federated Learning in Edge Computing"),
+    ("graph neural networks for drug discovery", "graph neural network drug discovery"),
+    ("reinforcement learning for robotic manipulation", "reinforcement learning robotic manipulation"),
+    ("large language models for code generation", "Large Language Models in Code Generation"),
+    ("diffusion models for image synthesis", "diffusion model image synthesis"),
+]
+# (cached query, related but different topic that must not reuse it)
+DISTINCT = [
+    ("transformer-based OCR for historical documents", "transformer NER for historical documents"),
+    ("federated learning for edge computing", "federated learning for healthcare"),
+    ("graph neural networks for drug discovery", "graph neural networks for traffic forecasting"),
+    ("reinforcement learning for robotic manipulation", "reinforcement learning for recommender systems"),
+    ("OCR for historical documents", "OCR for medical documents"),
+    ("diffusion models for image synthesis", "diffusion models for protein design"),
+]
+VOCABULARY = (
+    "learning neural network transformer graph federated quantum protein language vision robot "
+    "retrieval privacy edge causal diffusion sparse attention optimization medical legal climate "
+    "speech recommendation forecasting detection segmentation"
+).split()
+REVIEW = {"articles": [], "synthesis": {}, "generated_at": ""}
+
+
+def accuracy(threshold: float) -> tuple:
+    cache = SemanticCache(threshold=threshold)
+    for cached, _ in PARAPHRASES + DISTINCT:
+        cache.add(cached, REVIEW)
+    hits = sum(1 for _, query in PARAPHRASES if cache.lookup(query) is not None)
+    false_hits = sum(1 for _, query in DISTINCT if cache.lookup(query) is not None)
+    return hits / len(PARAPHRASES), false_hits / len(DISTINCT)
+
+
+def lookup_latency(size: int, lookups: int = 200) -> tuple:
+    rng = random.Random(size)
+    cache = SemanticCache()
+    for _ in range(size):
+        cache.add(" ".join(rng.sample(VOCABULARY, 4)), REVIEW)
+    queries = [" ".join(rng.sample(VOCABULARY, 4)) for _ in range(lookups)]
+
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        cache.lookup(query)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return statistics.mean(timings) * 1000, timings[int(len(timings) * 0.95)] * 1000, cache.summary()["backend"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the semantic query cache")
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    hit_rate, false_hit_rate = accuracy(args.threshold)
+    print(f"threshold {args.threshold}: paraphrase hit rate {hit_rate:.0%}, false-hit rate {false_hit_rate:.0%}")
+
+    print(f"{'entries':>8}{'mean ms':>10}{'p95 ms':>10}  backend")
+    for size in (int(size) for size in args.sizes.split(",")):
+        mean_ms, p95_ms, backend = lookup_latency(size)
+        print(f"{size:>8}{mean_ms:>10.3f}{p95_ms:>10.3f}  {backend}")
+
+
+if __name__ == "__main__":
+    main()
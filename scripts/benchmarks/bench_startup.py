@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures the cold import time of the service and CLI entry points with
+`python -X importtime`, fails when one exceeds its budget or loads a module
+that must stay lazy, and compares one process per query against a single
+`--query-file` process on the mock OpenRouter server
+
+Usage:
+    python scripts/benchmarks/bench_startup.py [--runs 7] [--budget-ms 120]
+    python scripts/benchmarks/bench_startup.py --queries 0   # import check only
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_openrouter import MockConfig, start_mock_server  # noqa: E402
+
+ENTRY_POINTS = ("literature_review_service", "literature_review_generator")
+# Loaded on first use only: the HTTP client by the first API request, NumPy
+# by a large semantic cache, http.server by --serve
+LAZY_MODULES = ("requests", "urllib3", "numpy", "http.server")
+QUERIES = [
+    "transformer-based OCR for historical documents",
+    "federated learning for edge computing",
+    "graph neural networks for drug discovery",
+    "reinforcement learning for robotic manipulation",
+    "self-supervised speech representation learning",
+]
+
+
+def import_profile(module: str) -> list:
+    """(name, cumulative microseconds, depth) of everything a cold import of module loads, module last"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(cumulative), (len(name) - len(name.lstrip()) - 1) // 2))
+    # Children are printed before their parent: keep the subtree after the
+    # previous top-level import (site and its .pth imports)
+    end = next(i for i, entry in enumerate(entries) if entry[0] == module and entry[2] == 0)
+    start = max((i for i in range(end) if entries[i][2] == 0), default=-1) + 1
+    return entries[start:end + 1]
+
+
+def check_imports(runs: int, budget_ms: float) -> list:
+    """Print median import time per entry point and return budget violations"""
+    failures = []
+    print(f"{'entry point':<30}{'median ms':>10}{'max ms':>9}  slowest imports")
+    for module in ENTRY_POINTS:
+        profiles = [import_profile(module) for _ in range(runs)]
+        totals = [profile[-1][1] / 1000 for profile in profiles]
+        median = statistics.median(totals)
+        last = profiles[-1]
+        slowest = sorted((entry for entry in last if entry[2] == 1), key=lambda entry: entry[1], reverse=True)[:3]
+        print(f"{module:<30}{median:>10.1f}{max(totals):>9.1f}  "
+              + ", ".join(f"{name} {cumulative / 1000:.1f}" for name, cumulative, _ in slowest))
+        if median > budget_ms:
+            failures.append(f"{module} imports in {median:.1f} ms (budget {budget_ms:.0f} ms)")
+        loaded = sorted({name for name, _, _ in last} & set(LAZY_MODULES))
+        if loaded:
+            failures.append(f"{module} eagerly imports {', '.join(loaded)}")
+    return failures
+
+
+def compare_query_file(count: int):
+    """Time `count` one-shot service processes against one --query-file process"""
+    server = start_mock_server(MockConfig(latency=0.0, jitter=0.0))
+    env = dict(
+        os.environ,
+        OPENROUTER_API_KEY="benchmark",
+        OPENROUTER_BASE_URL=server.base_url,
+        LITREVIEW_CACHE="0",
+        LITREVIEW_STORE="0",
+        LITREVIEW_SEMANTIC_CACHE="0",
+    )
+    service = os.path.join(SCRIPTS_DIR, "literature_review_service.py")
+    queries = (QUERIES * (count // len(QUERIES) + 1))[:count]
+
+    started = time.perf_counter()
+    for query in queries:
+        subprocess.run([sys.executable, service], env=dict(env, QUERY=query), capture_output=True, check=True)
+    per_process = time.perf_counter() - started
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("\n".join(queries) + "\n")
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, service, "--query-file", f.name], env=env, capture_output=True, text=True)
+    one_process = time.perf_counter() - started
+    os.unlink(f.name)
+    server.shutdown()
+
+    answered = sum(1 for line in result.stdout.splitlines() if '"articles"' in line)
+    print(f"\n{count} queries, mock API without latency")
+    print(f"  one process per query   {per_process:>7.2f}s  ({per_process / count * 1000:.0f} ms/query)")
+    print(f"  one --query-file process{one_process:>7.2f}s  ({one_process / count * 1000:.0f} ms/query, "
+          f"{answered}/{count} answered)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check entry point import time against a startup budget")
+    parser.add_argument("--runs", type=int, default=7, help="cold imports per entry point")
+    parser.add_argument("--budget-ms", type=float, default=120, help="median import time allowed per entry point")
+    parser.add_argument("--queries", type=int, default=10, help="queries for the --query-file comparison (0 skips it)")
+    args = parser.parse_args()
+
+    failures = check_imports(args.runs, args.budget_ms)
+    if args.queries:
+        compare_query_file(args.queries)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
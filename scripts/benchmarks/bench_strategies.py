@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Generation Strategy Benchmark
+Runs the single-shot and two-phase strategies on identical queries and
+compares latency, request count, token cost and article yield
+
+Usage:
+    OPENROUTER_API_KEY=... python scripts/benchmarks/bench_strategies.py [queries.txt] [-n 5] [--runs 2]
+    python scripts/benchmarks/bench_strategies.py --url http://127.0.0.1:8080/v1/chat/completions
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openrouter_transport import OPENROUTER_API_URL  # noqa: E402
+from review_core import DEFAULT_MODEL, STRATEGIES, RequestEngine  # noqa: E402
+
+DEFAULT_QUERIES = [
+    "transformer-based OCR for historical documents",
+    "federated learning for edge computing",
+    "graph neural networks for drug discovery",
+]
+
+
+def run_strategy(name: str, engine: RequestEngine, queries: list, num_articles: int, runs: int) -> dict:
+    strategy = STRATEGIES[name]()
+    latencies = []
+    articles = 0
+    failures = 0
+    before = dict(engine.usage)
+
+    for _ in range(runs):
+        for query in queries:
+            started = time.perf_counter()
+            try:
+                review = strategy.run(engine, query, num_articles)
+            except Exception as e:
+                failures += 1
+                print(f"  {name}: {query!r} failed: {e}", file=sys.stderr)
+                continue
+            latencies.append(time.perf_counter() - started)
+            articles += len(review.articles)
+
+    usage = {key: engine.usage[key] - before[key] for key in before}
+    return {
+        "latencies": latencies,
+        "articles": articles,
+        "failures": failures,
+        "requests": usage["requests"],
+        "tokens": usage["prompt_tokens"] + usage["completion_tokens"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare review generation strategies")
+    parser.add_argument("queries_file", nargs="?", help="one query per line (default: built-in queries)")
+    parser.add_argument("-n", "--num-articles", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=1, help="passes over the query list per strategy")
+    parser.add_argument("--model", default=os.getenv("MODEL", DEFAULT_MODEL))
+    parser.add_argument("--url", default=OPENROUTER_API_URL, help="chat completions endpoint")
+    args = parser.parse_args()
+
+    api_key = os.getenv("OPENROUTER_API_KEY", "benchmark")
+    if args.queries_file:
+        with open(args.queries_file, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    else:
+        queries = DEFAULT_QUERIES
+
+    print(
+        f"{'strategy':<14}{'mean s':>9}{'p50 s':>9}{'max s':>9}{'requests':>10}"
+        f"{'tokens':>10}{'tok/review':>12}{'articles':>10}{'failed':>8}"
+    )
+    for name in STRATEGIES:
+        # A fresh uncached engine per strategy so both pay for every completion
+        engine = RequestEngine(api_key, args.model, base_url=args.url)
+        engine.cache = None
+        result = run_strategy(name, engine, queries, args.num_articles, args.runs)
+        latencies = result["latencies"] or [0.0]
+        reviews = len(result["latencies"]) or 1
+        print(
+            f"{name:<14}{statistics.mean(latencies):>9.2f}{statistics.median(latencies):>9.2f}"
+            f"{max(latencies):>9.2f}{result['requests']:>10}{result['tokens']:>10}"
+            f"{result['tokens'] / reviews:>12.0f}{result['articles']:>10}{result['failures']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Synthesis Benchmark
+Synthesizes growing article sets against the mock OpenRouter server with one
+flat completion and with the map-reduce synthesis, and reports requests,
+largest prompt and wall time, also in units of one completion's latency
+(sequential round trips)
+
+Usage:
+    python scripts/benchmarks/bench_synthesis.py [--sizes 40,100,500,1000] [--latency 0.5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_openrouter import MockConfig, make_article, start_mock_server  # noqa: E402
+from review_core import RequestEngine, TwoPhaseStrategy, normalize_article  # noqa: E402
+from token_budget import estimate_tokens  # noqa: E402
+
+TOPICS = ("ocr", "handwriting", "layout analysis", "transformers", "historical documents", "data augmentation")
+
+
+class MeasuringEngine(RequestEngine):
+    """RequestEngine that records the prompt size of each completion"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    def complete(self, payload: dict, parse=None, on_usage=None):
+        self.calls.append(sum(estimate_tokens(message["content"]) for message in payload["messages"]))
+        return super().complete(payload, parse, on_usage)
+
+
+def make_articles(count: int) -> list:
+    articles = []
+    for index in range(count):
+        raw = make_article(index, "historical document recognition")
+        raw["keywords"] = [TOPICS[index % len(TOPICS)], TOPICS[index * 7 % len(TOPICS)]]
+        articles.append(normalize_article(raw))
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare flat and map-reduce synthesis")
+    parser.add_argument("--sizes", default="40,100,500,1000")
+    parser.add_argument("--latency", type=float, default=0.5, help="mock seconds per completion")
+    args = parser.parse_args()
+
+    server = start_mock_server(MockConfig(latency=args.latency, jitter=0.0))
+    strategy = TwoPhaseStrategy()
+    print(f"{'articles':>9}{'mode':>12}{'requests':>10}{'round trips':>13}{'max prompt':>12}{'seconds':>9}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        articles = make_articles(size)
+        for mode in ("flat", "map-reduce"):
+            engine = MeasuringEngine("benchmark", base_url=f"{server.base_url}/chat/completions")
+            engine.cache = None
+            started = time.perf_counter()
+            if mode == "flat":
+                engine.complete(strategy.synthesis_payload(engine, "historical document recognition", articles))
+            else:
+                strategy.synthesize_map_reduce(engine, "historical document recognition", articles)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{size:>9}{mode:>12}{len(engine.calls):>10}{elapsed / args.latency:>13.1f}"
+                f"{max(engine.calls):>12}{elapsed:>9.2f}"
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Token Budget Benchmark
+Runs both strategies against the mock OpenRouter server with a fixed
+max_tokens ceiling and with the adaptive budget, and reports prompt tokens,
+reserved completion tokens (what a tokens-per-minute limit is charged) and
+completion tokens actually used per review
+
+Usage:
+    python scripts/benchmarks/bench_token_budget.py [--reviews 10] [-n 5]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_openrouter import MockConfig, start_mock_server  # noqa: E402
+from review_core import STRATEGIES, RequestEngine  # noqa: E402
+from token_budget import TokenBudget, estimate_tokens  # noqa: E402
+
+
+class ReservingEngine(RequestEngine):
+    """RequestEngine that tallies the max_tokens and estimated prompt tokens it sends"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reserved = 0
+        self.estimated_prompt = 0
+
+    def complete(self, payload: dict, parse=None, on_usage=None):
+        self.reserved += payload["max_tokens"]
+        self.estimated_prompt += sum(estimate_tokens(message["content"]) for message in payload["messages"])
+        return super().complete(payload, parse, on_usage)
+
+
+def run(strategy_name: str, budget: TokenBudget, base_url: str, reviews: int, num_articles: int) -> dict:
+    engine = ReservingEngine("benchmark", base_url=f"{base_url}/chat/completions", budget=budget)
+    engine.cache = None
+    strategy = STRATEGIES[strategy_name]()
+    for index in range(reviews):
+        strategy.run(engine, f"benchmark topic {index}", num_articles)
+    return {
+        "prompt": engine.usage["prompt_tokens"] / reviews,
+        "estimated_prompt": engine.estimated_prompt / reviews,
+        "reserved": engine.reserved / reviews,
+        "completion": engine.usage["completion_tokens"] / reviews,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare fixed and adaptive completion budgets")
+    parser.add_argument("--reviews", type=int, default=10)
+    parser.add_argument("-n", "--num-articles", type=int, default=5)
+    args = parser.parse_args()
+
+    server = start_mock_server(MockConfig(latency=0.01, jitter=0.0))
+    print(
+        f"{'strategy':<14}{'budget':<10}{'prompt':>8}{'estimate':>10}{'reserved':>10}"
+        f"{'used':>8}{'utilization':>13}"
+    )
+    # The retrieval strategy needs real records for its queries; see bench_retrieval.py
+    for name in (name for name in STRATEGIES if name != "retrieval"):
+        # A margin this large always plans the 4000-token ceiling, i.e. the old fixed budget
+        for label, budget in (("fixed", TokenBudget(margin=100)), ("adaptive", TokenBudget())):
+            result = run(name, budget, server.base_url, args.reviews, args.num_articles)
+            print(
+                f"{name:<14}{label:<10}{result['prompt']:>8.0f}{result['estimated_prompt']:>10.0f}"
+                f"{result['reserved']:>10.0f}{result['completion']:>8.0f}"
+                f"{result['completion'] / result['reserved']:>13.1%}"
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Mock OpenRouter Server
+Local stand-in for /api/v1/chat/completions with configurable latency,
+streaming rate, error rate and canned or malformed payloads, so the pipeline
+can be benchmarked without real API calls
+
+Usage:
+    python scripts/benchmarks/mock_openrouter.py --port 8900 --latency 0.3 --tokens-per-second 400
+    OPENROUTER_BASE_URL=http://127.0.0.1:8900/api/v1 python scripts/literature_review_generator.py
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+COMPLETIONS_PATH = "/api/v1/chat/completions"
+MALFORMED_KINDS = ("fenced", "trailing_comma", "truncated", "garbage")
+
+
+@dataclass
+class MockConfig:
+    """Behaviour of the mock server"""
+    latency: float = 0.2  # seconds before the first byte
+    jitter: float = 0.05  # uniform +/- seconds added to latency
+    tokens_per_second: float = 500  # generation rate, streamed or not (~4 characters per token)
+    error_rate: float = 0.0  # fraction of requests answered with a 429/503
+    malformed_rate: float = 0.0  # fraction of completions mangled (see MALFORMED_KINDS)
+    articles: int = 5  # articles per completion when the prompt does not say
+    payload: Optional[str] = None  # canned completion content served for every request
+    seed: Optional[int] = None
+    tail_rate: float = 0.0  # fraction of requests stalled by tail_latency extra seconds
+    tail_latency: float = 5.0
+    model_latency: Optional[dict] = None  # per-model latency overriding `latency`
+
+
+def make_article(index: int, query: str) -> dict:
+    return {
+        "title": f"{query.title()} Study {index + 1}",
+        "authors": [f"Author {index % 97 + 1}A", f"Author {index % 89 + 1}B"],
+        "publication_year": 2015 + index % 10,
+        "venue": ("ICDAR", "NeurIPS", "ACL", "TPAMI")[index % 4],
+        "doi": f"10.5555/mock.{zlib.crc32(query.encode()) % 10000}.{index}",
+        "abstract": f"We investigate {query} with a new method and report consistent gains. " * 3,
+        "keywords": [word for word in query.lower().split()[:3]] + ["benchmark"],
+        "research_goal": f"Advance the state of the art in {query}",
+        "methodology": "Controlled experiments on public datasets",
+        "main_results": "Improves accuracy by 4-12% over strong baselines",
+        "key_contributions": "A reproducible method and an open dataset",
+        "limitations": "Evaluated on a limited set of domains",
+        "confidence": ("high", "medium", "low")[index % 3],
+        "source": ("arXiv", "IEEE", "ACM")[index % 3],
+    }
+
+
+def make_summary(index: int, query: str) -> dict:
+    article = make_article(index, query)
+    summary = {name: article[name] for name in (
+        "keywords", "research_goal", "methodology", "main_results", "key_contributions", "limitations", "confidence",
+    )}
+    return {"index": index, **summary}
+
+
+SYNTHESIS = {
+    "field_overview": "Research converges on large pretrained models adapted to the domain.",
+    "gaps_and_challenges": "Low-resource settings and evaluation protocols remain open.",
+    "future_directions": "Data-efficient adaptation and better benchmarks.",
+    "practical_implications": "Production systems can adopt these methods with modest compute.",
+}
+
+
+def build_content(messages: list, articles: int) -> str:
+    """Produce a well-formed completion matching the prompt's requested schema"""
+    prompt = messages[-1].get("content", "") if messages else ""
+    query = prompt.split('"')[1] if prompt.count('"') >= 2 else "mock topic"
+    words = prompt.split()
+    if len(words) > 1 and words[0] == "Generate" and words[1].isdigit():
+        articles = int(words[1])
+
+    if prompt.startswith("Analyze"):
+        return json.dumps(SYNTHESIS, indent=2)
+    if len(words) > 2 and words[0] == "Summarize" and words[2].isdigit():
+        return json.dumps([make_summary(index + 1, query) for index in range(int(words[2]))], indent=2)
+    # Distinct fan-out prompts for one query get distinct articles
+    offset = zlib.crc32(prompt.encode()) % 100000
+    items = [make_article(offset + index, query) for index in range(articles)]
+    if any(message.get("role") == "system" for message in messages):
+        return json.dumps({"articles": items, "synthesis": SYNTHESIS}, indent=2)
+    return json.dumps(items, indent=2)
+
+
+def malform(content: str, kind: str) -> str:
+    """Mangle a completion the way real models occasionally do"""
+    if kind == "fenced":
+        return f"Here is the JSON you asked for:\n```json\n{content}\n```\nLet me know if you need more."
+    if kind == "trailing_comma":
+        return content.replace("\n  }", ",\n  }")
+    if kind == "truncated":
+        return content[: int(len(content) * 0.7)]
+    return "I'm sorry, I can't produce that right now."
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class MockOpenRouterHandler(BaseHTTPRequestHandler):
+    """Serves chat completions, streamed or not, according to the server's MockConfig"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        if self.path.rstrip("/") != COMPLETIONS_PATH:
+            self._send_json(404, {"error": {"message": f"Unknown path: {self.path}"}})
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        server = self.server
+        config = server.config
+        with server.lock:
+            server.requests += 1
+            rng_value, jitter, kind = server.rng.random(), server.rng.uniform(-1, 1), server.rng.random()
+            malformed_kind = server.rng.choice(MALFORMED_KINDS)
+            stalled = server.rng.random() < config.tail_rate
+
+        latency = (config.model_latency or {}).get(body.get("model"), config.latency)
+        time.sleep(max(0.0, latency + jitter * config.jitter) + (config.tail_latency if stalled else 0.0))
+
+        if rng_value < config.error_rate:
+            with server.lock:
+                server.errors += 1
+            status = 429 if kind < 0.5 else 503
+            self._send_json(status, {"error": {"code": status, "message": "mock upstream error"}})
+            return
+
+        content = config.payload or build_content(body.get("messages", []), config.articles)
+        if kind < config.malformed_rate:
+            content = malform(content, malformed_kind)
+            with server.lock:
+                server.malformed += 1
+
+        prompt_text = "".join(message.get("content", "") for message in body.get("messages", []))
+        usage = {
+            "prompt_tokens": estimate_tokens(prompt_text),
+            "completion_tokens": estimate_tokens(content),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if body.get("stream"):
+            self._stream(content, body.get("model", "mock"), usage)
+        else:
+            # The API answers once the whole completion is generated, at the same rate a stream is paced at
+            time.sleep(usage["completion_tokens"] / config.tokens_per_second)
+            self._send_json(200, {
+                "id": f"mock-{server.requests}",
+                "model": body.get("model", "mock"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+    def _stream(self, content: str, model: str, usage: dict):
+        """Send the completion as SSE deltas paced at the configured token rate"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        chunk_chars = 16  # ~4 tokens per delta
+        delay = chunk_chars / 4 / self.server.config.tokens_per_second
+        self.wfile.write(b": OPENROUTER PROCESSING\n\n")
+        for start in range(0, len(content), chunk_chars):
+            event = {"model": model, "choices": [{"index": 0, "delta": {"content": content[start:start + chunk_chars]}}]}
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(delay)
+        final = {"model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage}
+        self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _send_json(self, status: int, payload: dict):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockOpenRouterServer(ThreadingHTTPServer):
+    """Threaded mock server with request/error/malformed counters"""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple, config: Optional[MockConfig] = None):
+        super().__init__(address, MockOpenRouterHandler)
+        self.config = config or MockConfig()
+        self.rng = random.Random(self.config.seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.malformed = 0
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up mid-stream (e.g. a cancelled hedged request) are expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    @property
+    def base_url(self) -> str:
+        """Value for OPENROUTER_BASE_URL"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+
+def start_mock_server(config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0) -> MockOpenRouterServer:
+    """Start a mock server on a background thread (port 0 picks a free port)"""
+    server = MockOpenRouterServer((host, port), config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    """Register MockConfig options on an argument parser"""
+    defaults = MockConfig()
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="seconds before the first byte")
+    parser.add_argument("--jitter", type=float, default=defaults.jitter)
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="fraction answered 429/503")
+    parser.add_argument("--malformed-rate", type=float, default=defaults.malformed_rate)
+    parser.add_argument("--articles", type=int, default=defaults.articles)
+    parser.add_argument("--payload", help="file whose content is served as every completion")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--tail-rate", type=float, default=defaults.tail_rate, help="fraction of stalled requests")
+    parser.add_argument("--tail-latency", type=float, default=defaults.tail_latency, help="extra seconds when stalled")
+    parser.add_argument(
+        "--model-latency", action="append", default=[], metavar="MODEL=SECONDS", help="per-model latency (repeatable)"
+    )
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    payload = None
+    if args.payload:
+        with open(args.payload, encoding="utf-8") as f:
+            payload = f.read()
+    return MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        articles=args.articles,
+        payload=payload,
+        seed=args.seed,
+        tail_rate=args.tail_rate,
+        tail_latency=args.tail_latency,
+        model_latency={
+            model: float(seconds) for model, seconds in (item.rsplit("=", 1) for item in args.model_latency)
+        } or None,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a mock OpenRouter chat completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockOpenRouterServer((args.host, args.port), config_from_args(args))
+    print(f"Mock OpenRouter on {server.base_url} (set OPENROUTER_BASE_URL to this)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Stub Literature Sources
+Local stand-in for the arXiv query API (Atom) and the Semantic Scholar paper
+search API, answering from a metadata dump, so the retrieval sources can be
+exercised offline
+
+Usage:
+    python scripts/benchmarks/stub_sources.py --port 8950
+    ARXIV_API_URL=http://127.0.0.1:8950/arxiv/api/query \
+    SEMANTIC_SCHOLAR_API_URL=http://127.0.0.1:8950/s2/graph/v1 \
+        python scripts/retrieval.py search "federated learning" --sources arxiv,semantic-scholar
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from retrieval import SAMPLE_DUMP_PATH, BM25Index, load_records  # noqa: E402
+
+ARXIV_PATH = "/arxiv/api/query"
+S2_SEARCH_PATH = "/s2/graph/v1/paper/search"
+
+
+def atom_feed(records: list) -> str:
+    entries = []
+    for record in records:
+        arxiv_id = record.id.split(":", 1)[1]
+        authors = "".join(f"<author><name>{escape(name)}</name></author>" for name in record.authors)
+        categories = "".join(f'<category term="{escape(term)}"/>' for term in record.categories)
+        doi = f"<arxiv:doi>{escape(record.doi)}</arxiv:doi>" if record.doi else ""
+        journal = f"<arxiv:journal_ref>{escape(record.venue)}</arxiv:journal_ref>" if record.venue != "arXiv" else ""
+        entries.append(
+            f"<entry><id>http://arxiv.org/abs/{arxiv_id}v1</id>"
+            f"<published>{record.year}-01-01T00:00:00Z</published>"
+            f"<title>{escape(record.title)}</title><summary>{escape(record.abstract)}</summary>"
+            f"{authors}{doi}{journal}{categories}</entry>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">'
+        f"<title>stub query</title>{''.join(entries)}</feed>"
+    )
+
+
+def s2_paper(record) -> dict:
+    external = {"ArXiv": record.id.split(":", 1)[1]} if record.id.startswith("arxiv:") else {}
+    if record.doi:
+        external["DOI"] = record.doi
+    return {
+        "paperId": f"stub{zlib.crc32(record.id.encode())}",
+        "title": record.title,
+        "authors": [{"name": name} for name in record.authors],
+        "year": record.year,
+        "venue": record.venue,
+        "externalIds": external,
+        "abstract": record.abstract,
+        "url": record.url,
+    }
+
+
+class StubSourceHandler(BaseHTTPRequestHandler):
+    """Serves arXiv and Semantic Scholar searches from the server's index"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        time.sleep(self.server.latency)
+
+        if url.path == ARXIV_PATH:
+            # "all:federated AND all:learning" -> "federated learning"
+            query = re.sub(r"\b(all|ti|abs):|\bAND\b", " ", params.get("search_query", [""])[0])
+            records = self.server.index.search(query, int(params.get("max_results", ["10"])[0]))
+            self._send(200, "application/atom+xml", atom_feed(records).encode())
+        elif url.path == S2_SEARCH_PATH:
+            records = self.server.index.search(params.get("query", [""])[0], int(params.get("limit", ["10"])[0]))
+            body = {"total": len(records), "data": [s2_paper(record) for record in records]}
+            self._send(200, "application/json", json.dumps(body).encode())
+        else:
+            self._send(404, "application/json", b'{"error": "not found"}')
+
+    def _send(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubSourceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple, dump: str = SAMPLE_DUMP_PATH, latency: float = 0.0):
+        super().__init__(address, StubSourceHandler)
+        self.latency = latency
+        self._tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self._tmpdir.name, "stub.sqlite3")
+        BM25Index.build(path, load_records(dump))
+        self.index = BM25Index(path)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(dump: str = SAMPLE_DUMP_PATH, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+    """Start a stub source server on a background thread"""
+    server = StubSourceServer((host, port), dump, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub arXiv and Semantic Scholar search APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8950)
+    parser.add_argument("--dump", default=SAMPLE_DUMP_PATH, help="NDJSON metadata dump to serve")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each response")
+    args = parser.parse_args()
+
+    server = StubSourceServer((args.host, args.port), args.dump, args.latency)
+    print(f"Stub sources on {server.base_url} (arXiv: {ARXIV_PATH}, Semantic Scholar: {S2_SEARCH_PATH})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+Article Entity Index
+Entity resolution over stored articles: near-duplicate titles found with
+MinHash signatures and LSH buckets, author and venue spellings folded onto
+canonical keys, and an inverted keyword index with co-occurrence counts
+
+Every lookup goes through an index (LSH bucket, canonical key or keyword id),
+so inserts and queries stay fast as the corpus grows to millions of articles.
+Only the first-seen (canonical) copy of a duplicated article counts towards
+author, venue and keyword statistics.
+
+Usage:
+    python scripts/entity_index.py sync                 # index new articles from the review store
+    python scripts/entity_index.py similar "Attention is all you need"
+    python scripts/entity_index.py author "McMahan, H. Brendan"
+    python scripts/entity_index.py related "federated learning"
+    python scripts/entity_index.py top venue
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import unicodedata
+import zlib
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from review_core import article_fingerprint, normalize_title
+from review_metrics import metrics
+from review_store import DEFAULT_STORE_PATH, ReviewStore
+from semantic_cache import load_numpy
+
+DEFAULT_ENTITY_PATH = os.path.join(os.path.expanduser("~"), ".local", "share", "literature_review", "entities.sqlite3")
+
+# 16 bands of 8 rows: titles with Jaccard similarity 0.8 share a bucket with
+# probability 0.95, unrelated titles (0.2) with probability 0.00004
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_SIZE = 5
+# Estimated Jaccard similarity above which two titles are the same article
+DUPLICATE_THRESHOLD = 0.7
+# Largest prime below 2**32: every hash value fits in an unsigned 32-bit array
+_PRIME = 4294967291
+
+ENTITY_KINDS = ("author", "venue", "keyword")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    canonical_id INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    year INTEGER,
+    venue_id INTEGER,
+    signature BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_canonical ON articles(canonical_id);
+
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    bucket INTEGER NOT NULL,
+    article_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, article_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    articles INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (kind, key)
+);
+
+CREATE TABLE IF NOT EXISTS entity_variants (
+    entity_id INTEGER NOT NULL REFERENCES entities(id),
+    variant TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (entity_id, variant)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS article_entities (
+    entity_id INTEGER NOT NULL REFERENCES entities(id),
+    article_id INTEGER NOT NULL REFERENCES articles(id),
+    PRIMARY KEY (entity_id, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS article_entities_article ON article_entities(article_id);
+
+CREATE TABLE IF NOT EXISTS keyword_pairs (
+    first INTEGER NOT NULL,
+    second INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (first, second)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_WORD = re.compile(r"[a-z0-9]+")
+_VENUE_NOISE = re.compile(
+    r"\b(proceedings|proc|of|the|in|on|annual|\d+(st|nd|rd|th)?|vol(ume)?|no|pp)\b|'\d{2}\b"
+)
+_NAME_SUFFIXES = frozenset(("jr", "sr", "ii", "iii", "iv"))
+
+# Normalized long forms (after _VENUE_NOISE is removed) and old names of common venues
+VENUE_ALIASES = {
+    "nips": "neurips",
+    "advances neural information processing systems": "neurips",
+    "conference neural information processing systems": "neurips",
+    "international conference machine learning": "icml",
+    "international conference learning representations": "iclr",
+    "ieee conference computer vision and pattern recognition": "cvpr",
+    "ieee cvf conference computer vision and pattern recognition": "cvpr",
+    "conference computer vision and pattern recognition": "cvpr",
+    "meeting association for computational linguistics": "acl",
+    "association for computational linguistics": "acl",
+    "conference empirical methods natural language processing": "emnlp",
+    "aaai conference artificial intelligence": "aaai",
+    "ieee transactions pattern analysis and machine intelligence": "tpami",
+    "ieee tpami": "tpami",
+    "international conference document analysis and recognition": "icdar",
+    "journal machine learning research": "jmlr",
+}
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents ("Vélickovic" -> "velickovic")"""
+    return unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode().lower()
+
+
+def author_key(name: str) -> str:
+    """
+    Canonical author key: family name and first initial
+
+    "McMahan, H. Brendan", "H. Brendan McMahan" and "h b mcmahan" all map to
+    "mcmahan h". Distinct authors sharing a family name and initial collide,
+    the usual trade-off of initial-based blocking.
+    """
+    folded = fold(name)
+    if "," in folded:
+        family, _, given = folded.partition(",")
+        words = _WORD.findall(given) + _WORD.findall(family)
+    else:
+        words = _WORD.findall(folded)
+    while len(words) > 1 and words[-1] in _NAME_SUFFIXES:
+        words.pop()
+    if not words:
+        return ""
+    if len(words) == 1:
+        return words[0]
+    return f"{words[-1]} {words[0][0]}"
+
+
+def venue_key(venue: str) -> str:
+    """
+    Canonical venue key
+
+    A parenthesized acronym wins ("... Recognition (CVPR)" -> "cvpr"); otherwise
+    years, volume numbers, ordinals and "Proceedings of the" are dropped and known long forms
+    map to their acronym ("NeurIPS 2017", "NIPS" and "Advances in Neural
+    Information Processing Systems" -> "neurips").
+    """
+    folded = fold(venue)
+    acronym = re.search(r"\(([a-z][a-z0-9\-]{1,11})\)", folded)
+    if acronym:
+        folded = acronym.group(1)
+    key = " ".join(_WORD.findall(_VENUE_NOISE.sub(" ", folded.replace("-", " ").replace("/", " "))))
+    return VENUE_ALIASES.get(key, key)
+
+
+def keyword_key(keyword: str) -> str:
+    """Lowercase words with hyphens split and plural suffixes stripped"""
+    words = []
+    for word in _WORD.findall(fold(keyword)):
+        if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return " ".join(words)
+
+
+def shingles(title: str, size: int = SHINGLE_SIZE) -> set:
+    """Character n-grams of the normalized title"""
+    text = normalize_title(title)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[start:start + size] for start in range(len(text) - size + 1)}
+
+
+class MinHasher:
+    """MinHash signatures from NUM_PERM universal hash functions over shingle CRCs"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        # Multipliers below 2**31 keep a * crc + b inside 64 bits for NumPy
+        self.a = [rng.randrange(1, 1 << 31) for _ in range(num_perm)]
+        self.b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+        self.num_perm = num_perm
+        # NumPy is imported with the first hasher, not the module; without it
+        # signatures are computed in pure Python
+        self._np = np = load_numpy()
+        if np is not None:
+            self._a = np.array(self.a, dtype=np.uint64)[:, None]
+            self._b = np.array(self.b, dtype=np.uint64)[:, None]
+
+    def signature(self, title: str) -> array:
+        values = [zlib.crc32(shingle.encode()) for shingle in shingles(title)] or [0]
+        np = self._np
+        if np is not None:
+            hashed = (self._a * np.array(values, dtype=np.uint64)[None, :] + self._b) % _PRIME
+            return array("I", hashed.min(axis=1).astype(np.uint32).tobytes())
+        return array("I", [min([(a * value + b) % _PRIME for value in values]) for a, b in zip(self.a, self.b)])
+
+
+def similarity(first: array, second: array) -> float:
+    """Estimated Jaccard similarity: the share of equal signature positions"""
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+def band_buckets(signature: array, bands: int = BANDS) -> list:
+    """One bucket id per band: band number in the high bits, band hash in the low 32"""
+    rows = len(signature) // bands
+    data = signature.tobytes()
+    width = rows * signature.itemsize
+    return [(band << 32) | zlib.crc32(data[band * width:(band + 1) * width]) for band in range(bands)]
+
+
+@dataclass
+class Resolution:
+    """Outcome of adding one article"""
+    article_id: int
+    canonical_id: int
+    duplicate: bool
+    # 1.0 for an exact DOI/title match, the estimated title similarity otherwise
+    similarity: float = 1.0
+
+
+def _field(article, name: str, camel: Optional[str] = None):
+    if isinstance(article, dict):
+        value = article.get(name)
+        return article.get(camel) if value is None and camel else value
+    return getattr(article, name, None)
+
+
+class EntityIndex:
+    """SQLite-backed incremental entity resolution over articles"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_ENTITY_PATH,
+        num_perm: int = NUM_PERM,
+        bands: int = BANDS,
+        threshold: float = DUPLICATE_THRESHOLD,
+    ):
+        """
+        Args:
+            path: SQLite file (":memory:" keeps the index in memory)
+            num_perm: MinHash signature length (a multiple of bands)
+            bands: LSH bands; more bands find less similar titles but return more candidates
+            threshold: Estimated Jaccard similarity at which titles are duplicates
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.bands = bands
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != ":memory:":
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+            self._db.commit()
+        # (kind, key) -> entity id; entities are never deleted, so the cache stays valid
+        self._entity_ids: dict = {}
+
+    def add(self, article) -> Resolution:
+        """Add one article (Article or snake/camelCase dict) and resolve it against the index"""
+        return self.add_many([article])[0]
+
+    def add_many(self, articles: Iterable) -> list:
+        """Add articles in one transaction; later articles see the earlier ones"""
+        results = []
+        with self._lock, self._db:
+            for article in articles:
+                results.append(self._add(article))
+        duplicates = sum(1 for result in results if result.duplicate)
+        metrics.inc("entity_articles_total", len(results) - duplicates, outcome="new")
+        metrics.inc("entity_articles_total", duplicates, outcome="duplicate")
+        return results
+
+    def _add(self, article) -> Resolution:
+        title = _field(article, "title") or ""
+        fingerprint = article_fingerprint({"title": title, "doi": _field(article, "doi")})
+        row = self._db.execute("SELECT id, canonical_id FROM articles WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        if row is not None:
+            return Resolution(row[0], row[1], duplicate=True)
+
+        signature = self.hasher.signature(title)
+        buckets = band_buckets(signature, self.bands)
+        match = self._best_match(signature, buckets)
+
+        venue = _field(article, "venue") or ""
+        venue_id = self._entity("venue", venue_key(venue), venue) if venue and venue != "Unknown" else None
+        year = _field(article, "publication_year", "publicationYear")
+        cursor = self._db.execute(
+            "INSERT INTO articles (canonical_id, fingerprint, title, year, venue_id, signature) VALUES (0, ?, ?, ?, ?, ?)",
+            (fingerprint, title, year if isinstance(year, int) else None, venue_id, signature.tobytes()),
+        )
+        article_id = cursor.lastrowid
+        canonical_id = match[0] if match else article_id
+        self._db.execute("UPDATE articles SET canonical_id = ? WHERE id = ?", (canonical_id, article_id))
+        self._db.executemany(
+            "INSERT OR IGNORE INTO lsh_buckets (bucket, article_id) VALUES (?, ?)",
+            [(bucket, article_id) for bucket in buckets],
+        )
+
+        entity_ids = [venue_id] if venue_id is not None else []
+        for name in _field(article, "authors") or []:
+            key = author_key(name)
+            if key:
+                entity_ids.append(self._entity("author", key, name))
+        keyword_ids = []
+        for keyword in _field(article, "keywords") or []:
+            key = keyword_key(keyword)
+            if key:
+                keyword_ids.append(self._entity("keyword", key, keyword))
+        entity_ids.extend(keyword_ids)
+
+        if match:
+            return Resolution(article_id, canonical_id, duplicate=True, similarity=match[1])
+
+        # Only canonical articles count towards entity statistics and co-occurrence
+        entity_ids = list(dict.fromkeys(entity_ids))
+        self._db.executemany(
+            "INSERT OR IGNORE INTO article_entities (entity_id, article_id) VALUES (?, ?)",
+            [(entity_id, article_id) for entity_id in entity_ids],
+        )
+        self._db.executemany("UPDATE entities SET articles = articles + 1 WHERE id = ?", [(i,) for i in entity_ids])
+        keyword_ids = sorted(set(keyword_ids))
+        self._db.executemany(
+            "INSERT INTO keyword_pairs (first, second, count) VALUES (?, ?, 1) "
+            "ON CONFLICT (first, second) DO UPDATE SET count = count + 1",
+            [(first, second) for index, first in enumerate(keyword_ids) for second in keyword_ids[index + 1:]],
+        )
+        return Resolution(article_id, canonical_id, duplicate=False)
+
+    def _entity(self, kind: str, key: str, variant: str) -> int:
+        entity_id = self._entity_ids.get((kind, key))
+        if entity_id is None:
+            self._db.execute("INSERT OR IGNORE INTO entities (kind, key) VALUES (?, ?)", (kind, key))
+            entity_id = self._db.execute("SELECT id FROM entities WHERE kind = ? AND key = ?", (kind, key)).fetchone()[0]
+            self._entity_ids[(kind, key)] = entity_id
+        self._db.execute(
+            "INSERT INTO entity_variants (entity_id, variant, count) VALUES (?, ?, 1) "
+            "ON CONFLICT (entity_id, variant) DO UPDATE SET count = count + 1",
+            (entity_id, " ".join(str(variant).split())),
+        )
+        return entity_id
+
+    def _candidates(self, buckets: list) -> list:
+        rows = self._db.execute(
+            "SELECT DISTINCT a.id, a.canonical_id, a.signature FROM lsh_buckets b JOIN articles a ON a.id = b.article_id "
+            f"WHERE b.bucket IN ({','.join('?' * len(buckets))})",
+            buckets,
+        ).fetchall()
+        return rows
+
+    def _best_match(self, signature: array, buckets: list) -> Optional[tuple]:
+        """(canonical id, similarity) of the most similar indexed title over the threshold"""
+        best = None
+        for _, canonical_id, blob in self._candidates(buckets):
+            candidate = array("I")
+            candidate.frombytes(blob)
+            score = similarity(signature, candidate)
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (canonical_id, score)
+        return best
+
+    def similar(self, title: str, limit: int = 10, threshold: Optional[float] = None) -> list:
+        """Indexed articles whose titles are near-duplicates of title, most similar first"""
+        signature = self.hasher.signature(title)
+        floor = self.threshold if threshold is None else threshold
+        with self._lock:
+            rows = self._candidates(band_buckets(signature, self.bands))
+            titles = dict(self._db.execute(
+                f"SELECT id, title FROM articles WHERE id IN ({','.join('?' * len(rows))})", [row[0] for row in rows]
+            ).fetchall()) if rows else {}
+        results = []
+        for article_id, canonical_id, blob in rows:
+            candidate = array("I")
+            candidate.frombytes(blob)
+            score = similarity(signature, candidate)
+            if score >= floor:
+                results.append({
+                    "id": article_id, "canonical_id": canonical_id, "title": titles[article_id],
+                    "similarity": round(score, 3),
+                })
+        results.sort(key=lambda result: -result["similarity"])
+        return results[:limit]
+
+    def duplicates_of(self, article_id: int) -> list:
+        """Ids of every article resolved to the same canonical article"""
+        with self._lock:
+            return [row[0] for row in self._db.execute(
+                "SELECT id FROM articles WHERE canonical_id = "
+                "(SELECT canonical_id FROM articles WHERE id = ?) ORDER BY id",
+                (article_id,),
+            )]
+
+    def _describe(self, entity_id: int, kind: str, key: str, articles: int) -> dict:
+        variants = self._db.execute(
+            "SELECT variant, count FROM entity_variants WHERE entity_id = ? ORDER BY count DESC, variant",
+            (entity_id,),
+        ).fetchall()
+        return {
+            "kind": kind,
+            "key": key,
+            # The most common spelling is shown as the entity's name
+            "name": variants[0][0] if variants else key,
+            "articles": articles,
+            "variants": [{"variant": variant, "count": count} for variant, count in variants],
+        }
+
+    def lookup(self, kind: str, name: str) -> Optional[dict]:
+        """Canonical entity for an author, venue or keyword spelling, with its variants and article count"""
+        key = {"author": author_key, "venue": venue_key, "keyword": keyword_key}[kind](name)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, articles FROM entities WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            return self._describe(row[0], kind, key, row[1]) if row is not None else None
+
+    def top(self, kind: str, limit: int = 20) -> list:
+        """Entities of one kind by number of canonical articles"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, key, articles FROM entities WHERE kind = ? ORDER BY articles DESC, key LIMIT ?",
+                (kind, limit),
+            ).fetchall()
+            return [self._describe(entity_id, kind, key, articles) for entity_id, key, articles in rows]
+
+    def related_keywords(self, keyword: str, limit: int = 10) -> list:
+        """
+        Keywords co-occurring with keyword, by count
+
+        lift compares the co-occurrence with what independent keywords would
+        give (above 1 means they appear together more often than chance).
+        """
+        key = keyword_key(keyword)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, articles FROM entities WHERE kind = 'keyword' AND key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return []
+            keyword_id, own = row
+            total = self._db.execute("SELECT COUNT(*) FROM articles WHERE canonical_id = id").fetchone()[0]
+            rows = self._db.execute(
+                "SELECT e.key, e.articles, p.count FROM ("
+                "  SELECT second AS other, count FROM keyword_pairs WHERE first = ?"
+                "  UNION ALL SELECT first AS other, count FROM keyword_pairs WHERE second = ?"
+                ") p JOIN entities e ON e.id = p.other ORDER BY p.count DESC, e.key LIMIT ?",
+                (keyword_id, keyword_id, limit),
+            ).fetchall()
+        return [
+            {"keyword": other, "count": count, "lift": round(count * total / (own * articles), 2)}
+            for other, articles, count in rows
+        ]
+
+    def sync(self, store: ReviewStore, batch_size: int = 1000) -> int:
+        """
+        Index the store's articles added since the last sync
+
+        Returns:
+            The number of articles read from the store
+        """
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE name = 'store_article_id'").fetchone()
+        last_id = int(row[0]) if row else 0
+        count = 0
+        for batch in store.iter_articles(after_id=last_id, batch_size=batch_size):
+            self.add_many(article for _, article in batch)
+            last_id = batch[-1][0]
+            count += len(batch)
+            with self._lock, self._db:
+                self._db.execute(
+                    "INSERT INTO meta (name, value) VALUES ('store_article_id', ?) "
+                    "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+                    (str(last_id),),
+                )
+        return count
+
+    def stats(self) -> dict:
+        """Article, canonical article and entity counts"""
+        with self._lock:
+            stats = {
+                "articles": self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0],
+                "canonical_articles": self._db.execute(
+                    "SELECT COUNT(*) FROM articles WHERE canonical_id = id"
+                ).fetchone()[0],
+            }
+            for kind, count in self._db.execute("SELECT kind, COUNT(*) FROM entities GROUP BY kind"):
+                stats[f"{kind}s"] = count
+            return stats
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+metrics.describe("entity_articles_total", "Articles added to the entity index, by new or duplicate outcome")
+
+
+def main():
+    """Build and query the entity index from the command line"""
+    parser = argparse.ArgumentParser(description="Author, venue and keyword entity index over stored articles")
+    parser.add_argument("--index", default=os.getenv("LITREVIEW_ENTITIES_PATH", DEFAULT_ENTITY_PATH))
+    parser.add_argument("--store", default=os.getenv("LITREVIEW_STORE_PATH", DEFAULT_STORE_PATH))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("sync", help="index articles added to the review store since the last sync")
+
+    similar = commands.add_parser("similar", help="near-duplicate titles")
+    similar.add_argument("title")
+    similar.add_argument("--threshold", type=float, default=0.5)
+    similar.add_argument("--limit", type=int, default=10)
+
+    for kind in ("author", "venue", "keyword"):
+        lookup = commands.add_parser(kind, help=f"canonical {kind} for a spelling, with its variants")
+        lookup.add_argument("name")
+
+    related = commands.add_parser("related", help="keywords co-occurring with a keyword")
+    related.add_argument("keyword")
+    related.add_argument("--limit", type=int, default=10)
+
+    top = commands.add_parser("top", help="entities by number of articles")
+    top.add_argument("kind", choices=ENTITY_KINDS)
+    top.add_argument("--limit", type=int, default=20)
+
+    commands.add_parser("stats", help="print index size")
+
+    args = parser.parse_args()
+    index = EntityIndex(args.index)
+
+    if args.command == "sync":
+        count = index.sync(ReviewStore(args.store))
+        print(f"Indexed {count} new article(s); {json.dumps(index.stats())}", file=sys.stderr)
+    elif args.command == "similar":
+        print(json.dumps(index.similar(args.title, args.limit, args.threshold), indent=2))
+    elif args.command in ENTITY_KINDS:
+        entity = index.lookup(args.command, args.name)
+        if entity is None:
+            print(f"Error: no {args.command} matching {args.name!r}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(entity, indent=2))
+    elif args.command == "related":
+        print(json.dumps(index.related_keywords(args.keyword, args.limit), indent=2))
+    elif args.command == "top":
+        for entity in index.top(args.kind, args.limit):
+            print(f"{entity['articles']:>8}  {entity['name']}  ({len(entity['variants'])} spellings)")
+    else:
+        print(json.dumps(index.stats()))
+
+
+if __name__ == "__main__":
+    main()
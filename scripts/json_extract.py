@@ -0,0 +1,303 @@
+"""
+JSON Extraction for LLM Output
+Single-pass, bracket-balanced extraction of the first JSON value in a
+completion, with repair of common LLM defects (markdown fences, surrounding
+prose, trailing commas, smart quotes, raw newlines in strings) and salvage of
+truncated completions
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+# Characters that matter outside a string: container delimiters, commas and quotes
+_STRUCTURE = re.compile('["{}\\[\\],“”„]')
+# Characters that matter inside a string opened with a plain or a smart quote
+_IN_STRING = re.compile('["\\\\\n\r\t]')
+_IN_SMART_STRING = re.compile('["\\\\\n\r\t“”]')
+# A well-formed plain string, matched in one step on the fast path
+_PLAIN_STRING = re.compile('"[^"\\\\\n\r\t]*(?:\\\\.[^"\\\\\n\r\t]*)*"')
+_OPENERS = re.compile("[{\\[]")
+_FENCE = re.compile("```(?:json)?", re.IGNORECASE)
+
+_CLOSERS = {"{": "}", "[": "]"}
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_WHITESPACE = " \t\r\n"
+
+
+@dataclass
+class ExtractionResult:
+    """A JSON value extracted from free-form text"""
+    value: Any
+    start: int
+    end: int
+    repaired: bool
+    truncated: bool
+
+
+class _Scan:
+    """Outcome of scanning one candidate span"""
+
+    __slots__ = ("start", "end", "edits", "complete", "safe_points", "stack")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.end = start
+        self.edits: list[tuple[int, int, str]] = []
+        self.complete = False
+        # (cut position, open-container stack at that position) after every complete value
+        self.safe_points: list[tuple[int, tuple]] = []
+        self.stack: list[str] = []
+
+
+def _scan(text: str, start: int) -> _Scan:
+    """Walk one JSON value starting at text[start] in a single forward pass"""
+    scan = _Scan(start)
+    stack = scan.stack
+    edits = scan.edits
+    pos = start
+
+    while True:
+        match = _STRUCTURE.search(text, pos)
+        if match is None:
+            scan.end = len(text)
+            return scan
+
+        char = match.group()
+        index = match.start()
+
+        if char in "{[":
+            stack.append(_CLOSERS[char])
+            pos = index + 1
+            scan.safe_points.append((pos, tuple(stack)))
+
+        elif char in "}]":
+            # Drop a trailing comma before the closer
+            j = index - 1
+            while j > start and text[j] in _WHITESPACE:
+                j -= 1
+            if text[j] == ",":
+                edits.append((j, j + 1, ""))
+
+            expected = stack.pop()
+            if char != expected:
+                edits.append((index, index + 1, expected))
+            pos = index + 1
+
+            if not stack:
+                scan.end = pos
+                scan.complete = True
+                return scan
+            scan.safe_points.append((pos, tuple(stack)))
+
+        elif char == ",":
+            scan.safe_points.append((index, tuple(stack)))
+            pos = index + 1
+
+        else:
+            smart = char != '"'
+            if not smart:
+                plain = _PLAIN_STRING.match(text, index)
+                if plain is not None:
+                    pos = plain.end()
+                    continue
+            if smart:
+                edits.append((index, index + 1, '"'))
+            pos = _scan_string(text, index + 1, smart, edits)
+            if pos < 0:
+                scan.end = len(text)
+                return scan
+
+
+def _scan_string(text: str, pos: int, smart: bool, edits: list) -> int:
+    """Advance past a string body; return the index after its closing quote, or -1 if unterminated"""
+    pattern = _IN_SMART_STRING if smart else _IN_STRING
+    while True:
+        match = pattern.search(text, pos)
+        if match is None:
+            return -1
+
+        char = match.group()
+        index = match.start()
+
+        if char == "\\":
+            pos = index + 2
+        elif char in _CONTROL_ESCAPES:
+            edits.append((index, index + 1, _CONTROL_ESCAPES[char]))
+            pos = index + 1
+        elif char == '"':
+            if not smart:
+                return index + 1
+            # A plain quote inside a smart-quoted string is content
+            edits.append((index, index + 1, '\\"'))
+            pos = index + 1
+        else:
+            edits.append((index, index + 1, '"'))
+            return index + 1
+
+
+def _render(text: str, start: int, end: int, edits: list, suffix: str = "") -> str:
+    """Apply edits that fall inside [start, end) and append suffix"""
+    pieces = []
+    cursor = start
+    for edit_start, edit_end, replacement in sorted(edits):
+        if edit_start >= end:
+            break
+        pieces.append(text[cursor:edit_start])
+        pieces.append(replacement)
+        cursor = edit_end
+    pieces.append(text[cursor:end])
+    pieces.append(suffix)
+    return "".join(pieces)
+
+
+def _salvage_truncated(text: str, scan: _Scan) -> Optional[str]:
+    """Close a truncated value at its last safe point, dropping the incomplete element"""
+    if not scan.safe_points:
+        return None
+
+    # Prefer cutting at an element boundary of the outermost open array of
+    # objects (the articles), so a half-written article is dropped rather than
+    # returned with missing fields even when the cut falls inside one of its
+    # lists; otherwise at the innermost open array
+    stack = scan.stack
+    arrays = [depth for depth in range(1, len(stack) + 1) if stack[depth - 1] == "]"]
+    of_objects = [depth for depth in arrays if depth < len(stack) and stack[depth] == "}"]
+    cut = None
+    if of_objects or arrays:
+        prefix = tuple(stack[:of_objects[0] if of_objects else arrays[-1]])
+        for point in reversed(scan.safe_points):
+            if point[1] == prefix:
+                cut = point
+                break
+    if cut is None:
+        cut = scan.safe_points[-1]
+
+    position, stack = cut
+    return _render(text, scan.start, position, scan.edits, "".join(reversed(stack)))
+
+
+def _salvage_elements(text: str, scan: _Scan) -> Optional[list]:
+    """Parse the elements of a complete top-level array one by one, skipping broken ones"""
+    if text[scan.start] != "[":
+        return None
+
+    boundaries = [scan.start + 1]
+    boundaries += [position + 1 for position, stack in scan.safe_points if stack == ("]",) and text[position] == ","]
+    boundaries.append(scan.end)
+
+    items = []
+    for element_start, element_end in zip(boundaries, boundaries[1:]):
+        element_end -= 1  # exclude the comma or closing bracket
+        fragment = _render(text, element_start, element_end, scan.edits).strip()
+        if not fragment:
+            continue
+        try:
+            items.append(json.loads(fragment))
+        except json.JSONDecodeError:
+            continue
+    return items
+
+
+def _matches(value: Any, expect: Optional[Union[type, tuple]]) -> bool:
+    return expect is None or isinstance(value, expect)
+
+
+def _is_prose_list(value: Any) -> bool:
+    """Lists of scalars such as citation markers ("[1]", "[a, b]") rarely carry the payload"""
+    return isinstance(value, list) and bool(value) and not any(isinstance(item, (dict, list)) for item in value)
+
+
+def extract_json_detailed(text: str, expect: Optional[Union[type, tuple]] = None) -> ExtractionResult:
+    """
+    Extract the first complete top-level JSON value from LLM output
+
+    Args:
+        text: Raw completion text
+        expect: Optional type (or tuple of types) the value must have; other
+            candidates such as bracketed prose are skipped
+
+    Returns:
+        ExtractionResult with the parsed value and whether it was repaired
+        or salvaged from a truncated completion
+
+    Raises:
+        json.JSONDecodeError: No JSON value could be recovered
+    """
+    stripped = text.strip()
+    if stripped[:1] in ("{", "["):
+        try:
+            value = json.loads(stripped)
+            if _matches(value, expect):
+                offset = text.index(stripped[0])
+                return ExtractionResult(value, offset, offset + len(stripped), False, False)
+        except json.JSONDecodeError:
+            pass
+
+    # A fenced block is the most likely payload; search from it first
+    fence = _FENCE.search(text)
+    search_from = [fence.end(), 0] if fence else [0]
+    fallback: Optional[ExtractionResult] = None
+    decoder = json.JSONDecoder()
+
+    for origin in search_from:
+        pos = origin
+        while True:
+            opener = _OPENERS.search(text, pos)
+            if opener is None:
+                break
+
+            # Well-formed candidates decode in C without the repairing scan
+            try:
+                value, end = decoder.raw_decode(text, opener.start())
+            except json.JSONDecodeError:
+                pass
+            else:
+                if _matches(value, expect):
+                    result = ExtractionResult(value, opener.start(), end, False, False)
+                    if not _is_prose_list(value):
+                        return result
+                    fallback = fallback or result
+                pos = end
+                continue
+
+            scan = _scan(text, opener.start())
+            result = None
+
+            if scan.complete:
+                try:
+                    value = json.loads(_render(text, scan.start, scan.end, scan.edits))
+                    result = ExtractionResult(value, scan.start, scan.end, bool(scan.edits), False)
+                except json.JSONDecodeError:
+                    items = _salvage_elements(text, scan)
+                    if items:
+                        result = ExtractionResult(items, scan.start, scan.end, True, False)
+            else:
+                repaired = _salvage_truncated(text, scan)
+                if repaired is not None:
+                    try:
+                        value = json.loads(repaired)
+                        result = ExtractionResult(value, scan.start, scan.end, True, True)
+                    except json.JSONDecodeError:
+                        pass
+
+            if result is not None and _matches(result.value, expect):
+                if not _is_prose_list(result.value):
+                    return result
+                fallback = fallback or result
+
+            # A truncated candidate ran to the end of the text, so nothing after
+            # it can be complete; otherwise skip past it to keep the search linear
+            if not scan.complete:
+                break
+            pos = scan.end
+
+    if fallback is not None:
+        return fallback
+    raise json.JSONDecodeError("No JSON value found in response", text, 0)
+
+
+def extract_json(text: str, expect: Optional[Union[type, tuple]] = None) -> Any:
+    """Extract and return the first JSON value in LLM output (see extract_json_detailed)"""
+    return extract_json_detailed(text, expect).value
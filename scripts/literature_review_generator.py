@@ -5,19 +5,62 @@ Powered by OpenRouter LLM API
 Generates comprehensive research landscapes with dark mode support
 """
 
+import argparse
 import os
 import json
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from dataclasses import dataclass, asdict
 from enum import Enum
 import sys
-from dotenv import load_dotenv
-load_dotenv()
+from openrouter_transport import OpenRouterTransport
+from query_file import iter_queries
+from response_cache import ResponseCache
+from review_core import (
+    DEFAULT_MODEL,
+    REFRESH_ARTICLES,
+    LiteratureReview,
+    RequestEngine,
+    RetrievalStrategy,
+    TwoPhaseStrategy,
+    article_to_dict,
+    build_review,
+    normalize_article,
+    refresh_review,
+)
+from stream_parser import IncrementalReviewParser
+from review_metrics import metrics, propagate_context, trace
+from review_store import get_review_store
+from semantic_cache import SemanticCache, get_semantic_cache
+
+
+def load_env_file():
+    """
+    Load the nearest .env above this script, like python-dotenv's load_dotenv()
+
+    Only a few stat calls when there is no .env; python-dotenv (~13 ms to
+    import) is loaded just for the file that exists.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            from dotenv import load_dotenv
+
+            load_dotenv(path)
+            return
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return
+        directory = parent
+
+
+load_env_file()
 # Auto-enable ANSI colors on Windows
 if os.name == "nt":
     os.system("")
 
+
 class Colors:
     """ANSI color codes for terminal output"""
     RESET = '\033[0m'
@@ -35,54 +78,63 @@ class Colors:
     MUTED = '\033[38;5;238m'
     DIVIDER = '\033[38;5;59m'
 
+    NAMES = ("RESET", "BOLD", "DIM", "PRIMARY", "ACCENT", "SUCCESS", "WARNING", "ERROR",
+             "HEADING", "TEXT", "MUTED", "DIVIDER")
+
     @staticmethod
     def disable():
         """Disable all colors (test/debug mode)"""
-        for attr in dir(Colors):
-            if not attr.startswith("_") and attr != "disable":
-                setattr(Colors, attr, "")
-
-@dataclass
-class Article:
-    """Structured article data"""
-    title: str
-    authors: list
-    publication_year: int
-    venue: str
-    doi: Optional[str]
-    abstract: str
-    keywords: list
-    research_goal: str
-    methodology: str
-    main_results: str
-    key_contributions: str
-    limitations: str
-    confidence: str
-    source: str
+        for name in Colors.NAMES:
+            setattr(Colors, name, "")
 
 
-@dataclass
-class Synthesis:
-    """Field-wide synthesis data"""
-    field_overview: str
-    gaps_and_challenges: str
-    future_directions: str
-    practical_implications: str
-
-
-@dataclass
-class LiteratureReview:
-    """Complete literature review structure"""
-    query: str
-    articles: list
-    synthesis: dict
-    generated_at: str
+class StageTimer:
+    """Records wall-clock start/end of named pipeline stages relative to a common origin"""
+    
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.stages = {}
+    
+    def start(self, name: str):
+        self.stages[name] = [time.perf_counter() - self.origin, None]
+    
+    def end(self, name: str):
+        self.stages[name][1] = time.perf_counter() - self.origin
+    
+    def mark(self, name: str):
+        """Record an instantaneous event"""
+        now = time.perf_counter() - self.origin
+        self.stages[name] = [now, now]
+    
+    def total(self) -> float:
+        return max((end for _, end in self.stages.values() if end is not None), default=0.0)
+    
+    def report(self):
+        """Print a per-stage timeline with the end-to-end critical path"""
+        total = self.total() or 1e-9
+        print(f"{Colors.HEADING}{Colors.BOLD}\n⏱  PIPELINE TIMING{Colors.RESET}")
+        print(f"{Colors.DIVIDER}{'─'*60}{Colors.RESET}")
+        for name, (start, end) in sorted(self.stages.items(), key=lambda item: item[1][0]):
+            end = start if end is None else end
+            offset = int(start / total * 30)
+            width = max(1, int((end - start) / total * 30))
+            bar = " " * offset + "█" * width
+            print(f"{Colors.TEXT}{name:<22}{start:>7.2f}s → {end:>6.2f}s  {Colors.ACCENT}{bar}{Colors.RESET}")
+        print(f"{Colors.MUTED}Critical path (end-to-end): {total:.2f}s{Colors.RESET}")
 
 
 class LiteratureReviewGenerator:
     """Generate comprehensive literature reviews using OpenRouter API"""
     
-    def __init__(self, api_key: str, model: str = "x-ai/grok-4.1-fast:free", dark_mode: bool = True):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = DEFAULT_MODEL,
+        dark_mode: bool = True,
+        transport: Optional[OpenRouterTransport] = None,
+        cache: Optional[ResponseCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+    ):
         """
         Initialize the generator
         
@@ -90,146 +142,203 @@ class LiteratureReviewGenerator:
             api_key: OpenRouter API key
             model: LLM model to use
             dark_mode: Enable dark mode output
+            transport: Shared HTTP transport (defaults to the process-wide pool)
+            cache: Response cache (defaults to the process-wide cache, None if disabled)
+            semantic_cache: Near-duplicate query cache (defaults to the process-wide cache)
         """
-        self.api_key = api_key
         self.model = model
-        self.base_url = "https://openrouter.ai/chat"
         self.dark_mode = dark_mode
+        self.engine = RequestEngine(api_key, model, transport=transport, cache=cache)
+        self.strategy = TwoPhaseStrategy()
+        self.semantic_cache = semantic_cache if semantic_cache is not None else get_semantic_cache()
         
         if not dark_mode:
             Colors.disable()
     
-    def _make_request(self, prompt: str) -> str:
-        """Call OpenRouter API with structured prompt"""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        
-        payload = {
-            "model": self.model,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.7,
-            "max_tokens": 4000,
-        }
-        
-        try:
-            response = requests.post(self.base_url, headers=headers, json=payload, timeout=60)
-            response.raise_for_status()
-            data = response.json()
-            return data['choices'][0]['message']['content']
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"API request failed: {str(e)}")
-    
-    def generate_review(self, query: str, num_articles: int = 5) -> LiteratureReview:
+    def generate_review(
+        self,
+        query: str,
+        num_articles: int = 5,
+        fan_out: Optional[int] = None,
+        angles: Optional[list] = None,
+        retrieval: bool = False,
+        incremental: bool = False,
+    ) -> LiteratureReview:
         """
         Generate comprehensive literature review
         
         Args:
             query: Research query/topic
             num_articles: Number of articles to generate
+            fan_out: Number of concurrent article sub-requests (default: one
+                per ARTICLES_PER_REQUEST articles, capped at MAX_FAN_OUT)
+            angles: Optional sub-angles of the query, one per sub-request;
+                publication year ranges are used when omitted
+            retrieval: Summarize real records from the retrieval sources
+                instead of generating articles (fan_out and angles are ignored)
+            incremental: Refresh the latest stored review of this exact query
+                with new articles instead of regenerating it (a full review is
+                generated when none is stored)
             
         Returns:
-            LiteratureReview object with structured data
+            LiteratureReview object with structured data; provenance is set
+            when it was reused from a near-duplicate earlier query or refreshed
+            from a stored review
         """
         self._print_header(f"Generating Literature Review: {query}")
+        strategy = RetrievalStrategy() if retrieval else TwoPhaseStrategy(fan_out, angles)
         
-        # Generate article metadata and summaries
-        self._print_section("Retrieving Articles")
-        articles_prompt = self._build_articles_prompt(query, num_articles)
-        articles_json = self._make_request(articles_prompt)
+        if incremental:
+            review_store = get_review_store()
+            previous = review_store.latest_review(query) if review_store is not None else None
+            if previous is not None:
+                return self._refresh_review(strategy, previous, num_articles)
         
-        try:
-            articles_data = json.loads(articles_json)
-        except json.JSONDecodeError:
-            # Extract JSON from response if wrapped in markdown
-            import re
-            match = re.search(r'\[.*\]', articles_json, re.DOTALL)
-            if match:
-                articles_data = json.loads(match.group())
+        # Reviews focused on explicit angles are not interchangeable
+        namespace = f"{strategy.name}:{self.model}:{num_articles}"
+        semantic_cache = self.semantic_cache if not angles else None
+        if semantic_cache is not None:
+            reused = semantic_cache.get_review(query, namespace)
+            if reused is not None:
+                self._print_success(
+                    f"✓ Reusing review of similar query \"{reused.provenance['matched_query']}\" "
+                    f"(similarity {reused.provenance['similarity']:.2f})"
+                )
+                return reused
+        
+        with trace(query=query, model=self.model), metrics.stage("review", strategy=strategy.name):
+            if retrieval:
+                # Real records first, then model summaries of each
+                self._print_section("Searching Literature Sources")
+                records = strategy.retrieve(query, num_articles)
+                self._print_success(f"✓ Found {len(records)} records")
+                self._print_section("Summarizing Articles")
+                articles = strategy.summarize(self.engine, query, records) if records else []
+                self._print_success(f"✓ Summarized {len(articles)} articles")
             else:
-                articles_data = []
+                # Generate article metadata and summaries
+                requests_planned = len(strategy.plan(num_articles))
+                if requests_planned == 1:
+                    self._print_section("Retrieving Articles")
+                else:
+                    self._print_section(f"Retrieving Articles ({requests_planned} parallel requests)")
+                articles = strategy.fetch_articles(self.engine, query, num_articles)
+                self._print_success(f"✓ Retrieved {len(articles)} articles")
+            
+            # Generate synthesis
+            self._print_section("Analyzing Field & Generating Synthesis")
+            synthesis_data = strategy.synthesize(self.engine, query, articles)
+            self._print_success("✓ Synthesis complete")
         
-        articles = [Article(**article) for article in articles_data]
-        self._print_success(f"✓ Retrieved {len(articles)} articles")
+        review = build_review(query, articles, synthesis_data)
+        if semantic_cache is not None and articles:
+            semantic_cache.put_review(review, namespace)
+        return review
+    
+    def _refresh_review(self, strategy, previous: dict, num_articles: int) -> LiteratureReview:
+        """Add new articles to a stored review, re-synthesizing only when enough changed"""
+        self._print_section(
+            f"Refreshing Review #{previous['id']} from {previous['generated_at'][:10]} "
+            f"({len(previous['articles'])} articles)"
+        )
+        with trace(query=previous["query"], model=self.model):
+            review = refresh_review(self.engine, strategy, previous, min(num_articles, REFRESH_ARTICLES))
+        provenance = review.provenance
+        self._print_success(f"✓ Added {provenance['new_articles']} new articles")
+        if provenance["resynthesized"]:
+            self._print_success("✓ Synthesis regenerated")
+        else:
+            self._print_success("✓ Synthesis unchanged (too few new articles)")
+        return review
+    
+    def generate_review_pipelined(
+        self,
+        query: str,
+        num_articles: int = 5,
+        export_path: Optional[str] = None,
+    ) -> LiteratureReview:
+        """
+        Generate, display and export a review with overlapping stages
         
-        # Generate synthesis
-        self._print_section("Analyzing Field & Generating Synthesis")
-        synthesis_prompt = self._build_synthesis_prompt(query, articles)
-        synthesis_json = self._make_request(synthesis_prompt)
+        Articles are streamed and rendered as each object closes. The synthesis
+        request starts as soon as all requested titles have streamed in, while
+        the remaining article bodies, rendering and the article export are still
+        in progress. A per-stage timeline is printed at the end.
         
-        try:
-            synthesis_data = json.loads(synthesis_json)
-        except json.JSONDecodeError:
-            import re
-            match = re.search(r'\{.*\}', synthesis_json, re.DOTALL)
-            if match:
-                synthesis_data = json.loads(match.group())
-            else:
-                synthesis_data = {}
+        Args:
+            query: Research query/topic
+            num_articles: Number of articles to generate
+            export_path: Optional JSON export path
+            
+        Returns:
+            LiteratureReview object with structured data
+        """
+        timer = StageTimer()
+        self._print_header(f"Generating Literature Review: {query}")
+        print(f"{Colors.HEADING}{Colors.BOLD}\n📚 RESEARCH ARTICLES{Colors.RESET}\n")
         
-        self._print_success("✓ Synthesis complete")
+        parser = IncrementalReviewParser()
+        titles = []
+        articles = []
+        synthesis_future = None
+        executor = ThreadPoolExecutor(max_workers=1)
         
-        from datetime import datetime
-        review = LiteratureReview(
-            query=query,
-            articles=[asdict(article) for article in articles],
-            synthesis=synthesis_data,
-            generated_at=datetime.now().isoformat()
-        )
+        def start_synthesis(snapshot: tuple):
+            timer.start("synthesis")
+            synthesis_data = self.strategy.synthesize(self.engine, query, snapshot)
+            timer.end("synthesis")
+            return synthesis_data
         
+        try:
+            timer.start("articles_stream")
+            payload = self.strategy.articles_payload(self.engine, query, num_articles)
+            usage = {}
+            for delta in self.engine.stream(payload, on_usage=usage.update):
+                if "first_token" not in timer.stages:
+                    timer.mark("first_token")
+                for kind, _, value in parser.feed(delta):
+                    if kind == "article_title":
+                        titles.append(value)
+                        if len(titles) == num_articles and synthesis_future is None:
+                            synthesis_future = executor.submit(propagate_context(start_synthesis), tuple(titles))
+                    elif kind == "article":
+                        article = normalize_article(value)
+                        if not articles:
+                            timer.mark("first_article")
+                        articles.append(article)
+                        self._print_article(article_to_dict(article), len(articles) - 1)
+            timer.end("articles_stream")
+            self.engine.budget.observe_articles(len(articles), usage)
+            
+            # The stream ended before all titles appeared: synthesize what we have
+            if synthesis_future is None:
+                synthesis_future = executor.submit(propagate_context(start_synthesis), tuple(titles))
+            
+            if export_path:
+                timer.start("export_articles")
+                self.export_json(build_review(query, articles, {}), export_path, store=False)
+                timer.end("export_articles")
+            
+            synthesis_data = synthesis_future.result()
+        except BaseException:
+            # The article phase failed: do not start (or wait for) a synthesis nobody will use
+            if synthesis_future is not None:
+                synthesis_future.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        self._print_synthesis(synthesis_data)
+        review = build_review(query, articles, synthesis_data)
+        if export_path:
+            timer.start("export_final")
+            self.export_json(review, export_path)
+            timer.end("export_final")
+        
+        timer.report()
+        metrics.record_stage("review", timer.total(), strategy="pipelined")
         return review
     
-    def _build_articles_prompt(self, query: str, num_articles: int) -> str:
-        """Build prompt for article generation"""
-        return f"""Generate {num_articles} realistic academic articles for the research topic: "{query}"
-
-Return ONLY a valid JSON array with this exact structure for each article:
-[
-  {{
-    "title": "Article Title",
-    "authors": ["Author Name 1", "Author Name 2"],
-    "publication_year": 2024,
-    "venue": "Journal/Conference Name",
-    "doi": "10.xxxx/xxxxx",
-    "abstract": "Research abstract...",
-    "keywords": ["keyword1", "keyword2"],
-    "research_goal": "What the research aimed to achieve",
-    "methodology": "Methods and data used",
-    "main_results": "Key findings and results",
-    "key_contributions": "Novel contributions to the field",
-    "limitations": "Limitations and open questions",
-    "confidence": "high",
-    "source": "arXiv/Journal"
-  }}
-]
-
-Ensure all fields are filled with realistic, credible information relevant to the query."""
-
-    def _build_synthesis_prompt(self, query: str, articles: list) -> str:
-        """Build prompt for synthesis generation"""
-        articles_summary = "\n".join([f"- {a.title} ({a.publication_year})" for a in articles])
-        
-        return f"""Analyze these research articles on "{query}" and provide a comprehensive field synthesis:
-
-Articles:
-{articles_summary}
-
-Return ONLY valid JSON with this structure:
-{{
-  "field_overview": "Overview of common themes, trends, and methodologies in the field",
-  "gaps_and_challenges": "Underexplored areas, methodological gaps, and open challenges",
-  "future_directions": "Promising research directions and emerging opportunities",
-  "practical_implications": "Real-world applications and industry relevance"
-}}
-
-Provide insightful, evidence-based analysis."""
-
     def _print_header(self, text: str):
         """Print section header"""
         print(f"\n{Colors.PRIMARY}{Colors.BOLD}{'='*70}{Colors.RESET}")
@@ -245,44 +354,45 @@ Provide insightful, evidence-based analysis."""
         """Print success message"""
         print(f"{Colors.SUCCESS}{text}{Colors.RESET}")
     
-    def _print_article(self, article: Article, index: int):
+    def _print_article(self, article: dict, index: int):
         """Pretty print article details"""
-        print(f"\n{Colors.ACCENT}{Colors.BOLD}Article {index + 1}: {article.title}{Colors.RESET}")
-        print(f"{Colors.TEXT}Authors: {', '.join(article.authors)}{Colors.RESET}")
-        print(f"{Colors.TEXT}{article.venue} ({article.publication_year}){Colors.RESET}")
+        print(f"\n{Colors.ACCENT}{Colors.BOLD}Article {index + 1}: {article['title']}{Colors.RESET}")
+        print(f"{Colors.TEXT}Authors: {', '.join(article['authors'])}{Colors.RESET}")
+        print(f"{Colors.TEXT}{article['venue']} ({article['publication_year']}){Colors.RESET}")
         
-        if article.doi:
-            print(f"{Colors.MUTED}DOI: {article.doi}{Colors.RESET}")
+        if article['doi']:
+            print(f"{Colors.MUTED}DOI: {article['doi']}{Colors.RESET}")
         
         print(f"\n{Colors.HEADING}Research Goal:{Colors.RESET}")
-        print(f"{Colors.TEXT}{article.research_goal}{Colors.RESET}")
+        print(f"{Colors.TEXT}{article['research_goal']}{Colors.RESET}")
         
         print(f"\n{Colors.HEADING}Methodology:{Colors.RESET}")
-        print(f"{Colors.TEXT}{article.methodology}{Colors.RESET}")
+        print(f"{Colors.TEXT}{article['methodology']}{Colors.RESET}")
         
         print(f"\n{Colors.HEADING}Main Results:{Colors.RESET}")
-        print(f"{Colors.TEXT}{article.main_results}{Colors.RESET}")
+        print(f"{Colors.TEXT}{article['main_results']}{Colors.RESET}")
         
         print(f"\n{Colors.HEADING}Key Contributions:{Colors.RESET}")
-        print(f"{Colors.TEXT}{article.key_contributions}{Colors.RESET}")
+        print(f"{Colors.TEXT}{article['key_contributions']}{Colors.RESET}")
         
         print(f"\n{Colors.HEADING}Limitations:{Colors.RESET}")
-        print(f"{Colors.TEXT}{article.limitations}{Colors.RESET}")
+        print(f"{Colors.TEXT}{article['limitations']}{Colors.RESET}")
         
-        print(f"\n{Colors.MUTED}Confidence: {article.confidence} | Source: {article.source}{Colors.RESET}")
+        print(f"\n{Colors.MUTED}Confidence: {article['confidence']} | Source: {article['source']}{Colors.RESET}")
     
     def display_review(self, review: LiteratureReview):
         """Display formatted literature review"""
         self._print_header(f"Literature Review Results: {review.query}")
         
         # Display articles
-        print(f"{Colors.HEADING}{Colors.BOLD}\n📚 RESEARCH ARTICLES ({len(review['articles'])}){Colors.RESET}\n")
-        for idx, article_dict in enumerate(review['articles']):
-            article = Article(**article_dict)
+        print(f"{Colors.HEADING}{Colors.BOLD}\n📚 RESEARCH ARTICLES ({len(review.articles)}){Colors.RESET}\n")
+        for idx, article in enumerate(review.articles):
             self._print_article(article, idx)
         
-        # Display synthesis
-        synthesis = review['synthesis']
+        self._print_synthesis(review.synthesis)
+    
+    def _print_synthesis(self, synthesis: dict):
+        """Display field synthesis"""
         print(f"\n{Colors.PRIMARY}{Colors.BOLD}{'='*70}{Colors.RESET}")
         print(f"{Colors.HEADING}{Colors.BOLD}\n🔍 FIELD ANALYSIS & SYNTHESIS{Colors.RESET}\n")
         
@@ -300,39 +410,77 @@ Provide insightful, evidence-based analysis."""
         
         print(f"{Colors.PRIMARY}{Colors.BOLD}{'='*70}{Colors.RESET}\n")
     
-    def export_json(self, review: LiteratureReview, filepath: str):
-        """Export review to JSON file"""
+    def export_json(self, review: LiteratureReview, filepath: str, store: bool = True):
+        """Export review to JSON file and record it in the review store"""
+        data = {
+            "query": review.query,
+            "articles": review.articles,
+            "synthesis": review.synthesis,
+            "generated_at": review.generated_at,
+        }
         with open(filepath, 'w') as f:
-            json.dump(review, f, indent=2)
+            json.dump(data, f, indent=2)
         print(f"{Colors.SUCCESS}✓ Review exported to {filepath}{Colors.RESET}")
+        
+        review_store = get_review_store() if store else None
+        if review_store is not None:
+            review_id = review_store.add_review(
+                review.query, review.articles, review.synthesis, review.generated_at, self.model
+            )
+            print(f"{Colors.SUCCESS}✓ Review stored as #{review_id} in {review_store.path}{Colors.RESET}")
+
+
+def generate_and_export(generator: LiteratureReviewGenerator, query: str, export_path: str):
+    """Generate, display and export one review, honouring the PIPELINED, RETRIEVAL and INCREMENTAL switches"""
+    print(f"{Colors.TEXT}Query: {query}{Colors.RESET}")
+    if os.getenv("PIPELINED") == "1":
+        # Streams, renders and exports articles while synthesis is in flight
+        generator.generate_review_pipelined(query, num_articles=3, export_path=export_path)
+        return
+    review = generator.generate_review(
+        query,
+        num_articles=3,
+        retrieval=os.getenv("RETRIEVAL") == "1",
+        incremental=os.getenv("INCREMENTAL") == "1",
+    )
+    generator.display_review(review)
+    generator.export_json(review, export_path)
 
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Generate, display and export literature reviews")
+    parser.add_argument(
+        "--query-file",
+        help="review each line of this file ('-' for stdin) in one process, "
+             "exporting literature_review_output_<n>.json per query",
+    )
+    args = parser.parse_args()
+
     api_key = os.getenv('OPENROUTER_API_KEY')
     
     if not api_key:
         print(f"{Colors.ERROR}Error: OPENROUTER_API_KEY environment variable not set{Colors.RESET}")
         sys.exit(1)
     
-    # Example queries
-    queries = [
-        "transformer-based OCR for historical documents",
-        "social thermodynamics of learning in reinforcement learning",
-        "federated learning for edge computing"
-    ]
-    
     generator = LiteratureReviewGenerator(api_key, dark_mode=True)
-    
-    # Generate and display review for first query
-    query = queries[0]
     print(f"\n{Colors.PRIMARY}Starting literature review generator...{Colors.RESET}")
-    print(f"{Colors.TEXT}Query: {query}{Colors.RESET}")
-    
+
+    if args.query_file:
+        # One process, engine and connection pool for every query of the file
+        failed = False
+        for index, query in enumerate(iter_queries(args.query_file), 1):
+            try:
+                generate_and_export(generator, query, f"literature_review_output_{index}.json")
+            except Exception as e:
+                failed = True
+                print(f"{Colors.ERROR}Error: {str(e)}{Colors.RESET}")
+        sys.exit(1 if failed else 0)
+
+    # Example query
+    query = "transformer-based OCR for historical documents"
     try:
-        review = generator.generate_review(query, num_articles=3)
-        generator.display_review(review)
-        generator.export_json(review, "literature_review_output.json")
+        generate_and_export(generator, query, "literature_review_output.json")
     except Exception as e:
         print(f"{Colors.ERROR}Error: {str(e)}{Colors.RESET}")
         sys.exit(1)
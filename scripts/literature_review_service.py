@@ -3,212 +3,270 @@ Professional Literature Review Backend Service
 Integrates with OpenRouter API to generate comprehensive research landscapes
 """
 
+import argparse
 import json
 import os
 import sys
-from typing import Optional
-import requests
-from dataclasses import dataclass, asdict
-from datetime import datetime
-
-
-@dataclass
-class Article:
-    """Structured article metadata"""
-    title: str
-    authors: list[str]
-    publicationYear: int
-    venue: str
-    abstract: str
-    keywords: list[str]
-    researchGoal: str
-    methodology: str
-    mainResults: str
-    keyContributions: str
-    limitations: str
-    confidence: str  # "low" | "medium" | "high"
-    source: str
-    doi: Optional[str] = None
-
-
-@dataclass
-class Synthesis:
-    """Field-wide analysis and synthesis"""
-    fieldOverview: str
-    gapsAndChallenges: str
-    futureDirections: str
-
-
-@dataclass
-class LiteratureReview:
-    """Complete literature review response"""
-    articles: list[Article]
-    synthesis: Synthesis
+import threading
+import time
+from typing import Iterator, Optional
+
+from openrouter_transport import OpenRouterTransport
+from query_file import iter_queries
+from response_cache import ResponseCache
+from review_core import (
+    CAMEL_NAMES,
+    DEFAULT_MODEL,
+    LiteratureReview,
+    RequestEngine,
+    RetrievalStrategy,
+    SingleShotStrategy,
+    article_to_dict,
+    build_review,
+    normalize_article,
+    normalize_synthesis,
+    parse_review,
+    review_events,
+    review_to_dict,
+    to_camel,
+)
+from review_metrics import metrics, trace
+from review_store import get_review_store
+from semantic_cache import SemanticCache, get_semantic_cache
+from stream_parser import IncrementalReviewParser
+
+DEFAULT_SERVICE_HOST = "127.0.0.1"
+DEFAULT_SERVICE_PORT = 8765
 
 
 class LiteratureReviewGenerator:
     """Professional literature review generator using OpenRouter API"""
 
-    def __init__(self, api_key: str, model: Optional[str] = None):
-        """Initialize with OpenRouter API key and optional custom model"""
-        self.api_key = api_key
-        self.base_url = "https://openrouter.ai/api/v1/chat/completions"
-        self.model = model or os.getenv("MODEL", "x-ai/grok-4.1-fast:free")
+    def __init__(
+        self,
+        api_key: str,
+        model: Optional[str] = None,
+        transport: Optional[OpenRouterTransport] = None,
+        cache: Optional[ResponseCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        retrieval: Optional[bool] = None,
+    ):
+        """
+        Initialize with OpenRouter API key, optional custom model, shared transport and response caches
+
+        With retrieval (default: LITREVIEW_RETRIEVAL=1) articles are real records
+        from the retrieval sources, summarized by the model, instead of generated.
+        """
+        self.model = model or os.getenv("MODEL", DEFAULT_MODEL)
+        self.engine = RequestEngine(api_key, self.model, transport=transport, cache=cache)
+        if retrieval is None:
+            retrieval = os.getenv("LITREVIEW_RETRIEVAL") == "1"
+        self.strategy = RetrievalStrategy() if retrieval else SingleShotStrategy()
+        self.semantic_cache = semantic_cache if semantic_cache is not None else get_semantic_cache()
+        # Reviews from other models or strategies are never reused
+        self.semantic_namespace = f"{self.strategy.name}:{self.model}"
+
+    def _reuse_review(self, query: str) -> Optional[LiteratureReview]:
+        """Return the review of a near-duplicate earlier query, if any"""
+        if self.semantic_cache is None:
+            return None
+        review = self.semantic_cache.get_review(query, self.semantic_namespace)
+        if review is not None:
+            print(
+                f"[LiteratureReviewService] Reusing review of similar query: {review.provenance['matched_query']} "
+                f"(similarity {review.provenance['similarity']:.2f})",
+                file=sys.stderr,
+            )
+        return review
 
     def generate_review(self, query: str) -> LiteratureReview:
         """Generate comprehensive literature review for given research query"""
+        reused = self._reuse_review(query)
+        if reused is not None:
+            return reused
+
+        print(f"[LiteratureReviewService] Generating review for query: {query}", file=sys.stderr)
+        with trace(query=query, model=self.model):
+            try:
+                review = self.strategy.run(self.engine, query)
+            except json.JSONDecodeError as e:
+                raise Exception(f"JSON parsing error: {str(e)}")
+        print("[LiteratureReviewService] Review generated successfully", file=sys.stderr)
+
+        if self.semantic_cache is not None:
+            self.semantic_cache.put_review(review, self.semantic_namespace)
+        return review
+
+    def generate_review_stream(self, query: str) -> Iterator[dict]:
+        """
+        Stream a literature review as incremental events
+
+        Yields dicts with a "type" of "article" (as soon as each article object
+        closes), "synthesis_field" (as soon as each synthesis string closes),
+        "synthesis" and finally "done". Articles and synthesis use the
+        frontend's camelCase field names. A review reused from a similar
+        earlier query carries its provenance on the "done" event.
+        """
+        reused = self._reuse_review(query)
+        if reused is not None:
+            yield from review_events(reused, provenance=to_camel(reused.provenance))
+            return
+
+        if isinstance(self.strategy, RetrievalStrategy):
+            # Retrieved records arrive together; only the model's summaries take time
+            yield from review_events(self.generate_review(query))
+            return
+
+        payload = self.strategy.build_payload(self.engine, query)
+
+        cached_content = self.engine.cached(payload)
+        if cached_content is not None:
+            print(f"[LiteratureReviewService] Cache hit for query: {query}", file=sys.stderr)
+            articles, synthesis = parse_review(cached_content)
+            for index, article in enumerate(articles):
+                yield {"type": "article", "index": index, "article": to_camel(article_to_dict(article))}
+            yield {"type": "synthesis", "synthesis": to_camel(synthesis)}
+            yield {"type": "done", "articleCount": len(articles)}
+            return
+
+        print(f"[LiteratureReviewService] Streaming OpenRouter API for query: {query}", file=sys.stderr)
+
+        parser = IncrementalReviewParser()
+        articles = []
+        synthesis = {}
+        parse_seconds = 0.0
+        usage = {}
+        # Only a completion that closed its top-level object is worth caching
+        for delta in self.engine.stream(payload, validate=lambda _: parser.done, on_usage=usage.update):
+            started = time.perf_counter()
+            events = parser.feed(delta)
+            parse_seconds += time.perf_counter() - started
+            for kind, key, value in events:
+                if kind == "article":
+                    article = normalize_article(value)
+                    yield {"type": "article", "index": len(articles), "article": to_camel(article_to_dict(article))}
+                    articles.append(article)
+                elif kind == "synthesis_field":
+                    yield {"type": "synthesis_field", "field": CAMEL_NAMES.get(key, key), "value": value}
+                elif kind == "synthesis":
+                    synthesis = normalize_synthesis(value)
+                    yield {"type": "synthesis", "synthesis": to_camel(synthesis)}
+
+        # Total time spent in the incremental parser across all chunks
+        metrics.record_stage("parse", parse_seconds, mode="incremental")
+        if not articles:
+            raise Exception("No articles in streamed OpenRouter response")
+        self.engine.budget.observe_articles(len(articles), usage, synthesis=True)
+
+        if self.semantic_cache is not None and parser.done:
+            self.semantic_cache.put_review(build_review(query, articles, synthesis), self.semantic_namespace)
+        yield {"type": "done", "articleCount": len(articles)}
+
+    def export_json(
+        self,
+        review: LiteratureReview,
+        filename: str = "literature_review_output.json",
+        query: Optional[str] = None,
+    ):
+        """Export review to JSON file and record it in the review store"""
+        data = review_to_dict(review)
+        data["generated_at"] = review.generated_at
 
-        system_prompt = """You are an expert research assistant specialized in literature review and summarization.
-Your task is to generate a comprehensive literature landscape for the given research query.
-
-For each article, provide accurate metadata and structured information following this exact JSON format:
-{
-  "articles": [
-    {
-      "title": "Article Title",
-      "authors": ["Author Name", "Another Author"],
-      "publicationYear": 2024,
-      "venue": "Journal/Conference Name",
-      "doi": "10.xxxx/xxxxx",
-      "abstract": "Clear, concise abstract",
-      "keywords": ["keyword1", "keyword2"],
-      "researchGoal": "Main research objective",
-      "methodology": "Methods and data used",
-      "mainResults": "Key findings and conclusions",
-      "keyContributions": "Novel contributions to field",
-      "limitations": "Limitations and open questions",
-      "confidence": "high|medium|low",
-      "source": "Semantic Scholar|arXiv|IEEE|ACM"
-    }
-  ],
-  "synthesis": {
-    "fieldOverview": "Common themes and trends in the field",
-    "gapsAndChallenges": "Underexplored areas and open problems",
-    "futureDirections": "Potential research directions"
-  }
-}
-
-Generate 5-10 diverse, realistic articles. Return ONLY valid JSON, no markdown or additional text."""
-
-        user_message = f"""Generate a comprehensive literature landscape for this research query: "{query}"
-
-Retrieve 5-10 highly relevant articles with complete metadata. For each article:
-- Provide realistic, plausible research information
-- Set confidence level based on relevance
-- Include keywords, methodology, and contributions
-- Note any limitations or open questions
-
-Format as valid JSON matching the specified schema."""
-
-        print(f"[LiteratureReviewService] Calling OpenRouter API for query: {query}")
+        with open(filename, "w") as f:
+            json.dump(data, f, indent=2)
 
-        try:
-            response = requests.post(
-                self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_message},
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 4000,
-                },
-                timeout=60,
-            )
+        print(f"[LiteratureReviewService] Review exported to {filename}", file=sys.stderr)
 
-            if response.status_code != 200:
-                raise Exception(f"OpenRouter API error: {response.status_code} - {response.text}")
+        store = get_review_store()
+        if store is not None:
+            review_id = store.add_review(
+                query or review.query, review.articles, review.synthesis, review.generated_at, self.model
+            )
+            print(f"[LiteratureReviewService] Review stored as #{review_id} in {store.path}", file=sys.stderr)
 
-            data = response.json()
-            content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
 
-            if not content:
-                raise Exception("No content in OpenRouter response")
+class GeneratorPool:
+    """Keeps one warm LiteratureReviewGenerator per (api_key, model) pair"""
 
-            print("[LiteratureReviewService] OpenRouter response received successfully")
+    def __init__(self):
+        self._generators: dict[tuple[str, str], LiteratureReviewGenerator] = {}
+        self._lock = threading.Lock()
 
-            # Parse JSON response
-            parsed_data = self._parse_response(content)
-            review = self._validate_and_structure_response(parsed_data)
+    def get(self, api_key: str, model: Optional[str] = None) -> LiteratureReviewGenerator:
+        """Return the cached generator for this key/model, creating it on first use"""
+        key = (api_key, model or "")
+        with self._lock:
+            generator = self._generators.get(key)
+            if generator is None:
+                generator = LiteratureReviewGenerator(api_key, model)
+                self._generators[key] = generator
+            return generator
 
-            return review
 
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Request error: {str(e)}")
-        except json.JSONDecodeError as e:
-            raise Exception(f"JSON parsing error: {str(e)}")
+def serve(host: str = DEFAULT_SERVICE_HOST, port: int = DEFAULT_SERVICE_PORT):
+    """Run the persistent review service until interrupted"""
+    from review_server import ReviewServer
 
-    def _parse_response(self, content: str) -> dict:
-        """Parse JSON response from OpenRouter"""
+    server = ReviewServer((host, port), GeneratorPool())
+    print(f"[LiteratureReviewService] Serving on http://{host}:{port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def run_query_file(generator: LiteratureReviewGenerator, path: str, stream: bool = False) -> int:
+    """
+    Answer every query in a file with one warm generator, so the interpreter
+    start-up, imports and connection pool are paid once for the batch
+
+    Each review (or, with stream, each event) is printed as one JSON line
+    tagged with its query; a failed query prints an error line and the rest
+    still run. Returns the exit status: 1 if any query failed.
+    """
+    failed = False
+    for query in iter_queries(path):
+        print(f"[LiteratureReviewService] Generating review for: {query}", file=sys.stderr)
         try:
-            return json.loads(content)
-        except json.JSONDecodeError:
-            # Try to extract JSON from markdown code blocks
-            if "\`\`\`json" in content:
-                json_str = content.split("\`\`\`json")[1].split("\`\`\`")[0].strip()
-                return json.loads(json_str)
-            elif "\`\`\`" in content:
-                json_str = content.split("\`\`\`")[1].split("\`\`\`")[0].strip()
-                return json.loads(json_str)
-            elif "{" in content:
-                json_str = content[content.find("{") : content.rfind("}") + 1]
-                return json.loads(json_str)
-            raise
-
-    def _validate_and_structure_response(self, data: dict) -> LiteratureReview:
-        """Validate and structure response into dataclass objects"""
-        articles_data = data.get("articles", [])
-        synthesis_data = data.get("synthesis", {})
-
-        articles = [
-            Article(
-                title=a.get("title", "Unknown"),
-                authors=a.get("authors", []),
-                publicationYear=a.get("publicationYear", 2024),
-                venue=a.get("venue", "Unknown"),
-                abstract=a.get("abstract", ""),
-                keywords=a.get("keywords", []),
-                researchGoal=a.get("researchGoal", ""),
-                methodology=a.get("methodology", ""),
-                mainResults=a.get("mainResults", ""),
-                keyContributions=a.get("keyContributions", ""),
-                limitations=a.get("limitations", ""),
-                confidence=a.get("confidence", "medium"),
-                source=a.get("source", "Unknown"),
-                doi=a.get("doi"),
-            )
-            for a in articles_data
-        ]
-
-        synthesis = Synthesis(
-            fieldOverview=synthesis_data.get("fieldOverview", ""),
-            gapsAndChallenges=synthesis_data.get("gapsAndChallenges", ""),
-            futureDirections=synthesis_data.get("futureDirections", ""),
-        )
-
-        return LiteratureReview(articles=articles, synthesis=synthesis)
-
-    def export_json(self, review: LiteratureReview, filename: str = "literature_review_output.json"):
-        """Export review to JSON file"""
-        data = {
-            "articles": [asdict(article) for article in review.articles],
-            "synthesis": asdict(review.synthesis),
-            "generated_at": datetime.now().isoformat(),
-        }
-
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=2)
-
-        print(f"[LiteratureReviewService] Review exported to {filename}")
+            if stream:
+                for event in generator.generate_review_stream(query):
+                    print(json.dumps({"query": query, **event}), flush=True)
+            else:
+                print(json.dumps({"query": query, **review_to_dict(generator.generate_review(query))}), flush=True)
+        except Exception as e:
+            failed = True
+            error = {"type": "error", "error": str(e)} if stream else {"error": str(e)}
+            print(json.dumps({"query": query, **error}), flush=True)
+            print(f"Error: {str(e)}", file=sys.stderr)
+    return 1 if failed else 0
 
 
 def main():
     """Example usage"""
+    parser = argparse.ArgumentParser(description="Literature review backend service")
+    parser.add_argument("--serve", action="store_true", help="run as a persistent HTTP service")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=os.getenv("STREAM") == "1",
+        help="emit review events as NDJSON on stdout while the completion streams",
+    )
+    parser.add_argument(
+        "--query-file",
+        help="answer each line of this file ('-' for stdin) in one process, one JSON line per query",
+    )
+    parser.add_argument("--host", default=os.getenv("LITREVIEW_SERVICE_HOST", DEFAULT_SERVICE_HOST))
+    parser.add_argument(
+        "--port", type=int, default=int(os.getenv("LITREVIEW_SERVICE_PORT", DEFAULT_SERVICE_PORT))
+    )
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.host, args.port)
+        return
+
     api_key = os.getenv("OPENROUTER_API_KEY")
     if not api_key:
         print("Error: OPENROUTER_API_KEY environment variable not set")
@@ -218,16 +276,23 @@ def main():
     custom_model = os.getenv("MODEL")
 
     generator = LiteratureReviewGenerator(api_key, custom_model)
+    if args.query_file:
+        sys.exit(run_query_file(generator, args.query_file, args.stream))
     print(f"[LiteratureReviewService] Generating review for: {query}", file=sys.stderr)
 
+    if args.stream:
+        try:
+            for event in generator.generate_review_stream(query):
+                print(json.dumps(event), flush=True)
+        except Exception as e:
+            print(json.dumps({"type": "error", "error": str(e)}), flush=True)
+            print(f"Error: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+        return
+
     try:
         review = generator.generate_review(query)
-
-        output = {
-            "articles": [asdict(article) for article in review.articles],
-            "synthesis": asdict(review.synthesis),
-        }
-        print(json.dumps(output))
+        print(json.dumps(review_to_dict(review)))
 
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)
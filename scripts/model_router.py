@@ -0,0 +1,295 @@
+"""
+Model Router
+Sends each completion to the healthiest configured model, hedges with a
+duplicate request to the next model once the first runs past its p90
+latency, falls back immediately on errors, and cancels whichever request
+loses the race
+
+Set OPENROUTER_FALLBACK_MODELS="model-a,model-b" to route every engine's
+model through those fallbacks.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+from review_metrics import metrics, propagate_context
+
+# Hedge delay until a model has enough samples for a percentile (seconds);
+# short enough that a stall during warm-up is hedged instead of waited out
+INITIAL_HEDGE_DELAY = 1.0
+MIN_HEDGE_DELAY = 0.5
+MAX_HEDGE_DELAY = 30.0
+
+
+class RequestCancelled(Exception):
+    """Raised inside a request that lost the race to another model"""
+
+
+class CancelToken:
+    """Cancellation flag that also closes the resources registered with it"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def on_cancel(self, callback: Callable[[], None]):
+        """Run callback on cancel (immediately when already cancelled)"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def cancel(self):
+        with self._lock:
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def check(self):
+        if self._event.is_set():
+            raise RequestCancelled()
+
+
+class ModelStats:
+    """Rolling latency and error window for one model and request kind"""
+
+    def __init__(self, window: int = 50):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, ok: bool, latency: Optional[float] = None):
+        with self._lock:
+            self.outcomes.append(ok)
+            if ok and latency is not None:
+                self.latencies.append(latency)
+
+    def record_lower_bound(self, latency: float):
+        """
+        Record the elapsed time of an attempt that lost the race or was cancelled
+
+        The attempt would have taken at least this long; dropping it would leave
+        only the fast requests in the window and bias the percentiles low.
+        Outcomes are untouched, a lost race is not an error.
+        """
+        with self._lock:
+            self.latencies.append(latency)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        with self._lock:
+            if not self.latencies:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    @property
+    def samples(self) -> int:
+        return len(self.outcomes)
+
+    @property
+    def latency_samples(self) -> int:
+        with self._lock:
+            return len(self.latencies)
+
+
+class ModelRouter:
+    """Hedged, fail-over execution of one request across an ordered list of models"""
+
+    def __init__(
+        self,
+        models: list,
+        hedge_percentile: float = 0.9,
+        min_samples: int = 5,
+        max_error_rate: float = 0.5,
+        deadline: Optional[float] = None,
+        window: int = 50,
+    ):
+        """
+        Args:
+            models: Models in order of preference; the first is the primary
+            hedge_percentile: Latency percentile after which the next model is hedged
+            min_samples: Samples needed before percentiles and error rates are trusted
+            max_error_rate: Models failing more often than this are tried last
+            deadline: Seconds after which a request fails even if models are still
+                running (None leaves it to the transport timeout)
+            window: Requests kept in each model's rolling window
+        """
+        if not models:
+            raise ValueError("ModelRouter needs at least one model")
+        self.models = list(dict.fromkeys(models))
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.deadline = deadline
+        self.window = window
+        self._stats: dict = {}
+        self._stats_lock = threading.Lock()
+        # Attempts are I/O bound; size for many concurrent requests each racing a few models
+        self._executor = ThreadPoolExecutor(max_workers=16 * len(self.models), thread_name_prefix="router")
+
+    def stats(self, model: str, kind: str = "complete") -> ModelStats:
+        with self._stats_lock:
+            stats = self._stats.get((model, kind))
+            if stats is None:
+                stats = self._stats[(model, kind)] = ModelStats(self.window)
+            return stats
+
+    def order(self, kind: str = "complete") -> list:
+        """Configured order, with models over the error-rate limit moved to the end"""
+        def failing(model: str) -> bool:
+            stats = self.stats(model, kind)
+            return stats.samples >= self.min_samples and stats.error_rate > self.max_error_rate
+        return sorted(self.models, key=failing)
+
+    def hedge_delay(self, model: str, kind: str = "complete") -> float:
+        """Seconds to wait on model before hedging with the next one"""
+        stats = self.stats(model, kind)
+        latency = stats.percentile(self.hedge_percentile) if stats.latency_samples >= self.min_samples else None
+        if latency is None:
+            return INITIAL_HEDGE_DELAY
+        return min(MAX_HEDGE_DELAY, max(MIN_HEDGE_DELAY, latency))
+
+    def run(self, attempt: Callable[[str, CancelToken], object], kind: str = "complete") -> tuple:
+        """
+        Run attempt(model, token) on the primary model, hedging and falling back
+
+        The next model is started when the newest attempt runs past its
+        hedge delay, or at once when an attempt fails. The first attempt to
+        return wins; the others are cancelled through their tokens.
+
+        Returns:
+            (model, result) of the winning attempt
+
+        Raises:
+            The last attempt's exception when every model failed, or
+            TimeoutError when the deadline passed first
+        """
+        pending = {}
+        queue = self.order(kind)
+        started = time.perf_counter()
+        last_error: Optional[BaseException] = None
+
+        def launch():
+            model = queue.pop(0)
+            token = CancelToken()
+            future = self._executor.submit(propagate_context(attempt), model, token)
+            pending[future] = (model, token, time.perf_counter())
+            return model
+
+        newest = launch()
+        next_hedge = time.perf_counter() + self.hedge_delay(newest, kind)
+        try:
+            while pending:
+                now = time.perf_counter()
+                timeout = next_hedge - now if queue else None
+                if self.deadline is not None:
+                    remaining = started + self.deadline - now
+                    if remaining <= 0:
+                        raise TimeoutError(f"No model answered within {self.deadline:g}s")
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+                done, _ = wait(pending, timeout=max(0.0, timeout) if timeout is not None else None,
+                               return_when=FIRST_COMPLETED)
+
+                if not done:
+                    if queue and time.perf_counter() >= next_hedge:
+                        metrics.inc("hedged_requests_total", model=newest, kind=kind)
+                        metrics.log("hedge", model=newest, kind=kind)
+                        newest = launch()
+                        next_hedge = time.perf_counter() + self.hedge_delay(newest, kind)
+                    continue
+
+                failed = None
+                for future in done:
+                    model, token, launched = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except RequestCancelled:
+                        self.stats(model, kind).record_lower_bound(time.perf_counter() - launched)
+                        continue
+                    except Exception as e:
+                        last_error = failed = e
+                        self.stats(model, kind).record(False)
+                        metrics.inc("route_failures_total", model=model, kind=kind)
+                        metrics.log("route_failure", model=model, kind=kind, error=str(e)[:200])
+                        continue
+                    self.stats(model, kind).record(True, time.perf_counter() - launched)
+                    metrics.inc("route_wins_total", model=model, kind=kind)
+                    return model, result
+
+                # A failed attempt falls back to the next model without waiting for a hedge delay
+                if failed is not None and queue:
+                    metrics.inc("fallbacks_total", model=newest, kind=kind)
+                    newest = launch()
+                    next_hedge = time.perf_counter() + self.hedge_delay(newest, kind)
+        finally:
+            now = time.perf_counter()
+            for model, token, launched in pending.values():
+                self.stats(model, kind).record_lower_bound(now - launched)
+                token.cancel()
+
+        raise last_error or Exception("All models failed")
+
+    def summary(self) -> dict:
+        """Rolling p50/p90 latency and error rate per model"""
+        summary = {}
+        with self._stats_lock:
+            items = list(self._stats.items())
+        for (model, kind), stats in items:
+            p50, p90 = stats.percentile(0.5), stats.percentile(0.9)
+            summary.setdefault(model, {})[kind] = {
+                "samples": stats.samples,
+                "error_rate": round(stats.error_rate, 4),
+                "p50": round(p50, 3) if p50 is not None else None,
+                "p90": round(p90, 3) if p90 is not None else None,
+            }
+        return summary
+
+
+_routers: dict = {}
+_routers_lock = threading.Lock()
+
+
+def get_model_router(model: str) -> Optional[ModelRouter]:
+    """Return the process-wide router for model and OPENROUTER_FALLBACK_MODELS, or None without fallbacks"""
+    fallbacks = [name.strip() for name in os.getenv("OPENROUTER_FALLBACK_MODELS", "").split(",") if name.strip()]
+    models = tuple(dict.fromkeys([model] + fallbacks))
+    if len(models) < 2:
+        return None
+
+    with _routers_lock:
+        router = _routers.get(models)
+        if router is None:
+            deadline = float(os.getenv("OPENROUTER_ROUTE_DEADLINE", "0"))
+            router = _routers[models] = ModelRouter(
+                list(models),
+                hedge_percentile=float(os.getenv("OPENROUTER_HEDGE_PERCENTILE", "0.9")),
+                deadline=deadline or None,
+            )
+        return router
+
+
+def router_summaries() -> dict:
+    """Summaries of every router created in this process, keyed by primary model"""
+    with _routers_lock:
+        routers = list(_routers.values())
+    return {router.models[0]: router.summary() for router in routers}
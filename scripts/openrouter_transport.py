@@ -0,0 +1,159 @@
+"""
+OpenRouter HTTP Transport
+Shared keep-alive connection pool with retry/backoff for OpenRouter API calls
+"""
+
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+# OPENROUTER_BASE_URL points every client at another endpoint, e.g. the benchmark mock server
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1").rstrip("/")
+OPENROUTER_API_URL = f"{OPENROUTER_BASE_URL}/chat/completions"
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def auth_headers(api_key: str) -> dict:
+    """Request headers of an OpenRouter chat completion"""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+
+
+class OpenRouterTransport:
+    """Pooled requests.Session shared by all OpenRouter clients in a process"""
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        keep_alive: bool = True,
+        timeout: float = 60,
+    ):
+        """
+        Initialize the transport
+
+        Args:
+            pool_size: Maximum number of pooled connections per host
+            max_retries: Retries for connection errors and 429/5xx responses
+            backoff_factor: Exponential backoff base in seconds between retries
+            keep_alive: Reuse connections across requests
+            timeout: Default request timeout in seconds
+        """
+        # requests/urllib3 load here rather than at import: a one-shot process
+        # answered from a cache never pays for them
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["POST"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def post(
+        self,
+        url: str,
+        api_key: str,
+        payload: dict,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> "requests.Response":
+        """POST a chat completion payload through the pooled session"""
+        return self.session.post(
+            url,
+            headers=auth_headers(api_key),
+            json=payload,
+            timeout=timeout or self.timeout,
+            stream=stream,
+        )
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+
+def iter_stream_content(
+    response: "requests.Response",
+    on_usage: Optional[Callable[[dict], None]] = None,
+    on_finish: Optional[Callable[[str], None]] = None,
+) -> Iterator[str]:
+    """
+    Yield content deltas from an OpenRouter server-sent-events completion stream
+
+    on_usage is called with the usage block of the final chunk, when the
+    request asked for it with "usage": {"include": true}, and on_finish with
+    the finish_reason ("stop", "length", ...) of the chunk that carries one.
+    """
+    # text/event-stream has no charset, which requests would decode as latin-1
+    response.encoding = "utf-8"
+    for line in response.iter_lines(decode_unicode=True):
+        # Skip blank event separators and ": OPENROUTER PROCESSING" keep-alive comments
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            break
+
+        event = json.loads(data)
+        if "error" in event:
+            raise Exception(f"OpenRouter stream error: {event['error']}")
+        if on_usage is not None and event.get("usage"):
+            on_usage(event["usage"])
+        choice = (event.get("choices") or [{}])[0]
+        if on_finish is not None and choice.get("finish_reason"):
+            on_finish(choice["finish_reason"])
+        delta = choice.get("delta", {}).get("content")
+        if delta:
+            yield delta
+
+
+_default_transport: Optional[OpenRouterTransport] = None
+_default_lock = threading.Lock()
+
+
+def retry_count(response: "requests.Response") -> int:
+    """Number of retries urllib3 performed before this response"""
+    retries = getattr(response.raw, "retries", None)
+    return len(retries.history) if retries is not None else 0
+
+
+def transport_error() -> type:
+    """Base class of the errors the transport raises (loads requests on first call)"""
+    from requests.exceptions import RequestException
+
+    return RequestException
+
+
+def get_transport() -> OpenRouterTransport:
+    """Return the process-wide transport, configured from environment variables"""
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = OpenRouterTransport(
+                pool_size=int(os.getenv("OPENROUTER_POOL_SIZE", "10")),
+                max_retries=int(os.getenv("OPENROUTER_MAX_RETRIES", "3")),
+                backoff_factor=float(os.getenv("OPENROUTER_RETRY_BACKOFF", "0.5")),
+                keep_alive=os.getenv("OPENROUTER_KEEP_ALIVE", "1") != "0",
+                timeout=float(os.getenv("OPENROUTER_TIMEOUT", "60")),
+            )
+        return _default_transport
@@ -0,0 +1,30 @@
+"""
+Query Files
+One query per line, shared by the batch runner, the job queue and the
+service and generator CLIs
+"""
+
+import sys
+from typing import Iterator
+
+
+def iter_queries(path: str) -> Iterator[str]:
+    """
+    Yield the queries of a file as they are read ('-' reads stdin)
+
+    Blank lines and lines starting with # are skipped. Reading is lazy, so a
+    process fed on stdin answers each query as soon as its line arrives.
+    """
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in stream:
+            if line.strip() and not line.startswith("#"):
+                yield line.strip()
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def read_queries(path: str) -> list:
+    """Read every query of a file ('-' reads stdin)"""
+    return list(iter_queries(path))
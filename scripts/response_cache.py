@@ -0,0 +1,184 @@
+"""
+LLM Response Cache
+Content-addressed cache for OpenRouter completions with an in-memory LRU tier
+and an on-disk SQLite tier
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "literature_review", "responses.sqlite3")
+
+
+def make_cache_key(payload: dict) -> str:
+    """
+    Hash the normalized (model, messages, temperature) payload
+
+    max_tokens is left out: the token budget adapts it between requests, and
+    only completions that parsed and were not cut off at max_tokens are
+    cached, so one is reusable whatever ceiling a later request plans.
+    """
+    normalized = {
+        "model": payload.get("model"),
+        "messages": [
+            {"role": m.get("role"), "content": (m.get("content") or "").strip()}
+            for m in payload.get("messages", [])
+        ],
+        "temperature": round(float(payload.get("temperature", 1.0)), 4),
+    }
+    encoded = json.dumps(normalized, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + SQLite) cache of completion content keyed by payload hash"""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 7 * 24 * 3600,
+        disk_path: Optional[str] = None,
+        max_disk_entries: int = 10000,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Capacity of the in-memory LRU tier
+            ttl: Seconds before an entry expires (0 disables expiry)
+            disk_path: SQLite file for the persistent tier (None keeps memory only)
+            max_disk_entries: Capacity of the disk tier, oldest-accessed evicted first
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self.stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "evictions": 0}
+
+        self._memory: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if disk_path:
+            os.makedirs(os.path.dirname(os.path.abspath(disk_path)), exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, content TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+            self._db.commit()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return bool(self.ttl) and now - created > self.ttl
+
+    def get(self, payload: dict) -> Optional[str]:
+        """Return cached content for this payload, or None on a miss"""
+        key = make_cache_key(payload)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, content = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self.stats["hits"] += 1
+                    self.stats["memory_hits"] += 1
+                    return content
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT content, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    content, created = row
+                    if not self._expired(created, now):
+                        self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        self._remember(key, created, content)
+                        self.stats["hits"] += 1
+                        self.stats["disk_hits"] += 1
+                        return content
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, payload: dict, content: str):
+        """Store completion content for this payload in both tiers"""
+        key = make_cache_key(payload)
+        now = time.time()
+
+        with self._lock:
+            self._remember(key, now, content)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, content, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, content, now, now),
+                )
+                self._evict_disk(now)
+                self._db.commit()
+
+    def _remember(self, key: str, created: float, content: str):
+        self._memory[key] = (created, content)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _evict_disk(self, now: float):
+        if self.ttl:
+            cursor = self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            self.stats["evictions"] += max(cursor.rowcount, 0)
+
+        (count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                (overflow,),
+            )
+            self.stats["evictions"] += overflow
+
+    def clear(self):
+        """Drop every cached entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from cache"""
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide cache configured from environment, or None when disabled"""
+    global _default_cache
+    if os.getenv("LITREVIEW_CACHE", "1") == "0":
+        return None
+
+    with _default_lock:
+        if _default_cache is None:
+            disk_path = os.getenv("LITREVIEW_CACHE_PATH", DEFAULT_CACHE_PATH)
+            _default_cache = ResponseCache(
+                max_entries=int(os.getenv("LITREVIEW_CACHE_MAX_ENTRIES", "256")),
+                ttl=float(os.getenv("LITREVIEW_CACHE_TTL", str(7 * 24 * 3600))),
+                disk_path=disk_path or None,
+                max_disk_entries=int(os.getenv("LITREVIEW_CACHE_MAX_DISK_ENTRIES", "10000")),
+            )
+        return _default_cache
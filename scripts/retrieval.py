@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""
+Literature Retrieval
+Real article records for the retrieval strategy: pluggable source adapters
+(arXiv API, Semantic Scholar API, local index) queried in parallel, and a
+local BM25 inverted index built from bulk metadata dumps such as the arXiv
+OAI snapshot
+
+The index stores impact-ordered postings: each term's documents are ranked
+by their precomputed BM25 contribution and only the top POSTINGS_DEPTH are
+kept, so a query reads a few short postings blobs and scores a few thousand
+candidates no matter how large the collection is.
+
+Usage:
+    python scripts/retrieval.py index arxiv-metadata-oai-snapshot.json.gz
+    python scripts/retrieval.py search "graph neural networks drug discovery" -k 10
+    python scripts/retrieval.py search "federated learning" --sources arxiv,semantic-scholar
+"""
+
+import argparse
+import gzip
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+import requests
+
+from review_metrics import metrics, propagate_context
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".local", "share", "literature_review", "index.sqlite3")
+SAMPLE_DUMP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "arxiv_sample.jsonl")
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+SEMANTIC_SCHOLAR_API_URL = "https://api.semanticscholar.org/graph/v1"
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Title terms count this many times towards term frequency
+TITLE_WEIGHT = 2
+# Highest-impact documents kept per term
+POSTINGS_DEPTH = 2000
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being between both but by can could did do does
+during each either for from further had has have how however i if in into is it its itself may more most
+no nor not of on only or other our over same should so some such than that the their them then there these
+they this those through to too under until up upon using very via was we were what when where which while
+who whom why will with within without would you your based towards paper propose proposed show shows
+""".split())
+
+
+def tokenize(text: str) -> list:
+    """Lowercase words without stopwords, with plural suffixes stripped"""
+    tokens = []
+    for word in _TOKEN.findall(text.lower()):
+        if len(word) < 2 or word in _STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def _clean(text) -> str:
+    return " ".join(str(text or "").split())
+
+
+@dataclass
+class Record:
+    """One real bibliographic record"""
+    id: str
+    title: str
+    authors: list = field(default_factory=list)
+    year: Optional[int] = None
+    venue: str = ""
+    doi: Optional[str] = None
+    abstract: str = ""
+    categories: list = field(default_factory=list)
+    source: str = ""
+    url: str = ""
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+
+def _split_authors(authors: str) -> list:
+    return [name.strip() for name in re.split(r",|\band\b", _clean(authors)) if name.strip()]
+
+
+def _arxiv_year(arxiv_id: str) -> Optional[int]:
+    """Year from a new-style (YYMM.NNNNN) or old-style (archive/YYMMNNN) arXiv id"""
+    match = re.match(r"(\d{2})(\d{2})\.\d{4,5}", arxiv_id) or re.match(r"[a-z\-\.]+/(\d{2})(\d{2})\d{3}", arxiv_id, re.I)
+    if not match:
+        return None
+    year = int(match.group(1))
+    return 1900 + year if year >= 91 else 2000 + year
+
+
+def record_from_arxiv(data: dict) -> Record:
+    """Convert one arXiv OAI snapshot line into a Record"""
+    arxiv_id = data["id"]
+    year = _arxiv_year(arxiv_id)
+    if year is None and data.get("update_date"):
+        year = int(data["update_date"][:4])
+    return Record(
+        id=f"arxiv:{arxiv_id}",
+        title=_clean(data.get("title")),
+        authors=_split_authors(data.get("authors", "")),
+        year=year,
+        venue=_clean(data.get("journal-ref")) or "arXiv",
+        doi=data.get("doi") or None,
+        abstract=_clean(data.get("abstract")),
+        categories=(data.get("categories") or "").split(),
+        source="arXiv",
+        url=f"https://arxiv.org/abs/{arxiv_id}",
+    )
+
+
+def load_records(path: str) -> Iterator[Record]:
+    """
+    Stream Records from an NDJSON dump (optionally .gz)
+
+    Lines in the arXiv OAI snapshot format are converted; other lines must
+    carry Record fields.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            if "categories" in data and isinstance(data.get("categories"), str):
+                yield record_from_arxiv(data)
+            else:
+                yield Record(**{name: value for name, value in data.items() if name in Record.__dataclass_fields__})
+
+
+class BM25Index:
+    """Read side of an on-disk BM25 index with impact-ordered postings"""
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, depth: int = POSTINGS_DEPTH):
+        """
+        Args:
+            path: Index file written by BM25Index.build
+            depth: Postings read per query term (at most the depth it was built with)
+        """
+        self.path = path
+        self.depth = depth
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.size = self._db.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    @staticmethod
+    def build(path: str, records: Iterable[Record], depth: int = POSTINGS_DEPTH, batch_size: int = 5000) -> int:
+        """
+        Build an index from records, replacing any index at path
+
+        Returns:
+            The number of indexed records
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            if os.path.exists(path):
+                os.remove(path)
+        db = sqlite3.connect(path)
+        db.executescript("""
+            PRAGMA journal_mode=OFF;
+            PRAGMA synchronous=OFF;
+            CREATE TABLE records (id INTEGER PRIMARY KEY, data TEXT NOT NULL);
+            CREATE TABLE postings (term TEXT PRIMARY KEY, df INTEGER NOT NULL, docs BLOB NOT NULL, impacts BLOB NOT NULL)
+                WITHOUT ROWID;
+        """)
+
+        # term -> (doc ids, term frequencies), appended in doc id order
+        postings: dict = {}
+        lengths = array("I")
+        batch = []
+        for doc_id, record in enumerate(records):
+            counts = Counter(tokenize(record.abstract))
+            for term in tokenize(record.title):
+                counts[term] += TITLE_WEIGHT
+            lengths.append(sum(counts.values()))
+            for term, count in counts.items():
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = (array("I"), array("I"))
+                entry[0].append(doc_id)
+                entry[1].append(count)
+
+            batch.append((doc_id, json.dumps(record.to_dict(), ensure_ascii=False)))
+            if len(batch) >= batch_size:
+                db.executemany("INSERT INTO records VALUES (?, ?)", batch)
+                batch.clear()
+        db.executemany("INSERT INTO records VALUES (?, ?)", batch)
+
+        total = len(lengths)
+        average = sum(lengths) / total if total else 1.0
+        # Per-document length normalization, shared by every term
+        norms = array("f", (K1 * (1 - B + B * length / average) for length in lengths))
+
+        rows = []
+        for term, (docs, frequencies) in postings.items():
+            df = len(docs)
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            impacts = [idf * tf * (K1 + 1) / (tf + norms[doc]) for doc, tf in zip(docs, frequencies)]
+            order = heapq.nlargest(depth, range(df), key=impacts.__getitem__) if df > depth else \
+                sorted(range(df), key=impacts.__getitem__, reverse=True)
+            rows.append((
+                term, df,
+                array("I", (docs[i] for i in order)).tobytes(),
+                array("f", (impacts[i] for i in order)).tobytes(),
+            ))
+            if len(rows) >= batch_size:
+                db.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)", rows)
+                rows.clear()
+        db.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)", rows)
+        db.commit()
+        db.close()
+        return total
+
+    def search_ids(self, query: str, limit: int = 10) -> list:
+        """Return (score, doc id) pairs of the top documents for a query"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        width = self.depth * 4
+        scores: dict = {}
+        with self._lock:
+            rows = [
+                self._db.execute(
+                    "SELECT substr(docs, 1, ?), substr(impacts, 1, ?) FROM postings WHERE term = ?", (width, width, term)
+                ).fetchone()
+                for term in terms
+            ]
+        for row in rows:
+            if row is None:
+                continue
+            docs, impacts = array("I"), array("f")
+            docs.frombytes(row[0])
+            impacts.frombytes(row[1])
+            get = scores.get
+            for doc, impact in zip(docs, impacts):
+                scores[doc] = get(doc, 0.0) + impact
+        return heapq.nlargest(limit, ((score, doc) for doc, score in scores.items()))
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """Return the top Records for a query, best first"""
+        ranked = self.search_ids(query, limit)
+        if not ranked:
+            return []
+        ids = [doc for _, doc in ranked]
+        with self._lock:
+            rows = dict(self._db.execute(
+                f"SELECT id, data FROM records WHERE id IN ({','.join('?' * len(ids))})", ids
+            ).fetchall())
+        return [Record(**json.loads(rows[doc])) for doc in ids if doc in rows]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class LocalIndexSource:
+    """Source adapter over a local BM25Index"""
+
+    name = "local"
+
+    def __init__(self, index: BM25Index):
+        self.index = index
+
+    def search(self, query: str, limit: int) -> list:
+        return self.index.search(query, limit)
+
+
+class ArxivSource:
+    """Source adapter for the arXiv Atom query API"""
+
+    name = "arxiv"
+    _NS = {"a": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+
+    def __init__(self, base_url: Optional[str] = None, timeout: float = 10):
+        self.base_url = base_url or os.getenv("ARXIV_API_URL", ARXIV_API_URL)
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def search(self, query: str, limit: int) -> list:
+        terms = tokenize(query)
+        response = self.session.get(
+            self.base_url,
+            params={
+                "search_query": " AND ".join(f"all:{term}" for term in terms) or f"all:{query}",
+                "start": 0,
+                "max_results": limit,
+                "sortBy": "relevance",
+            },
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return self.parse(response.text)
+
+    @classmethod
+    def parse(cls, feed: str) -> list:
+        """Parse an Atom feed into Records"""
+        ns = cls._NS
+        records = []
+        for entry in ET.fromstring(feed).findall("a:entry", ns):
+            url = _clean(entry.findtext("a:id", "", ns))
+            arxiv_id = re.sub(r"v\d+$", "", url.rsplit("/abs/", 1)[-1])
+            published = entry.findtext("a:published", "", ns)
+            records.append(Record(
+                id=f"arxiv:{arxiv_id}",
+                title=_clean(entry.findtext("a:title", "", ns)),
+                authors=[_clean(author.findtext("a:name", "", ns)) for author in entry.findall("a:author", ns)],
+                year=int(published[:4]) if published[:4].isdigit() else _arxiv_year(arxiv_id),
+                venue=_clean(entry.findtext("arxiv:journal_ref", "", ns)) or "arXiv",
+                doi=_clean(entry.findtext("arxiv:doi", "", ns)) or None,
+                abstract=_clean(entry.findtext("a:summary", "", ns)),
+                categories=[category.get("term") for category in entry.findall("a:category", ns)],
+                source="arXiv",
+                url=url,
+            ))
+        return records
+
+
+class SemanticScholarSource:
+    """Source adapter for the Semantic Scholar Graph API paper search"""
+
+    name = "semantic-scholar"
+    FIELDS = "title,authors,year,venue,externalIds,abstract,url"
+
+    def __init__(self, base_url: Optional[str] = None, timeout: float = 10):
+        self.base_url = (base_url or os.getenv("SEMANTIC_SCHOLAR_API_URL", SEMANTIC_SCHOLAR_API_URL)).rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        api_key = os.getenv("SEMANTIC_SCHOLAR_API_KEY")
+        if api_key:
+            self.session.headers["x-api-key"] = api_key
+
+    def search(self, query: str, limit: int) -> list:
+        response = self.session.get(
+            f"{self.base_url}/paper/search",
+            params={"query": query, "limit": limit, "fields": self.FIELDS},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return [self.parse(paper) for paper in response.json().get("data", [])]
+
+    @staticmethod
+    def parse(paper: dict) -> Record:
+        external = paper.get("externalIds") or {}
+        return Record(
+            id=f"arxiv:{external['ArXiv']}" if external.get("ArXiv") else f"s2:{paper.get('paperId')}",
+            title=_clean(paper.get("title")),
+            authors=[author.get("name", "") for author in paper.get("authors") or []],
+            year=paper.get("year"),
+            venue=paper.get("venue") or "Unknown",
+            doi=external.get("DOI"),
+            abstract=_clean(paper.get("abstract")),
+            source="Semantic Scholar",
+            url=paper.get("url") or "",
+        )
+
+
+def _record_keys(record: Record) -> set:
+    keys = {"id:" + record.id, "title:" + " ".join(tokenize(record.title))}
+    if record.doi:
+        keys.add("doi:" + record.doi.lower())
+    return keys
+
+
+class Retriever:
+    """Queries several sources in parallel and merges their ranked results"""
+
+    def __init__(self, sources: list, timeout: float = 10):
+        """
+        Args:
+            sources: Source adapters with a name and search(query, limit)
+            timeout: Seconds to wait for the slowest source; late or failing
+                sources are left out of the result
+        """
+        self.sources = sources
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max(1, 4 * len(sources)), thread_name_prefix="retrieval")
+
+    def _search_source(self, source, query: str, limit: int) -> list:
+        with metrics.stage("retrieve", source=source.name):
+            return source.search(query, limit)
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """
+        Return up to limit unique Records, interleaving the sources' rankings
+
+        Duplicates across sources (same id, DOI or normalized title) keep
+        their first occurrence.
+        """
+        futures = {self._executor.submit(propagate_context(self._search_source), source, query, limit): source for source in self.sources}
+        done, _ = wait(futures, timeout=self.timeout)
+        rankings = []
+        for future, source in futures.items():
+            if future not in done:
+                metrics.inc("retrieval_errors_total", source=source.name, kind="timeout")
+                continue
+            try:
+                rankings.append(future.result())
+            except Exception as e:
+                metrics.inc("retrieval_errors_total", source=source.name, kind="error")
+                metrics.log("retrieval_error", source=source.name, error=str(e)[:200])
+
+        seen = set()
+        merged = []
+        for rank in range(max((len(ranking) for ranking in rankings), default=0)):
+            for ranking in rankings:
+                if rank >= len(ranking):
+                    continue
+                record = ranking[rank]
+                keys = _record_keys(record)
+                if keys & seen:
+                    continue
+                seen |= keys
+                merged.append(record)
+        return merged[:limit]
+
+
+SOURCES = {"local": LocalIndexSource, "arxiv": ArxivSource, "semantic-scholar": SemanticScholarSource}
+
+metrics.describe("retrieval_errors_total", "Retrieval source timeouts and errors")
+
+_default_retriever: Optional[Retriever] = None
+_default_lock = threading.Lock()
+
+
+def make_retriever(names: list, index_path: str = DEFAULT_INDEX_PATH, timeout: float = 10) -> Retriever:
+    """Build a Retriever from source names ("local" needs an index at index_path)"""
+    sources = []
+    for name in names:
+        if name not in SOURCES:
+            raise ValueError(f"Unknown retrieval source: {name} (choose from {', '.join(SOURCES)})")
+        if name == "local":
+            if not os.path.exists(index_path):
+                raise FileNotFoundError(f"No retrieval index at {index_path}; build one with: retrieval.py index DUMP")
+            sources.append(LocalIndexSource(BM25Index(index_path)))
+        else:
+            sources.append(SOURCES[name](timeout=timeout))
+    return Retriever(sources, timeout=timeout)
+
+
+def get_retriever() -> Retriever:
+    """
+    Return the process-wide retriever configured from environment
+
+    LITREVIEW_RETRIEVAL_SOURCES is a comma-separated list of sources; by
+    default the local index is used when it exists, the public APIs otherwise.
+    """
+    global _default_retriever
+    with _default_lock:
+        if _default_retriever is None:
+            index_path = os.getenv("LITREVIEW_INDEX_PATH", DEFAULT_INDEX_PATH)
+            configured = os.getenv("LITREVIEW_RETRIEVAL_SOURCES")
+            if configured:
+                names = [name.strip() for name in configured.split(",") if name.strip()]
+            else:
+                names = ["local"] if os.path.exists(index_path) else ["arxiv", "semantic-scholar"]
+            _default_retriever = make_retriever(
+                names, index_path, float(os.getenv("LITREVIEW_RETRIEVAL_TIMEOUT", "10"))
+            )
+        return _default_retriever
+
+
+def main():
+    """Build or query the retrieval index from the command line"""
+    parser = argparse.ArgumentParser(description="Literature retrieval index and source search")
+    parser.add_argument("--index", default=os.getenv("LITREVIEW_INDEX_PATH", DEFAULT_INDEX_PATH))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("index", help="build the local index from an NDJSON metadata dump")
+    build.add_argument("dump", nargs="?", default=SAMPLE_DUMP_PATH, help="dump file (default: bundled sample)")
+    build.add_argument("--depth", type=int, default=POSTINGS_DEPTH, help="postings kept per term")
+
+    search = commands.add_parser("search", help="search the configured sources")
+    search.add_argument("query")
+    search.add_argument("-k", "--limit", type=int, default=10)
+    search.add_argument("--sources", default="local", help=f"comma-separated subset of {', '.join(SOURCES)}")
+    search.add_argument("--json", action="store_true", help="print records as JSON")
+
+    args = parser.parse_args()
+    if args.command == "index":
+        started = time.perf_counter()
+        count = BM25Index.build(args.index, load_records(args.dump), depth=args.depth)
+        print(f"Indexed {count} records into {args.index} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        return
+
+    retriever = make_retriever(args.sources.split(","), args.index)
+    started = time.perf_counter()
+    records = retriever.search(args.query, args.limit)
+    elapsed = time.perf_counter() - started
+    if args.json:
+        print(json.dumps([record.to_dict() for record in records], indent=2))
+    else:
+        for record in records:
+            print(f"[{record.id}] {record.title} ({record.year}) — {record.venue} [{record.source}]")
+    print(f"{len(records)} record(s) in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1075 @@
+"""
+Literature Review Core
+One article/synthesis schema, one validated parser and one OpenRouter request
+engine shared by the CLI generator, the backend service and the batch runner,
+with pluggable single-shot, two-phase and retrieval-grounded strategies
+"""
+
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+
+from json_extract import extract_json
+from model_router import CancelToken, ModelRouter, RequestCancelled, get_model_router
+from openrouter_transport import (
+    OPENROUTER_API_URL,
+    OpenRouterTransport,
+    get_transport,
+    iter_stream_content,
+    retry_count,
+    transport_error,
+)
+from response_cache import ResponseCache, get_response_cache
+from review_metrics import metrics, propagate_context
+from token_budget import SYNTHESIS_CONTEXT_TOKENS, TokenBudget, compact_schema, pack_articles
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_MODEL = "x-ai/grok-4.1-fast:free"
+
+# Largest article count requested in one completion before fanning out
+ARTICLES_PER_REQUEST = 5
+MAX_FAN_OUT = 10
+# Publication window split across fan-out sub-requests
+FAN_OUT_YEAR_SPAN = 10
+
+# Article count above which the synthesis is map-reduced over keyword clusters
+MAP_REDUCE_THRESHOLD = 40
+# Articles per partial (map) synthesis and partial syntheses per reduce request
+SYNTHESIS_BATCH = 25
+SYNTHESIS_FAN_IN = 8
+# Reduce rounds allowed after the map round; the fan-in grows to stay within it
+MAX_REDUCE_DEPTH = 3
+
+# New articles requested when refreshing a stored review
+REFRESH_ARTICLES = 3
+# Existing titles listed in a refresh prompt so the model skips them
+REFRESH_LISTED_TITLES = 30
+# Share of a refreshed review's articles that must be new before its synthesis is regenerated
+RESYNTHESIS_THRESHOLD = 0.2
+
+# Canonical (snake_case) schema; the Next.js frontend receives camelCase via to_camel()
+ARTICLE_FIELDS = (
+    "title", "authors", "publication_year", "venue", "doi", "abstract", "keywords",
+    "research_goal", "methodology", "main_results", "key_contributions", "limitations",
+    "confidence", "source",
+)
+SYNTHESIS_FIELDS = ("field_overview", "gaps_and_challenges", "future_directions", "practical_implications")
+
+_ARTICLE_DEFAULTS = {
+    "title": "Unknown",
+    "authors": [],
+    "publication_year": None,
+    "venue": "Unknown",
+    "doi": None,
+    "abstract": "",
+    "keywords": [],
+    "research_goal": "",
+    "methodology": "",
+    "main_results": "",
+    "key_contributions": "",
+    "limitations": "",
+    "confidence": "medium",
+    "source": "Unknown",
+}
+_LIST_FIELDS = ("authors", "keywords")
+
+
+def _camel(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.capitalize() for part in rest)
+
+
+CAMEL_NAMES = {name: _camel(name) for name in ARTICLE_FIELDS + SYNTHESIS_FIELDS}
+_SNAKE_NAMES = {camel: snake for snake, camel in CAMEL_NAMES.items() if camel != snake}
+
+
+@dataclass
+class Article:
+    """Structured article data"""
+    # Slotted: bulk runs hold many thousands of these
+    __slots__ = ARTICLE_FIELDS
+
+    title: str
+    authors: list
+    publication_year: Optional[int]
+    venue: str
+    doi: Optional[str]
+    abstract: str
+    keywords: list
+    research_goal: str
+    methodology: str
+    main_results: str
+    key_contributions: str
+    limitations: str
+    confidence: str
+    source: str
+
+
+@dataclass
+class LiteratureReview:
+    """Complete literature review structure"""
+    query: str
+    articles: list
+    synthesis: dict
+    generated_at: str
+    # Set when the review was reused from an earlier query instead of generated
+    provenance: Optional[dict] = None
+
+
+def article_to_dict(article: Article) -> dict:
+    """Shallow dict of an Article (asdict deep-copies every list and is far slower)"""
+    return {name: getattr(article, name) for name in ARTICLE_FIELDS}
+
+
+def build_review(query: str, articles: list, synthesis: dict) -> LiteratureReview:
+    """Assemble a LiteratureReview from Article objects and a synthesis dict"""
+    return LiteratureReview(
+        query=query,
+        articles=[article_to_dict(article) for article in articles],
+        synthesis=synthesis,
+        generated_at=datetime.now().isoformat(),
+    )
+
+
+def to_camel(data: dict) -> dict:
+    """Rename snake_case keys (article, synthesis or provenance fields) to the frontend's camelCase"""
+    return {CAMEL_NAMES.get(key) or _camel(key): value for key, value in data.items()}
+
+
+def review_events(review: LiteratureReview, **done) -> Iterator[dict]:
+    """Stream events for a finished review, with extra fields for the "done" event"""
+    for index, article in enumerate(review.articles):
+        yield {"type": "article", "index": index, "article": to_camel(article)}
+    yield {"type": "synthesis", "synthesis": to_camel(review.synthesis)}
+    yield {"type": "done", "articleCount": len(review.articles), **done}
+
+
+def review_to_dict(review: LiteratureReview) -> dict:
+    """Convert a review into the JSON shape expected by the Next.js route"""
+    data = {
+        "articles": [to_camel(article) for article in review.articles],
+        "synthesis": to_camel(review.synthesis),
+    }
+    if review.provenance is not None:
+        data["provenance"] = to_camel(review.provenance)
+    return data
+
+
+def normalize_article(raw: dict) -> Article:
+    """
+    Validate one raw article object into an Article
+
+    Accepts snake_case or camelCase keys, drops unknown keys, fills defaults
+    for missing fields and coerces the year, the list fields and their
+    elements, and every other field to a string.
+    """
+    values = dict(_ARTICLE_DEFAULTS)
+    for key, value in raw.items():
+        name = _SNAKE_NAMES.get(key, key)
+        if name in values and value is not None:
+            values[name] = value
+
+    year = values["publication_year"]
+    if year is not None and not isinstance(year, int):
+        try:
+            values["publication_year"] = int(str(year).strip()[:4])
+        except ValueError:
+            values["publication_year"] = None
+    for name in _LIST_FIELDS:
+        if isinstance(values[name], str):
+            values[name] = [part.strip() for part in values[name].split(",") if part.strip()]
+        elif isinstance(values[name], list):
+            values[name] = [str(item) for item in values[name] if item is not None]
+        else:
+            values[name] = []
+    if values["doi"] is not None:
+        values["doi"] = str(values["doi"]).strip() or None
+    for name, default in _ARTICLE_DEFAULTS.items():
+        if isinstance(default, str) and not isinstance(values[name], str):
+            values[name] = str(values[name])
+
+    return Article(**values)
+
+
+def normalize_synthesis(raw: dict) -> dict:
+    """Validate a raw synthesis object into the canonical synthesis dict"""
+    values = {name: "" for name in SYNTHESIS_FIELDS}
+    for key, value in raw.items():
+        name = _SNAKE_NAMES.get(key, key)
+        if name in values and isinstance(value, str):
+            values[name] = value
+    return values
+
+
+def parse_articles(text: str) -> list:
+    """
+    Parse an articles completion (a JSON array, or an object with "articles")
+
+    Raises:
+        json.JSONDecodeError: No JSON value could be recovered
+    """
+    with metrics.stage("parse"):
+        data = extract_json(text, expect=(list, dict))
+    # Tolerate the model wrapping the array as {"articles": [...]}
+    if isinstance(data, dict):
+        data = data.get("articles") or []
+    if not isinstance(data, list):
+        data = []
+    with metrics.stage("validate"):
+        return [normalize_article(article) for article in data if isinstance(article, dict)]
+
+
+def parse_synthesis(text: str) -> dict:
+    """
+    Parse a synthesis completion, also accepting {"synthesis": {...}}
+
+    Raises:
+        json.JSONDecodeError: No JSON value could be recovered
+    """
+    with metrics.stage("parse"):
+        data = extract_json(text, expect=dict)
+    if isinstance(data.get("synthesis"), dict):
+        data = data["synthesis"]
+    with metrics.stage("validate"):
+        return normalize_synthesis(data)
+
+
+def parse_review(text: str) -> tuple:
+    """
+    Parse a single-shot completion into (articles, synthesis)
+
+    Raises:
+        json.JSONDecodeError: No JSON object could be recovered
+    """
+    with metrics.stage("parse"):
+        data = extract_json(text, expect=dict)
+    with metrics.stage("validate"):
+        articles = data.get("articles") or []
+        if not isinstance(articles, list):
+            articles = []
+        articles = [normalize_article(a) for a in articles if isinstance(a, dict)]
+        synthesis = data.get("synthesis")
+        return articles, normalize_synthesis(synthesis if isinstance(synthesis, dict) else {})
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase a title and collapse punctuation and whitespace"""
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", title.lower()).split())
+
+
+def article_fingerprint(article: dict) -> str:
+    """Identity of an article across reviews: DOI when present, else normalized title"""
+    doi = (article.get("doi") or "").strip().lower()
+    if doi:
+        return "doi:" + doi
+    return "title:" + normalize_title(article.get("title") or "")
+
+
+def merge_articles(chunks: list, limit: Optional[int] = None) -> list:
+    """Merge article lists in order, dropping duplicates by DOI or normalized title"""
+    seen = set()
+    merged = []
+    for chunk in chunks:
+        for article in chunk:
+            keys = {"title:" + normalize_title(article.title)}
+            if article.doi:
+                keys.add("doi:" + article.doi.lower())
+            if keys & seen:
+                continue
+            seen |= keys
+            merged.append(article)
+    return merged[:limit] if limit is not None else merged
+
+
+def cluster_articles(articles: list, batch_size: int = SYNTHESIS_BATCH) -> list:
+    """
+    Split articles into keyword-coherent batches of at most batch_size
+
+    Each article is keyed by its keyword that is most common across the whole
+    set; articles are ordered by that key and cut into even batches, so
+    articles sharing a theme land in the same or adjacent batches.
+
+    Returns:
+        (theme, articles) pairs; theme is the batch's most common key, or None
+    """
+    def keywords(article) -> list:
+        return [str(keyword).strip().lower() for keyword in getattr(article, "keywords", None) or [] if keyword]
+
+    counts = Counter(keyword for article in articles for keyword in set(keywords(article)))
+    keyed = [
+        (max(keywords(article), key=lambda keyword: (counts[keyword], keyword), default=""), article)
+        for article in articles
+    ]
+    keyed.sort(key=lambda pair: (-counts[pair[0]], pair[0]) if pair[0] else (1, ""))
+
+    batch_count = max(1, math.ceil(len(keyed) / batch_size))
+    size = math.ceil(len(keyed) / batch_count) if keyed else 1
+    batches = []
+    for start in range(0, len(keyed), size):
+        chunk = keyed[start:start + size]
+        themes = Counter(key for key, _ in chunk if key)
+        batches.append((themes.most_common(1)[0][0] if themes else None, [article for _, article in chunk]))
+    return batches
+
+
+class RequestEngine:
+    """Builds payloads and runs cached, pooled OpenRouter completions for one model"""
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = DEFAULT_MODEL,
+        transport: Optional[OpenRouterTransport] = None,
+        cache: Optional[ResponseCache] = None,
+        base_url: str = OPENROUTER_API_URL,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        budget: Optional[TokenBudget] = None,
+        router: Optional[ModelRouter] = None,
+    ):
+        """
+        Initialize the engine
+
+        Args:
+            api_key: OpenRouter API key
+            model: LLM model to use
+            transport: Shared HTTP transport (defaults to the process-wide pool)
+            cache: Response cache (defaults to the process-wide cache, None if disabled)
+            base_url: Chat completions endpoint
+            temperature: Sampling temperature
+            max_tokens: Completion token ceiling
+            budget: Planner sizing max_tokens per request (defaults to one
+                capped at max_tokens)
+            router: Hedging/fallback router across models (defaults to the
+                process-wide router for this model, None without fallbacks)
+        """
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self._transport = transport
+        self.cache = cache if cache is not None else get_response_cache()
+        self.budget = budget or TokenBudget(ceiling=max_tokens)
+        self.router = router if router is not None else get_model_router(model)
+        # Token usage reported by the API, summed over this engine's requests
+        self.usage = {"requests": 0, "cache_hits": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self._usage_lock = threading.Lock()
+
+    @property
+    def transport(self) -> OpenRouterTransport:
+        """The HTTP transport, created on the first request so cache hits never open one"""
+        if self._transport is None:
+            self._transport = get_transport()
+        return self._transport
+
+    def build_payload(self, prompt: str, system: Optional[str] = None, max_tokens: Optional[int] = None) -> dict:
+        """Build the chat completion payload for a prompt, optional system message and completion budget"""
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": min(max_tokens or self.max_tokens, self.max_tokens),
+        }
+
+    def cached(self, payload: dict) -> Optional[str]:
+        """Return the cached completion for a payload, if any"""
+        if self.cache is None:
+            return None
+        content = self.cache.get(payload)
+        if content is not None:
+            self.record_usage(cache_hit=True)
+        return content
+
+    def complete(
+        self,
+        payload: dict,
+        parse: Optional[Callable[[str], object]] = None,
+        on_usage: Optional[Callable[[dict], None]] = None,
+    ):
+        """
+        Run one completion, serving it from the cache when possible
+
+        Args:
+            payload: Chat completion payload
+            parse: Optional parser applied to the content; the completion is only
+                cached when it parses, and the parsed value is returned
+            on_usage: Called with the API's usage block of a fresh (uncached) completion
+
+        Returns:
+            The parsed value, or the raw content when no parser is given
+        """
+        content = self.cached(payload)
+        if content is not None:
+            return parse(content) if parse else content
+        if self.router is not None:
+            return self._complete_routed(payload, parse, on_usage)
+
+        # Network round trip plus model generation (the API only answers once it is done)
+        with metrics.stage("request", model=self.model):
+            try:
+                response = self.transport.post(self.base_url, self.api_key, payload)
+            except transport_error() as e:
+                metrics.record_response(self.model, 0)
+                raise Exception(f"API request failed: {str(e)}")
+            if response.status_code != 200:
+                metrics.record_response(self.model, response.status_code, retries=retry_count(response))
+                raise Exception(f"OpenRouter API error: {response.status_code} - {response.text}")
+            data = response.json()
+        return self.accept_completion(payload, data, response.status_code, retry_count(response), parse, on_usage)
+
+    def accept_completion(
+        self,
+        payload: dict,
+        data,
+        status_code: int = 200,
+        retries: int = 0,
+        parse: Optional[Callable[[str], object]] = None,
+        on_usage: Optional[Callable[[dict], None]] = None,
+    ):
+        """
+        Finish a successful (non-streamed) completion response body
+
+        Records usage and metrics, raises the usual error for a body without
+        content, and caches the content once it parses, unless it was cut off
+        at max_tokens. Shared with clients that send the request themselves,
+        such as the async batch runner.
+
+        Returns:
+            The parsed value, or the raw content when no parser is given
+        """
+        if not isinstance(data, dict):
+            data = {}
+        choice = (data.get("choices") or [{}])[0]
+        content = choice.get("message", {}).get("content") or ""
+        self.record_usage(data.get("usage"))
+        metrics.record_response(self.model, status_code, data.get("usage"), retries)
+        if not content:
+            raise Exception("No content in OpenRouter response")
+        if on_usage is not None and data.get("usage"):
+            on_usage(data["usage"])
+
+        result = parse(content) if parse else content
+        if self.cache is not None and choice.get("finish_reason") != "length":
+            self.cache.set(payload, content)
+        return result
+
+    def stream(
+        self,
+        payload: dict,
+        validate: Optional[Callable[[str], bool]] = None,
+        on_usage: Optional[Callable[[dict], None]] = None,
+    ) -> Iterator[str]:
+        """
+        Stream a completion and yield content deltas as they arrive
+
+        A cached completion is yielded as a single delta. The streamed content is
+        cached once the stream ends, if it was not cut off at max_tokens and
+        validate (when given) accepts it, and on_usage receives the usage block
+        sent with the final chunk.
+        """
+        content = self.cached(payload)
+        if content is not None:
+            yield content
+            return
+
+        usage = {}
+        finish = []
+        started = time.perf_counter()
+        if self.router is not None:
+            model, response, deltas = self._open_routed_stream(payload, usage, finish)
+        else:
+            model = self.model
+            response = self._post_stream(payload)
+            deltas = iter_stream_content(response, on_usage=usage.update, on_finish=finish.append)
+
+        chunks = []
+        try:
+            for delta in deltas:
+                if not chunks:
+                    metrics.record_stage("first_token", time.perf_counter() - started, model=model)
+                chunks.append(delta)
+                yield delta
+        except transport_error() as e:
+            raise Exception(f"API request failed: {str(e)}")
+        finally:
+            response.close()
+            metrics.record_stage("stream", time.perf_counter() - started, model=model)
+        self.record_usage(usage)
+        metrics.record_response(model, response.status_code, usage, retry_count(response))
+        if on_usage is not None and usage:
+            on_usage(usage)
+
+        content = "".join(chunks)
+        if (self.cache is not None and content and "length" not in finish
+                and (validate is None or validate(content))):
+            self.cache.set(payload, content)
+
+    def _post_stream(self, payload: dict) -> "requests.Response":
+        """Open a streamed completion for payload's model, raising on transport or HTTP errors"""
+        model = payload["model"]
+        try:
+            response = self.transport.post(
+                self.base_url, self.api_key, {**payload, "stream": True, "usage": {"include": True}}, stream=True
+            )
+        except transport_error() as e:
+            metrics.record_response(model, 0)
+            raise Exception(f"API request failed: {str(e)}")
+        if response.status_code != 200:
+            metrics.record_response(model, response.status_code, retries=retry_count(response))
+            raise Exception(f"OpenRouter API error: {response.status_code} - {response.text}")
+        return response
+
+    def _complete_routed(self, payload: dict, parse: Optional[Callable[[str], object]], on_usage):
+        """
+        Race the completion across the router's models
+
+        Attempts are streamed so a losing request can be dropped mid-generation
+        by closing its connection. An attempt only wins once its content parses.
+        """
+        def attempt(model: str, token: CancelToken) -> tuple:
+            started = time.perf_counter()
+            usage = {}
+            finish = []
+            response = self._post_stream({**payload, "model": model})
+            token.on_cancel(response.close)
+            chunks = []
+            try:
+                for delta in iter_stream_content(response, on_usage=usage.update, on_finish=finish.append):
+                    token.check()
+                    chunks.append(delta)
+            except Exception as e:
+                if token.cancelled:
+                    raise RequestCancelled()
+                raise Exception(f"API request failed: {str(e)}")
+            finally:
+                response.close()
+            token.check()
+            metrics.record_stage("request", time.perf_counter() - started, model=model)
+            self.record_usage(usage)
+            metrics.record_response(model, response.status_code, usage, retry_count(response))
+
+            content = "".join(chunks)
+            if not content:
+                raise Exception("No content in OpenRouter response")
+            return content, usage, finish, parse(content) if parse else content
+
+        _, (content, usage, finish, result) = self.router.run(attempt)
+        if on_usage is not None and usage:
+            on_usage(usage)
+        if self.cache is not None and "length" not in finish:
+            self.cache.set(payload, content)
+        return result
+
+    def _open_routed_stream(self, payload: dict, usage: dict, finish: list) -> tuple:
+        """
+        Race stream openings across the router's models on time to first token
+
+        Returns:
+            (model, response, deltas) of the first stream to produce content,
+            with its first delta still at the head of deltas
+        """
+        def attempt(model: str, token: CancelToken) -> tuple:
+            attempt_usage = {}
+            attempt_finish = []
+            response = self._post_stream({**payload, "model": model})
+            token.on_cancel(response.close)
+            deltas = iter_stream_content(response, on_usage=attempt_usage.update, on_finish=attempt_finish.append)
+            try:
+                first = next(deltas, None)
+            except Exception as e:
+                response.close()
+                if token.cancelled:
+                    raise RequestCancelled()
+                raise Exception(f"API request failed: {str(e)}")
+            if first is None:
+                response.close()
+                raise Exception("No content in OpenRouter response")
+            return response, first, deltas, attempt_usage, attempt_finish
+
+        model, (response, first, deltas, attempt_usage, attempt_finish) = self.router.run(attempt, kind="first_token")
+
+        def chained() -> Iterator[str]:
+            yield first
+            yield from deltas
+            usage.update(attempt_usage)
+            finish.extend(attempt_finish)
+        return model, response, chained()
+
+    def record_usage(self, usage: Optional[dict] = None, cache_hit: bool = False):
+        if cache_hit:
+            metrics.inc("cache_hits_total", model=self.model)
+        with self._usage_lock:
+            if cache_hit:
+                self.usage["cache_hits"] += 1
+                return
+            self.usage["requests"] += 1
+            if usage:
+                self.usage["prompt_tokens"] += usage.get("prompt_tokens") or 0
+                self.usage["completion_tokens"] += usage.get("completion_tokens") or 0
+
+
+# Compact one-line schemas: a fraction of the tokens of an indented example object
+_ARTICLE_HINTS = {
+    "authors": "[str]",
+    "publication_year": "int",
+    "doi": "str|null",
+    "keywords": "[str]",
+    "confidence": '"high|medium|low"',
+    "source": '"Semantic Scholar|arXiv|IEEE|ACM"',
+}
+ARTICLE_SCHEMA = compact_schema({name: _ARTICLE_HINTS.get(name, "str") for name in ARTICLE_FIELDS})
+SYNTHESIS_SCHEMA = compact_schema({name: "str" for name in SYNTHESIS_FIELDS})
+# Fields the model writes about a retrieved record; the metadata itself is never generated
+SUMMARY_FIELDS = (
+    "keywords", "research_goal", "methodology", "main_results", "key_contributions", "limitations", "confidence",
+)
+SUMMARY_SCHEMA = compact_schema({"index": "int", **{name: _ARTICLE_HINTS.get(name, "str") for name in SUMMARY_FIELDS}})
+
+
+class SingleShotStrategy:
+    """Articles and synthesis from one completion (the backend service's approach)"""
+
+    name = "single-shot"
+
+    def build_payload(self, engine: RequestEngine, query: str, num_articles: Optional[int] = None) -> dict:
+        """Build the combined articles-and-synthesis payload"""
+        count = str(num_articles) if num_articles else "5-10"
+        system = f"""You are an expert research assistant specialized in literature review and summarization.
+Your task is to generate a comprehensive literature landscape for the given research query.
+
+Respond with one JSON object {{"articles":[article,...],"synthesis":synthesis}} where
+article = {ARTICLE_SCHEMA}
+synthesis = {SYNTHESIS_SCHEMA}
+
+Generate {count} diverse, realistic articles. Return ONLY valid JSON, no markdown or additional text."""
+
+        prompt = f"""Generate a comprehensive literature landscape for this research query: "{query}"
+
+Retrieve {count} highly relevant articles with complete metadata. For each article:
+- Provide realistic, plausible research information
+- Set confidence level based on relevance
+- Include keywords, methodology, and contributions
+- Note any limitations or open questions
+
+Format as valid JSON matching the specified schema."""
+        # The open "5-10" range is budgeted for its upper end
+        max_tokens = engine.budget.review_max_tokens(num_articles or 10)
+        return engine.build_payload(prompt, system=system, max_tokens=max_tokens)
+
+    def run(self, engine: RequestEngine, query: str, num_articles: Optional[int] = None) -> LiteratureReview:
+        """Generate a review with a single completion"""
+        if num_articles and num_articles > MAP_REDUCE_THRESHOLD:
+            # One completion cannot hold this many articles and their synthesis
+            return TwoPhaseStrategy().run(engine, query, num_articles)
+        with metrics.stage("review", strategy=self.name):
+            payload = self.build_payload(engine, query, num_articles)
+            usage = {}
+            articles, synthesis = engine.complete(payload, parse=_parse_review_strict, on_usage=usage.update)
+            engine.budget.observe_articles(len(articles), usage, synthesis=True)
+            return build_review(query, articles, synthesis)
+
+
+def _parse_review_strict(text: str) -> tuple:
+    articles, synthesis = parse_review(text)
+    if not articles:
+        raise json.JSONDecodeError("No articles in response", text, 0)
+    return articles, synthesis
+
+
+class TwoPhaseStrategy:
+    """Articles first (optionally fanned out), then a synthesis over their titles and abstracts"""
+
+    name = "two-phase"
+
+    def __init__(self, fan_out: Optional[int] = None, angles: Optional[list] = None):
+        """
+        Args:
+            fan_out: Number of concurrent article sub-requests (default: one
+                per ARTICLES_PER_REQUEST articles, capped at MAX_FAN_OUT)
+            angles: Optional sub-angles of the query, one per sub-request;
+                publication year ranges are used when omitted
+        """
+        self.fan_out = fan_out
+        self.angles = angles
+
+    def articles_payload(self, engine: RequestEngine, query: str, num_articles: int, focus: Optional[str] = None) -> dict:
+        """Build the article-generation payload"""
+        focus_line = f"\nRestrict this batch to {focus}.\n" if focus else ""
+        prompt = f"""Generate {num_articles} realistic academic articles for the research topic: "{query}"
+{focus_line}
+Return ONLY a valid JSON array of objects, each exactly:
+{ARTICLE_SCHEMA}
+
+Ensure all fields are filled with realistic, credible information relevant to the query."""
+        return engine.build_payload(prompt, max_tokens=engine.budget.articles_max_tokens(num_articles))
+
+    def synthesis_payload(
+        self,
+        engine: RequestEngine,
+        query: str,
+        articles: list,
+        context_tokens: Optional[int] = None,
+        theme: Optional[str] = None,
+    ) -> dict:
+        """
+        Build the synthesis payload from Article objects or bare titles
+
+        Titles are always listed; abstracts are packed in up to context_tokens.
+        theme names the keyword cluster of a partial (map) synthesis.
+        """
+        articles_summary = pack_articles(articles, context_tokens or SYNTHESIS_CONTEXT_TOKENS)
+        cluster = f" (cluster: {theme})" if theme else ""
+        prompt = f"""Analyze these research articles on "{query}"{cluster} and provide a comprehensive field synthesis:
+
+Articles:
+{articles_summary}
+
+Return ONLY valid JSON with this structure:
+{SYNTHESIS_SCHEMA}
+covering common themes and methods, open gaps, future directions and real-world applications.
+
+Provide insightful, evidence-based analysis."""
+        return engine.build_payload(prompt, max_tokens=engine.budget.synthesis_max_tokens())
+
+    def plan(self, num_articles: int) -> list:
+        """Return one focus instruction per sub-request ([None] for a single request)"""
+        if self.angles:
+            return list(self.angles)
+
+        fan_out = self.fan_out
+        if fan_out is None:
+            fan_out = math.ceil(num_articles / ARTICLES_PER_REQUEST)
+        fan_out = max(1, min(fan_out, MAX_FAN_OUT, FAN_OUT_YEAR_SPAN, num_articles))
+        if fan_out == 1:
+            return [None]
+
+        # Split the publication window into contiguous, non-overlapping year ranges
+        last_year = datetime.now().year
+        first_year = last_year - FAN_OUT_YEAR_SPAN + 1
+        bounds = [first_year + round(i * FAN_OUT_YEAR_SPAN / fan_out) for i in range(fan_out + 1)]
+        focuses = []
+        for index, (start, end) in enumerate(zip(bounds, bounds[1:])):
+            if index == 0:
+                focuses.append(f"articles published in or before {end - 1}")
+            else:
+                focuses.append(f"articles published between {start} and {end - 1}")
+        return focuses
+
+    def fetch_articles(self, engine: RequestEngine, query: str, num_articles: int) -> list:
+        """Request article chunks (concurrently when fanned out) and merge them without duplicates"""
+        with metrics.stage("articles"):
+            return self._fetch_articles(engine, query, num_articles)
+
+    def _fetch_articles(self, engine: RequestEngine, query: str, num_articles: int) -> list:
+        focuses = self.plan(num_articles)
+        per_request = math.ceil(num_articles / len(focuses))
+        payloads = [self.articles_payload(engine, query, per_request, focus) for focus in focuses]
+
+        def fetch(payload: dict) -> list:
+            # A chunk the model garbled yields no articles rather than failing the review
+            usage = {}
+            try:
+                articles = engine.complete(payload, parse=parse_articles, on_usage=usage.update)
+            except json.JSONDecodeError:
+                return []
+            engine.budget.observe_articles(len(articles), usage)
+            return articles
+
+        if len(payloads) == 1:
+            return fetch(payloads[0])[:num_articles]
+        with ThreadPoolExecutor(max_workers=len(payloads)) as executor:
+            return merge_articles(list(executor.map(propagate_context(fetch), payloads)), num_articles)
+
+    def fetch_new_articles(
+        self, engine: RequestEngine, query: str, existing: list, count: int, since: Optional[int] = None
+    ) -> list:
+        """Request articles missing from existing, published in or after since when given"""
+        known = {article_fingerprint(article_to_dict(article)) for article in existing}
+        focus = f"articles published in or after {since}" if since else "articles"
+        if existing:
+            titles = "; ".join(article.title for article in existing[:REFRESH_LISTED_TITLES])
+            focus += f" and not already covered ({titles})"
+        with metrics.stage("articles", mode="refresh"):
+            usage = {}
+            try:
+                articles = engine.complete(
+                    self.articles_payload(engine, query, count, focus), parse=parse_articles, on_usage=usage.update
+                )
+            except json.JSONDecodeError:
+                return []
+            engine.budget.observe_articles(len(articles), usage)
+        return [article for article in articles if article_fingerprint(article_to_dict(article)) not in known]
+
+    def reduce_payload(self, engine: RequestEngine, query: str, partials: list) -> dict:
+        """Build the payload merging partial syntheses of article clusters into one"""
+        parts = "\n\n".join(
+            f"[{index}]\n" + "\n".join(f"{name}: {partial[name]}" for name in SYNTHESIS_FIELDS if partial.get(name))
+            for index, partial in enumerate(partials, 1)
+        )
+        prompt = f"""Analyze these {len(partials)} partial syntheses of article clusters on "{query}" and merge them into one field synthesis:
+
+{parts}
+
+Return ONLY valid JSON with this structure:
+{SYNTHESIS_SCHEMA}
+keeping the themes, gaps and directions that recur across clusters as well as notable cluster-specific ones."""
+        return engine.build_payload(prompt, max_tokens=engine.budget.synthesis_max_tokens())
+
+    def _complete_synthesis(self, engine: RequestEngine, payload: dict) -> Optional[dict]:
+        usage = {}
+        try:
+            synthesis = engine.complete(payload, parse=parse_synthesis, on_usage=usage.update)
+        except json.JSONDecodeError:
+            return None
+        engine.budget.observe_synthesis(usage)
+        return synthesis
+
+    def synthesize(self, engine: RequestEngine, query: str, articles: list) -> dict:
+        """Request the field synthesis for the given articles or titles (map-reduced for large sets)"""
+        if len(articles) > MAP_REDUCE_THRESHOLD:
+            return self.synthesize_map_reduce(engine, query, articles)
+        with metrics.stage("synthesis"):
+            synthesis = self._complete_synthesis(engine, self.synthesis_payload(engine, query, articles))
+            return synthesis if synthesis is not None else normalize_synthesis({})
+
+    def synthesize_map_reduce(
+        self,
+        engine: RequestEngine,
+        query: str,
+        articles: list,
+        batch_size: int = SYNTHESIS_BATCH,
+        fan_in: int = SYNTHESIS_FAN_IN,
+        max_depth: int = MAX_REDUCE_DEPTH,
+    ) -> dict:
+        """
+        Synthesize a large article set hierarchically
+
+        Keyword clusters of about batch_size articles get partial syntheses
+        (map), run in waves of at most MAX_FAN_OUT concurrent requests so
+        every prompt stays the size of one batch however many articles there
+        are. Partials are merged fan_in at a time until one remains (reduce);
+        the fan-in is raised when needed so there are at most max_depth
+        reduce rounds. A partial the model garbled is left out rather than
+        failing the review.
+        """
+        batches = cluster_articles(articles, batch_size)
+        while fan_in ** max_depth < len(batches):
+            fan_in += 1
+
+        def partial(batch: tuple) -> Optional[dict]:
+            theme, members = batch
+            context = max(SYNTHESIS_CONTEXT_TOKENS, SYNTHESIS_CONTEXT_TOKENS * len(members) // SYNTHESIS_BATCH)
+            return self._complete_synthesis(engine, self.synthesis_payload(engine, query, members, context, theme))
+
+        with metrics.stage("synthesis", mode="map_reduce"), \
+                ThreadPoolExecutor(max_workers=min(MAX_FAN_OUT, len(batches))) as executor:
+            with metrics.stage("synthesis_map"):
+                partials = list(executor.map(propagate_context(partial), batches))
+            partials = [partial for partial in partials if partial is not None]
+
+            while len(partials) > 1:
+                groups = [partials[start:start + fan_in] for start in range(0, len(partials), fan_in)]
+                with metrics.stage("synthesis_reduce"):
+                    partials = list(executor.map(propagate_context(
+                        lambda group: group[0] if len(group) == 1 else
+                        self._complete_synthesis(engine, self.reduce_payload(engine, query, group))
+                    ), groups))
+                partials = [partial for partial in partials if partial is not None]
+        return partials[0] if partials else normalize_synthesis({})
+
+    def run(self, engine: RequestEngine, query: str, num_articles: int = 5) -> LiteratureReview:
+        """Generate a review with an articles phase followed by a synthesis phase"""
+        with metrics.stage("review", strategy=self.name):
+            articles = self.fetch_articles(engine, query, num_articles)
+            return build_review(query, articles, self.synthesize(engine, query, articles))
+
+
+def parse_summaries(text: str) -> dict:
+    """
+    Parse a summaries completion into {paper index: summary fields}
+
+    Raises:
+        json.JSONDecodeError: No JSON value could be recovered
+    """
+    with metrics.stage("parse"):
+        data = extract_json(text, expect=(list, dict))
+    if isinstance(data, dict):
+        data = data.get("summaries") or data.get("articles") or []
+    if not isinstance(data, list):
+        data = []
+    summaries = {}
+    for position, item in enumerate(data, 1):
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get("index", position))
+        except (TypeError, ValueError):
+            index = position
+        summaries[index] = {_SNAKE_NAMES.get(key, key): value for key, value in item.items()}
+    return summaries
+
+
+def record_to_article(record, summary: Optional[dict] = None) -> Article:
+    """Article from a retrieved record's metadata and the model's summary fields"""
+    raw = {name: value for name, value in (summary or {}).items() if name in SUMMARY_FIELDS}
+    raw.update(
+        title=record.title,
+        authors=record.authors,
+        publication_year=record.year,
+        venue=record.venue or "Unknown",
+        doi=record.doi,
+        abstract=record.abstract,
+        source=record.source or "Unknown",
+    )
+    if not raw.get("keywords"):
+        raw["keywords"] = list(record.categories)
+    return normalize_article(raw)
+
+
+class RetrievalStrategy:
+    """Real records from the retrieval sources, summarized (not invented) by the model, then a synthesis"""
+
+    name = "retrieval"
+
+    def __init__(self, retriever=None):
+        """
+        Args:
+            retriever: Object with search(query, limit) returning retrieval.Record
+                objects (default: retrieval.get_retriever())
+        """
+        self.retriever = retriever
+
+    def retrieve(self, query: str, num_articles: int) -> list:
+        """Return the top records for the query"""
+        with metrics.stage("retrieval"):
+            if self.retriever is None:
+                # Imported lazily: the generative strategies never need the retrieval sources
+                from retrieval import get_retriever
+                self.retriever = get_retriever()
+            return self.retriever.search(query, num_articles)
+
+    def summaries_payload(self, engine: RequestEngine, query: str, records: list) -> dict:
+        """Build the payload asking for one summary per numbered record"""
+        lines = pack_articles([record_to_article(record) for record in records]).split("\n")
+        papers = "\n".join(f"[{index}] {line[2:]}" for index, line in enumerate(lines, 1))
+        prompt = f"""Summarize these {len(records)} papers retrieved for the research topic: "{query}"
+
+Papers:
+{papers}
+
+Return ONLY a valid JSON array with one object per paper, each exactly:
+{SUMMARY_SCHEMA}
+where index is the paper's number. Base every field on the paper's title and abstract only; do not invent papers."""
+        return engine.build_payload(prompt, max_tokens=engine.budget.articles_max_tokens(len(records)))
+
+    def summarize(self, engine: RequestEngine, query: str, records: list) -> list:
+        """Articles for the records, with summary fields filled in by the model"""
+        with metrics.stage("articles"):
+            usage = {}
+            try:
+                summaries = engine.complete(
+                    self.summaries_payload(engine, query, records), parse=parse_summaries, on_usage=usage.update
+                )
+            except json.JSONDecodeError:
+                summaries = {}
+            else:
+                engine.budget.observe_articles(len(records), usage)
+            return [record_to_article(record, summaries.get(index)) for index, record in enumerate(records, 1)]
+
+    def fetch_new_articles(
+        self, engine: RequestEngine, query: str, existing: list, count: int, since: Optional[int] = None
+    ) -> list:
+        """
+        Summarize the top records missing from existing
+
+        since is not used: any record the review does not cover yet is new to it.
+        """
+        known = {article_fingerprint(article_to_dict(article)) for article in existing}
+        records = [
+            record for record in self.retrieve(query, count + len(existing))
+            if article_fingerprint(article_to_dict(record_to_article(record))) not in known
+        ][:count]
+        return self.summarize(engine, query, records) if records else []
+
+    def synthesize(self, engine: RequestEngine, query: str, articles: list) -> dict:
+        """Request the field synthesis for the summarized articles"""
+        if not articles:
+            return normalize_synthesis({})
+        return TwoPhaseStrategy().synthesize(engine, query, articles)
+
+    def run(self, engine: RequestEngine, query: str, num_articles: int = 5) -> LiteratureReview:
+        """Generate a review over retrieved records"""
+        with metrics.stage("review", strategy=self.name):
+            records = self.retrieve(query, num_articles)
+            articles = self.summarize(engine, query, records) if records else []
+            return build_review(query, articles, self.synthesize(engine, query, articles))
+
+
+def refresh_review(
+    engine: RequestEngine,
+    strategy,
+    previous: dict,
+    new_articles: int = REFRESH_ARTICLES,
+    threshold: float = RESYNTHESIS_THRESHOLD,
+) -> LiteratureReview:
+    """
+    Update a stored review with articles it does not cover yet
+
+    Only articles newer than the previous review (or outside its DOI/title set)
+    are requested. The previous synthesis is kept unless at least `threshold`
+    of the merged articles are new.
+
+    Args:
+        engine: Request engine
+        strategy: A strategy with fetch_new_articles and synthesize (two-phase or retrieval)
+        previous: Stored review (ReviewStore.get_review/latest_review)
+        new_articles: Articles to request
+        threshold: Share of new articles that triggers a new synthesis
+
+    Returns:
+        The merged review; provenance records what the refresh changed
+    """
+    query = previous["query"]
+    existing = [normalize_article(article) for article in previous["articles"]]
+    since = int(previous["generated_at"][:4]) if previous.get("generated_at", "")[:4].isdigit() else None
+
+    with metrics.stage("review", strategy=strategy.name, mode="refresh"):
+        added = strategy.fetch_new_articles(engine, query, existing, new_articles, since)
+        articles = merge_articles([existing, added])
+        added_count = len(articles) - len(existing)
+        resynthesized = added_count > 0 and added_count / len(articles) >= threshold
+        if resynthesized:
+            synthesis = strategy.synthesize(engine, query, articles)
+        else:
+            synthesis = normalize_synthesis(previous.get("synthesis") or {})
+
+    review = build_review(query, articles, synthesis)
+    review.provenance = {
+        "refreshed_from": previous.get("id"),
+        "previous_generated_at": previous.get("generated_at"),
+        "new_articles": added_count,
+        "resynthesized": resynthesized,
+    }
+    metrics.inc("review_refreshes_total", strategy=strategy.name, resynthesized=str(resynthesized).lower())
+    return review
+
+
+metrics.describe("review_refreshes_total", "Stored reviews refreshed incrementally instead of regenerated")
+
+STRATEGIES = {
+    SingleShotStrategy.name: SingleShotStrategy,
+    TwoPhaseStrategy.name: TwoPhaseStrategy,
+    RetrievalStrategy.name: RetrievalStrategy,
+}
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Review Job Queue
+Durable SQLite-backed queue for bulk review generation: a pool of workers
+claims one query at a time, each finished review is committed together with
+its job's checkpoint, failed jobs retry with exponential backoff, and a killed
+run resumes exactly where it stopped
+
+Usage:
+    python scripts/review_jobs.py run queries.txt --run nightly -w 4
+    python scripts/review_jobs.py status --run nightly
+    python scripts/review_jobs.py retry --run nightly
+    python scripts/review_jobs.py export --run nightly -o reviews.ndjson
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+from query_file import read_queries
+from review_core import DEFAULT_MODEL, STRATEGIES, LiteratureReview, RequestEngine
+from review_metrics import metrics, trace
+from review_store import get_review_store
+
+DEFAULT_JOBS_PATH = os.path.join(os.path.expanduser("~"), ".local", "share", "literature_review", "jobs.sqlite3")
+
+STATUSES = ("pending", "running", "done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    run TEXT NOT NULL,
+    query TEXT NOT NULL,
+    num_articles INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    worker TEXT,
+    started_at REAL,
+    finished_at REAL,
+    elapsed REAL,
+    review_json TEXT,
+    review_id INTEGER,
+    UNIQUE (run, query)
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs(run, status, next_attempt_at);
+"""
+
+
+@dataclass
+class Job:
+    """One query of a bulk run"""
+    id: int
+    run: str
+    query: str
+    num_articles: int
+    attempts: int
+
+
+def _review_json(review: LiteratureReview) -> str:
+    return json.dumps({
+        "query": review.query,
+        "articles": review.articles,
+        "synthesis": review.synthesis,
+        "generated_at": review.generated_at,
+    })
+
+
+class JobQueue:
+    """SQLite queue of review jobs; every state change is its own committed transaction"""
+
+    def __init__(self, path: str = DEFAULT_JOBS_PATH, max_attempts: int = 3, backoff: float = 30.0):
+        """
+        Args:
+            path: SQLite file (":memory:" keeps the queue in memory)
+            max_attempts: Attempts before a job is marked failed
+            backoff: Delay in seconds before the first retry, doubled per attempt
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != ":memory:":
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+            self._db.commit()
+
+    def submit(self, run: str, queries: list, num_articles: int = 5) -> int:
+        """Enqueue queries for a run, skipping ones already queued; returns the number added"""
+        with self._lock, self._db:
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO jobs (run, query, num_articles) VALUES (?, ?, ?)",
+                [(run, query, num_articles) for query in queries],
+            )
+            return self._db.total_changes - before
+
+    def recover(self, run: str) -> int:
+        """Return jobs left running by a killed process to the queue; returns the number recovered"""
+        with self._lock, self._db:
+            return self._db.execute(
+                "UPDATE jobs SET status = 'pending', worker = NULL WHERE run = ? AND status = 'running'", (run,)
+            ).rowcount
+
+    def claim(self, run: str, worker: str) -> Optional[Job]:
+        """Atomically take the oldest due pending job of a run"""
+        with self._lock, self._db:
+            row = self._db.execute(
+                """
+                UPDATE jobs SET status = 'running', worker = ?, started_at = ?, attempts = attempts + 1
+                WHERE id = (
+                    SELECT id FROM jobs WHERE run = ? AND status = 'pending' AND next_attempt_at <= ?
+                    ORDER BY next_attempt_at, id LIMIT 1
+                )
+                RETURNING id, run, query, num_articles, attempts
+                """,
+                (worker, time.time(), run, time.time()),
+            ).fetchone()
+        return Job(**dict(row)) if row is not None else None
+
+    def next_due(self, run: str) -> Optional[float]:
+        """Seconds until the next pending job of a run becomes due (None when none are pending)"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MIN(next_attempt_at) FROM jobs WHERE run = ? AND status = 'pending'", (run,)
+            ).fetchone()
+        return max(0.0, row[0] - time.time()) if row[0] is not None else None
+
+    def checkpoint(self, job: Job, review: LiteratureReview):
+        """Save a generated review on its running job before it is stored, so a resumed job reuses it"""
+        with self._lock, self._db:
+            self._db.execute("UPDATE jobs SET review_json = ? WHERE id = ?", (_review_json(review), job.id))
+
+    def checkpointed(self, job: Job) -> Optional[LiteratureReview]:
+        """The review saved by checkpoint() on an earlier attempt of job, if any"""
+        with self._lock:
+            row = self._db.execute("SELECT review_json FROM jobs WHERE id = ?", (job.id,)).fetchone()
+        if row is None or row["review_json"] is None:
+            return None
+        return LiteratureReview(**json.loads(row["review_json"]))
+
+    def complete(self, job: Job, review: LiteratureReview, elapsed: float, review_id: Optional[int] = None):
+        """Checkpoint a finished job together with its review"""
+        with self._lock, self._db:
+            self._db.execute(
+                """
+                UPDATE jobs SET status = 'done', error = NULL, finished_at = ?, elapsed = ?,
+                    review_json = ?, review_id = ?
+                WHERE id = ?
+                """,
+                (time.time(), elapsed, _review_json(review), review_id, job.id),
+            )
+
+    def fail(self, job: Job, error: str, elapsed: float) -> bool:
+        """
+        Record a failed attempt, rescheduling it with backoff while attempts remain
+
+        Returns:
+            True when the job will be retried
+        """
+        retry = job.attempts < self.max_attempts
+        delay = self.backoff * 2 ** (job.attempts - 1) * random.uniform(0.8, 1.2)
+        with self._lock, self._db:
+            self._db.execute(
+                """
+                UPDATE jobs SET status = ?, error = ?, next_attempt_at = ?, finished_at = ?, elapsed = ?
+                WHERE id = ?
+                """,
+                ("pending" if retry else "failed", error, time.time() + delay, time.time(), elapsed, job.id),
+            )
+        return retry
+
+    def retry_failed(self, run: str) -> int:
+        """Requeue a run's failed jobs with a fresh attempt budget"""
+        with self._lock, self._db:
+            return self._db.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, next_attempt_at = 0 WHERE run = ? AND status = 'failed'",
+                (run,),
+            ).rowcount
+
+    def counts(self, run: str) -> dict:
+        """Job counts per status, plus how many pending jobs are waiting to retry"""
+        with self._lock:
+            counts = dict.fromkeys(STATUSES, 0)
+            for row in self._db.execute("SELECT status, COUNT(*) FROM jobs WHERE run = ? GROUP BY status", (run,)):
+                counts[row[0]] = row[1]
+            counts["retrying"] = self._db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE run = ? AND status = 'pending' AND attempts > 0", (run,)
+            ).fetchone()[0]
+        return counts
+
+    def failures(self, run: str) -> list:
+        """(query, attempts, error) of a run's failed jobs"""
+        with self._lock:
+            return [
+                (row["query"], row["attempts"], row["error"])
+                for row in self._db.execute(
+                    "SELECT query, attempts, error FROM jobs WHERE run = ? AND status = 'failed' ORDER BY id", (run,)
+                )
+            ]
+
+    def iter_reviews(self, run: str) -> Iterator[dict]:
+        """Yield the stored reviews of a run's finished jobs in submission order"""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT id, review_json FROM jobs WHERE run = ? AND status = 'done' AND id > ? ORDER BY id LIMIT 200",
+                    (run, last_id),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield json.loads(row["review_json"])
+            last_id = rows[-1]["id"]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class JobRunner:
+    """Pool of worker threads draining one run of a JobQueue"""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        run: str,
+        generate: Callable[[str, int], LiteratureReview],
+        workers: int = 4,
+        on_event: Optional[Callable[[str, Job, Optional[str]], None]] = None,
+    ):
+        """
+        Args:
+            queue: Queue holding the run's jobs
+            run: Run name
+            generate: Produces a review for (query, num_articles)
+            workers: Number of worker threads
+            on_event: Called with ("done" | "retry" | "failed", job, error) after each attempt
+        """
+        self.queue = queue
+        self.run = run
+        self.generate = generate
+        self.workers = workers
+        self.on_event = on_event
+        self.stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Requeue jobs a killed run left running, then start the workers"""
+        self.queue.recover(self.run)
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, args=(f"worker-{index}",), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the workers; returns True once all of them have exited"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self._threads)
+
+    def _work(self, worker: str):
+        while not self.stop.is_set():
+            job = self.queue.claim(self.run, worker)
+            if job is None:
+                # Nothing due: wait for the next backoff to expire, or exit when the run is drained
+                wait = self.queue.next_due(self.run)
+                if wait is None and self.queue.counts(self.run)["running"] == 0:
+                    return
+                self.stop.wait(min(wait if wait is not None else 1.0, 1.0))
+                continue
+            self._process(job)
+
+    def _process(self, job: Job):
+        started = time.perf_counter()
+        # A job killed after generating resumes from its checkpoint instead of generating again
+        review = self.queue.checkpointed(job)
+        if review is None:
+            try:
+                with trace(query=job.query, run=self.run, attempt=job.attempts):
+                    review = self.generate(job.query, job.num_articles)
+                if not review.articles:
+                    raise Exception("No articles generated")
+            except Exception as e:
+                retry = self.queue.fail(job, str(e), time.perf_counter() - started)
+                metrics.inc("jobs_total", status="retry" if retry else "failed")
+                if self.on_event is not None:
+                    self.on_event("retry" if retry else "failed", job, str(e))
+                return
+            self.queue.checkpoint(job, review)
+
+        # The store and the queue are separate databases: look for the review an
+        # interrupted attempt already stored before inserting it a second time
+        store = get_review_store()
+        review_id = None
+        if store is not None:
+            review_id = store.find_review(review.query, review.generated_at)
+            if review_id is None:
+                review_id = store.add_review(review.query, review.articles, review.synthesis, review.generated_at)
+        self.queue.complete(job, review, time.perf_counter() - started, review_id)
+        metrics.inc("jobs_total", status="done")
+        if self.on_event is not None:
+            self.on_event("done", job, None)
+
+
+metrics.describe("jobs_total", "Bulk review job attempts by outcome")
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def progress_line(counts: dict, completed: int, elapsed: float) -> str:
+    """One-line progress summary with throughput and ETA for this session"""
+    total = sum(counts[status] for status in STATUSES)
+    finished = counts["done"] + counts["failed"]
+    rate = completed / elapsed if elapsed > 0 else 0.0
+    remaining = total - finished
+    eta = _format_duration(remaining / rate) if rate > 0 and remaining else "-"
+    return (
+        f"[{finished}/{total}] {counts['done']} done, {counts['failed']} failed, "
+        f"{counts['running']} running, {counts['retrying']} retrying | {rate * 60:.1f} reviews/min | ETA {eta}"
+    )
+
+
+def run_command(args, queue: JobQueue):
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    if not api_key:
+        print("Error: OPENROUTER_API_KEY environment variable not set", file=sys.stderr)
+        sys.exit(1)
+
+    if args.queries_file:
+        added = queue.submit(args.run, read_queries(args.queries_file), args.num_articles)
+        print(f"Queued {added} new job(s) for run '{args.run}'", file=sys.stderr)
+
+    engine = RequestEngine(api_key, args.model)
+    strategy = STRATEGIES[args.strategy]()
+    completed = 0
+    lock = threading.Lock()
+    interactive = sys.stderr.isatty()
+
+    def on_event(kind: str, job: Job, error: Optional[str]):
+        nonlocal completed
+        with lock:
+            if kind == "done":
+                completed += 1
+            if not interactive:
+                status = "ok" if kind == "done" else f"{kind}: {error}"
+                print(f"[job {job.id}] {job.query} (attempt {job.attempts}) {status}", file=sys.stderr)
+
+    runner = JobRunner(queue, args.run, lambda query, n: strategy.run(engine, query, n), args.workers, on_event)
+    started = time.perf_counter()
+    runner.start()
+    try:
+        while not runner.join(timeout=1.0):
+            if interactive:
+                line = progress_line(queue.counts(args.run), completed, time.perf_counter() - started)
+                print(f"\r{line}\033[K", end="", file=sys.stderr, flush=True)
+    except KeyboardInterrupt:
+        runner.stop.set()
+        print(f"\nInterrupted; rerun with --run {args.run} to resume", file=sys.stderr)
+        sys.exit(130)
+
+    counts = queue.counts(args.run)
+    print(("\n" if interactive else "") + progress_line(counts, completed, time.perf_counter() - started), file=sys.stderr)
+    for query, attempts, error in queue.failures(args.run):
+        print(f"  failed after {attempts} attempt(s): {query}: {error}", file=sys.stderr)
+    sys.exit(1 if counts["failed"] else 0)
+
+
+def main():
+    """Bulk review CLI entry point"""
+    parser = argparse.ArgumentParser(description="Resumable bulk literature review runs")
+    parser.add_argument("--jobs", default=os.getenv("LITREVIEW_JOBS_PATH", DEFAULT_JOBS_PATH), help="queue database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="queue queries (optional) and process a run until it is drained")
+    run.add_argument("queries_file", nargs="?", help="file with one query per line ('-' for stdin)")
+    run.add_argument("--run", default="default", help="run name; rerun with the same name to resume")
+    run.add_argument("-w", "--workers", type=int, default=4)
+    run.add_argument("-n", "--num-articles", type=int, default=5)
+    run.add_argument("--strategy", choices=sorted(STRATEGIES), default="two-phase")
+    run.add_argument("--model", default=os.getenv("MODEL", DEFAULT_MODEL))
+    run.add_argument("--max-attempts", type=int, default=3)
+    run.add_argument("--backoff", type=float, default=30.0, help="seconds before the first retry (doubles)")
+
+    status = commands.add_parser("status", help="show job counts and failures of a run")
+    status.add_argument("--run", default="default")
+
+    retry = commands.add_parser("retry", help="requeue a run's failed jobs")
+    retry.add_argument("--run", default="default")
+
+    export = commands.add_parser("export", help="write a run's finished reviews as NDJSON")
+    export.add_argument("--run", default="default")
+    export.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+
+    args = parser.parse_args()
+    queue = JobQueue(
+        args.jobs,
+        max_attempts=getattr(args, "max_attempts", 3),
+        backoff=getattr(args, "backoff", 30.0),
+    )
+
+    if args.command == "run":
+        run_command(args, queue)
+    elif args.command == "status":
+        counts = queue.counts(args.run)
+        print(f"run '{args.run}': " + ", ".join(f"{counts[name]} {name}" for name in STATUSES + ("retrying",)))
+        for query, attempts, error in queue.failures(args.run):
+            print(f"  failed after {attempts} attempt(s): {query}: {error}")
+    elif args.command == "retry":
+        print(f"Requeued {queue.retry_failed(args.run)} failed job(s)", file=sys.stderr)
+    else:
+        output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        try:
+            for review in queue.iter_reviews(args.run):
+                output.write(json.dumps(review) + "\n")
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Review Pipeline Metrics
+Stage timings, token usage and retry counts for review generation, exported
+in the Prometheus text format and optionally logged as JSON lines
+
+Set LITREVIEW_LOG_JSON=1 to write one JSON object per finished stage to stderr.
+"""
+
+import bisect
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_trace_id: contextvars.ContextVar = contextvars.ContextVar("litreview_trace_id", default=None)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: tuple, extra: Optional[tuple] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(DURATION_BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(DURATION_BUCKETS, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe counters and duration histograms keyed by metric name and labels"""
+
+    def __init__(self, prefix: str = "litreview"):
+        self.prefix = prefix
+        self.log_json = os.getenv("LITREVIEW_LOG_JSON") == "1"
+        self._counters: dict = {}
+        self._histograms: dict = {}
+        self._help: dict = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add value to a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record one observation in a duration histogram"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram()
+            histogram.observe(value)
+
+    def log(self, event: str, **fields):
+        """Write a JSON log line (when LITREVIEW_LOG_JSON=1) tagged with the current trace id"""
+        if not self.log_json:
+            return
+        record = {"ts": round(time.time(), 3), "event": event}
+        trace_id = _trace_id.get()
+        if trace_id is not None:
+            record["trace_id"] = trace_id
+        record.update(fields)
+        print(json.dumps(record, default=str), file=sys.stderr, flush=True)
+
+    @contextmanager
+    def stage(self, name: str, **labels):
+        """Time a pipeline stage into <prefix>_stage_duration_seconds{stage=name}"""
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            self.record_stage(name, time.perf_counter() - started, status, **labels)
+
+    def record_stage(self, name: str, seconds: float, status: str = "ok", **labels):
+        """Record a stage duration measured by the caller"""
+        self.observe("stage_duration_seconds", seconds, stage=name, **labels)
+        self.log("stage", stage=name, status=status, duration_ms=round(seconds * 1000, 3), **labels)
+
+    def record_response(self, model: str, status: int, usage: Optional[dict] = None, retries: int = 0):
+        """Record one upstream completion with its token usage and retry count"""
+        self.inc("requests_total", model=model, status=str(status))
+        if retries:
+            self.inc("retries_total", retries, model=model)
+        if usage:
+            self.inc("tokens_total", usage.get("prompt_tokens") or 0, model=model, kind="prompt")
+            self.inc("tokens_total", usage.get("completion_tokens") or 0, model=model, kind="completion")
+        self.log("response", model=model, status=status, usage=usage, retries=retries)
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {full} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {full} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{full}{_format_labels(key)} {value:g}")
+
+            for name, series in sorted(self._histograms.items()):
+                full = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {full} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {full} histogram")
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(DURATION_BUCKETS, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{full}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative}")
+                    lines.append(f"{full}_bucket{_format_labels(key, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{full}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{full}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def trace(**fields):
+    """Tag every metric log line inside the block with a fresh trace id"""
+    token = _trace_id.set(uuid.uuid4().hex[:16])
+    metrics.log("trace_start", **fields)
+    try:
+        yield _trace_id.get()
+    finally:
+        _trace_id.reset(token)
+
+
+def propagate_context(fn: Callable) -> Callable:
+    """
+    Wrap fn so every call runs in a copy of the caller's context
+
+    Worker threads (executor.map/submit) start with an empty context; this
+    keeps the trace id on the log lines of fanned-out stages.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # A context can only be entered by one thread at a time: copy per call
+        return context.copy().run(fn, *args, **kwargs)
+    return run
+
+
+metrics = MetricsRegistry()
+metrics.describe("stage_duration_seconds", "Duration of review pipeline stages")
+metrics.describe("requests_total", "Upstream completion requests by HTTP status")
+metrics.describe("retries_total", "Upstream retries performed by the transport")
+metrics.describe("tokens_total", "Tokens reported in the upstream usage block")
+metrics.describe("cache_hits_total", "Completions served from the response cache")
@@ -0,0 +1,144 @@
+"""
+Literature Review HTTP Server
+JSON-over-HTTP front end of the persistent review service, imported by
+literature_review_service.py only in --serve mode so one-shot runs skip
+loading http.server
+"""
+
+import hashlib
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+from model_router import router_summaries
+from response_cache import get_response_cache
+from review_core import review_to_dict
+from review_metrics import metrics
+from semantic_cache import get_semantic_cache
+from single_flight import SingleFlight
+
+
+class ReviewRequestHandler(BaseHTTPRequestHandler):
+    """JSON-over-HTTP handler for the persistent review service"""
+
+    server_version = "LiteratureReviewService/1.0"
+
+    def do_GET(self):
+        if self.path == "/health":
+            cache = get_response_cache()
+            semantic_cache = get_semantic_cache()
+            self._send_json(200, {
+                "status": "ok",
+                "cache": cache.stats if cache is not None else None,
+                "semanticCache": semantic_cache.summary() if semantic_cache is not None else None,
+                "models": router_summaries(),
+                "inFlight": self.server.flights.in_flight(),
+            })
+        elif self.path == "/metrics":
+            data = metrics.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path not in ("/review", "/review/stream"):
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": f"Invalid request body: {str(e)}"})
+            return
+        if not isinstance(body, dict):
+            self._send_json(400, {"error": "Invalid request body: expected a JSON object"})
+            return
+
+        query = body.get("query")
+        api_key = body.get("apiKey") or os.getenv("OPENROUTER_API_KEY")
+        if not query or not isinstance(query, str):
+            self._send_json(400, {"error": "Invalid query parameter"})
+            return
+        if not api_key:
+            self._send_json(400, {"error": "OPENROUTER_API_KEY not provided"})
+            return
+
+        generator = self.server.pool.get(api_key, body.get("model"))
+        # Identical concurrent requests share one upstream generation
+        key = flight_key(query, generator.model, api_key)
+        if self.path == "/review/stream":
+            self._stream_review(self.server.flights.stream(key, lambda: generator.generate_review_stream(query)))
+            return
+
+        try:
+            review = self.server.flights.do(key, lambda: generator.generate_review(query))
+        except Exception as e:
+            print(f"[LiteratureReviewService] Error: {str(e)}", file=sys.stderr)
+            self._send_json(500, {"error": str(e)})
+            return
+
+        self._send_json(200, review_to_dict(review))
+
+    def _stream_review(self, events: Iterator[dict]):
+        """Write review events as NDJSON, one line per event, until the stream ends"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        try:
+            for event in events:
+                self.wfile.write((json.dumps(event) + "\n").encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            print("[LiteratureReviewService] Stream client disconnected", file=sys.stderr)
+        except Exception as e:
+            print(f"[LiteratureReviewService] Error: {str(e)}", file=sys.stderr)
+            self.wfile.write((json.dumps({"type": "error", "error": str(e)}) + "\n").encode("utf-8"))
+
+    def _send_json(self, status: int, payload: dict):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        print(f"[LiteratureReviewService] {self.address_string()} {format % args}", file=sys.stderr)
+
+
+class ReviewServer(ThreadingHTTPServer):
+    """Threaded HTTP server that serves reviews from a warm generator pool"""
+
+    daemon_threads = True
+    # Bursts of identical queries must all be accepted to be coalesced
+    request_queue_size = 128
+
+    def __init__(self, address: tuple[str, int], pool):
+        """
+        Bind the server
+
+        Args:
+            address: (host, port) to listen on
+            pool: Warm generators, with get(api_key, model) returning one
+        """
+        super().__init__(address, ReviewRequestHandler)
+        self.pool = pool
+        self.flights = SingleFlight()
+
+
+def flight_key(query: str, model: str, api_key: str) -> tuple:
+    """
+    Coalescing key: the query with case and whitespace normalized, the model
+    and a hash of the API key, so a caller never shares another key's
+    generation (or its billing or auth error)
+    """
+    return " ".join(query.casefold().split()), model, hashlib.sha256(api_key.encode("utf-8")).hexdigest()
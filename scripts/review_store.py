@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Literature Review Store
+Persistent SQLite store of generated reviews with an FTS5 full-text index and
+facet tables over articles, deduplicated across reviews
+
+Usage:
+    python scripts/review_store.py search "transformer ocr" --year-from 2020 --venue ICDAR
+    python scripts/review_store.py facets venue --text "handwriting"
+    python scripts/review_store.py show 12
+    python scripts/review_store.py stats
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from typing import Iterator, Optional
+
+from review_core import article_fingerprint
+
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser("~"), ".local", "share", "literature_review", "reviews.sqlite3")
+
+FACET_FIELDS = ("venue", "year", "keyword", "source")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY,
+    query TEXT NOT NULL,
+    model TEXT,
+    generated_at TEXT NOT NULL,
+    synthesis_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reviews_query ON reviews(query);
+
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    abstract TEXT,
+    keywords TEXT,
+    venue TEXT,
+    year INTEGER,
+    doi TEXT,
+    source TEXT,
+    data_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_year ON articles(year);
+CREATE INDEX IF NOT EXISTS articles_venue ON articles(venue);
+CREATE INDEX IF NOT EXISTS articles_doi ON articles(doi);
+
+CREATE TABLE IF NOT EXISTS article_keywords (
+    article_id INTEGER NOT NULL REFERENCES articles(id),
+    keyword TEXT NOT NULL,
+    PRIMARY KEY (keyword, article_id)
+);
+
+CREATE TABLE IF NOT EXISTS review_articles (
+    review_id INTEGER NOT NULL REFERENCES reviews(id),
+    article_id INTEGER NOT NULL REFERENCES articles(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (review_id, article_id)
+);
+CREATE INDEX IF NOT EXISTS review_articles_article ON review_articles(article_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, abstract, keywords, venue, content='articles', content_rowid='id'
+);
+"""
+
+
+def _article_year(article: dict) -> Optional[int]:
+    year = article.get("publication_year", article.get("publicationYear"))
+    try:
+        return int(year)
+    except (TypeError, ValueError):
+        return None
+
+
+def _fts_query(text: str) -> str:
+    """Quote each term so user input cannot inject FTS5 syntax"""
+    terms = re.findall(r"\w+", text)
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+class ReviewStore:
+    """SQLite (FTS5) store of reviews and their deduplicated articles"""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        """Open (and create if needed) the store at `path`; ":memory:" keeps it in memory"""
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != ":memory:":
+                self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+            self._db.commit()
+
+    def add_review(
+        self,
+        query: str,
+        articles: list,
+        synthesis: dict,
+        generated_at: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> int:
+        """
+        Store a review and index its articles
+
+        Articles may use either the generator's snake_case or the service's
+        camelCase fields. An article already stored by another review (same
+        DOI or normalized title) is linked rather than duplicated.
+
+        Returns:
+            The new review id
+        """
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "INSERT INTO reviews (query, model, generated_at, synthesis_json) VALUES (?, ?, ?, ?)",
+                (query, model, generated_at or datetime.now().isoformat(), json.dumps(synthesis)),
+            )
+            review_id = cursor.lastrowid
+
+            for position, article in enumerate(articles):
+                article_id = self._upsert_article(article)
+                self._db.execute(
+                    "INSERT OR IGNORE INTO review_articles (review_id, article_id, position) VALUES (?, ?, ?)",
+                    (review_id, article_id, position),
+                )
+        return review_id
+
+    def find_review(self, query: str, generated_at: str) -> Optional[int]:
+        """Id of the review stored for query at generated_at, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id FROM reviews WHERE query = ? AND generated_at = ? ORDER BY id LIMIT 1", (query, generated_at)
+            ).fetchone()
+        return row["id"] if row is not None else None
+
+    def _upsert_article(self, article: dict) -> int:
+        fingerprint = article_fingerprint(article)
+        row = self._db.execute("SELECT id FROM articles WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        if row is not None:
+            return row["id"]
+
+        keywords = [str(k).strip() for k in article.get("keywords") or [] if str(k).strip()]
+        values = (
+            fingerprint,
+            article.get("title") or "Unknown",
+            article.get("abstract") or "",
+            " ".join(keywords),
+            article.get("venue") or "",
+            _article_year(article),
+            article.get("doi"),
+            article.get("source") or "",
+            json.dumps(article),
+        )
+        cursor = self._db.execute(
+            "INSERT INTO articles (fingerprint, title, abstract, keywords, venue, year, doi, source, data_json) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            values,
+        )
+        article_id = cursor.lastrowid
+        self._db.execute(
+            "INSERT INTO articles_fts (rowid, title, abstract, keywords, venue) VALUES (?, ?, ?, ?, ?)",
+            (article_id, values[1], values[2], values[3], values[4]),
+        )
+        self._db.executemany(
+            "INSERT OR IGNORE INTO article_keywords (article_id, keyword) VALUES (?, ?)",
+            [(article_id, keyword.lower()) for keyword in keywords],
+        )
+        return article_id
+
+    def _filters(
+        self,
+        text: Optional[str],
+        year_from: Optional[int],
+        year_to: Optional[int],
+        venue: Optional[str],
+        keyword: Optional[str],
+        doi: Optional[str],
+    ) -> tuple:
+        """Build the WHERE clause shared by search() and facets()"""
+        clauses = []
+        params = []
+        if text and _fts_query(text):
+            clauses.append("a.id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+            params.append(_fts_query(text))
+        if year_from is not None:
+            clauses.append("a.year >= ?")
+            params.append(year_from)
+        if year_to is not None:
+            clauses.append("a.year <= ?")
+            params.append(year_to)
+        if venue:
+            clauses.append("a.venue = ? COLLATE NOCASE")
+            params.append(venue)
+        if keyword:
+            clauses.append("a.id IN (SELECT article_id FROM article_keywords WHERE keyword = ?)")
+            params.append(keyword.lower())
+        if doi:
+            clauses.append("lower(a.doi) = ?")
+            params.append(doi.strip().lower())
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, params
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        venue: Optional[str] = None,
+        keyword: Optional[str] = None,
+        doi: Optional[str] = None,
+        limit: int = 20,
+    ) -> list:
+        """Return matching articles (best full-text rank first) as dicts"""
+        ranked = bool(text and _fts_query(text))
+        # Ranked searches join the FTS table directly instead of filtering on it
+        where, params = self._filters(None if ranked else text, year_from, year_to, venue, keyword, doi)
+        if ranked:
+            sql = (
+                "SELECT a.*, f.rank AS rank FROM articles a "
+                "JOIN (SELECT rowid, rank FROM articles_fts WHERE articles_fts MATCH ?) f ON f.rowid = a.id"
+                f"{where} ORDER BY f.rank LIMIT ?"
+            )
+            params = [_fts_query(text)] + params + [limit]
+        else:
+            sql = f"SELECT a.* FROM articles a{where} ORDER BY a.year DESC, a.id DESC LIMIT ?"
+            params = params + [limit]
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [self._row_to_article(row) for row in rows]
+
+    def facets(
+        self,
+        field: str,
+        text: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        venue: Optional[str] = None,
+        keyword: Optional[str] = None,
+        limit: int = 20,
+    ) -> list:
+        """Return (value, article count) pairs for a facet field over the filtered articles"""
+        if field not in FACET_FIELDS:
+            raise ValueError(f"Unknown facet field: {field} (expected one of {', '.join(FACET_FIELDS)})")
+
+        where, params = self._filters(text, year_from, year_to, venue, keyword, None)
+        if field == "keyword":
+            sql = (
+                "SELECT k.keyword AS value, COUNT(*) AS count FROM article_keywords k "
+                f"JOIN articles a ON a.id = k.article_id{where} "
+                "GROUP BY k.keyword ORDER BY count DESC, value LIMIT ?"
+            )
+        else:
+            sql = (
+                f"SELECT a.{field} AS value, COUNT(*) AS count FROM articles a{where} "
+                f"GROUP BY a.{field} ORDER BY count DESC, value LIMIT ?"
+            )
+
+        with self._lock:
+            rows = self._db.execute(sql, params + [limit]).fetchall()
+        return [(row["value"], row["count"]) for row in rows]
+
+    def get_review(self, review_id: int) -> Optional[dict]:
+        """Return a stored review with its articles in original order"""
+        with self._lock:
+            review = self._db.execute("SELECT * FROM reviews WHERE id = ?", (review_id,)).fetchone()
+            if review is None:
+                return None
+            rows = self._db.execute(
+                "SELECT a.* FROM review_articles ra JOIN articles a ON a.id = ra.article_id "
+                "WHERE ra.review_id = ? ORDER BY ra.position",
+                (review_id,),
+            ).fetchall()
+        return {
+            "id": review["id"],
+            "query": review["query"],
+            "model": review["model"],
+            "generated_at": review["generated_at"],
+            "articles": [json.loads(row["data_json"]) for row in rows],
+            "synthesis": json.loads(review["synthesis_json"]),
+        }
+
+    def latest_review(self, query: str) -> Optional[dict]:
+        """Return the most recent stored review for an exact query"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id FROM reviews WHERE query = ? ORDER BY generated_at DESC, id DESC LIMIT 1", (query,)
+            ).fetchone()
+        return self.get_review(row["id"]) if row is not None else None
+
+    def iter_reviews(self, batch_size: int = 500) -> Iterator[dict]:
+        """Yield every stored review with its articles, reading in id-ordered batches"""
+        last_id = 0
+        while True:
+            with self._lock:
+                ids = [
+                    row["id"]
+                    for row in self._db.execute(
+                        "SELECT id FROM reviews WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+                    )
+                ]
+            if not ids:
+                return
+            for review_id in ids:
+                review = self.get_review(review_id)
+                if review is not None:
+                    yield review
+            last_id = ids[-1]
+
+    def iter_articles(self, after_id: int = 0, batch_size: int = 500) -> Iterator[list]:
+        """Yield batches of (article id, article) for unique articles with ids above after_id"""
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT id, data_json FROM articles WHERE id > ? ORDER BY id LIMIT ?", (after_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield [(row["id"], json.loads(row["data_json"])) for row in rows]
+            after_id = rows[-1]["id"]
+
+    def stats(self) -> dict:
+        """Return row counts for reviews, unique articles and review/article links"""
+        with self._lock:
+            return {
+                table: self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("reviews", "articles", "review_articles")
+            }
+
+    def _row_to_article(self, row: sqlite3.Row) -> dict:
+        article = json.loads(row["data_json"])
+        article["_id"] = row["id"]
+        return article
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_default_store: Optional[ReviewStore] = None
+_default_lock = threading.Lock()
+
+
+def get_review_store() -> Optional[ReviewStore]:
+    """Return the process-wide store configured from environment, or None when disabled"""
+    global _default_store
+    if os.getenv("LITREVIEW_STORE", "1") == "0":
+        return None
+
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ReviewStore(os.getenv("LITREVIEW_STORE_PATH", DEFAULT_STORE_PATH))
+        return _default_store
+
+
+def main():
+    """Query the review store from the command line"""
+    parser = argparse.ArgumentParser(description="Search and facet stored literature reviews")
+    parser.add_argument("--store", default=os.getenv("LITREVIEW_STORE_PATH", DEFAULT_STORE_PATH))
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_filters(command):
+        command.add_argument("--year-from", type=int)
+        command.add_argument("--year-to", type=int)
+        command.add_argument("--venue")
+        command.add_argument("--keyword")
+        command.add_argument("--limit", type=int, default=20)
+
+    search = commands.add_parser("search", help="full-text search over articles")
+    search.add_argument("text", nargs="?")
+    search.add_argument("--doi")
+    add_filters(search)
+
+    facets = commands.add_parser("facets", help="count articles per venue, year, keyword or source")
+    facets.add_argument("field", choices=FACET_FIELDS)
+    facets.add_argument("--text")
+    add_filters(facets)
+
+    show = commands.add_parser("show", help="print a stored review")
+    show.add_argument("review_id", type=int)
+
+    commands.add_parser("stats", help="print store size")
+
+    args = parser.parse_args()
+    store = ReviewStore(args.store)
+
+    if args.command == "search":
+        results = store.search(
+            args.text, args.year_from, args.year_to, args.venue, args.keyword, args.doi, args.limit
+        )
+        if args.json:
+            print(json.dumps(results, indent=2))
+        else:
+            for article in results:
+                year = article.get("publication_year", article.get("publicationYear", "?"))
+                print(f"[{article['_id']}] {article.get('title')} ({year}) — {article.get('venue', '')}")
+            print(f"{len(results)} result(s)", file=sys.stderr)
+
+    elif args.command == "facets":
+        counts = store.facets(
+            args.field, args.text, args.year_from, args.year_to, args.venue, args.keyword, args.limit
+        )
+        if args.json:
+            print(json.dumps(counts))
+        else:
+            for value, count in counts:
+                print(f"{count:>8}  {value}")
+
+    elif args.command == "show":
+        review = store.get_review(args.review_id)
+        if review is None:
+            print(f"Error: no review with id {args.review_id}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(review, indent=2))
+
+    else:
+        print(json.dumps(store.stats()))
+
+
+if __name__ == "__main__":
+    main()
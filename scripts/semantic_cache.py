@@ -0,0 +1,416 @@
+"""
+Semantic Review Cache
+Reuses a stored review when a new query is a near-duplicate of an earlier one
+("transformer OCR historical documents" vs "transformer-based OCR for
+historical documents"). Queries are normalized and embedded with hashed
+word/character n-grams (or a local sentence-transformers model when
+configured) and matched by cosine similarity against a brute-force index,
+vectorized with NumPy once it outgrows a sparse scan and optionally backed
+by hnswlib.
+"""
+
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+from review_core import LiteratureReview
+from review_metrics import metrics
+
+# NumPy, set by load_numpy() once an index grows large enough to need it
+np = None
+_numpy_missing = False
+
+DEFAULT_SEMANTIC_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "literature_review", "semantic.sqlite3")
+DEFAULT_THRESHOLD = 0.9
+EMBEDDING_DIM = 1024
+# Below this many entries a sparse pure-Python scan takes about a millisecond,
+# far less than NumPy's ~80 ms import, so small caches start without NumPy
+DENSE_MIN_ENTRIES = 256
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at based by for from in into is of on or the to towards using via with".split()
+)
+
+
+def load_numpy():
+    """Import NumPy on first use; None when it is not installed"""
+    global np, _numpy_missing
+    if np is None and not _numpy_missing:
+        try:
+            import numpy
+        except ImportError:  # pure-Python sparse vectors are used instead
+            _numpy_missing = True
+        else:
+            np = numpy
+    return np
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop punctuation and stopwords, and strip plural suffixes"""
+    words = []
+    for word in _TOKEN.findall(query.lower()):
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return " ".join(words)
+
+
+class HashingEmbedder:
+    """Hashed word, word-bigram and character-trigram features, L2-normalized (sparse)"""
+
+    name = "hashing"
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def _features(self, normalized: str) -> dict:
+        words = normalized.split()
+        features = {}
+        for word in words:
+            features[word] = features.get(word, 0.0) + 1.0
+            padded = f" {word} "
+            for i in range(len(padded) - 2):
+                gram = "#" + padded[i:i + 3]
+                features[gram] = features.get(gram, 0.0) + 0.25
+        for first, second in zip(words, words[1:]):
+            bigram = f"{first}_{second}"
+            features[bigram] = features.get(bigram, 0.0) + 0.5
+        return features
+
+    def embed(self, normalized: str) -> dict:
+        vector = {}
+        for feature, weight in self._features(normalized).items():
+            hashed = zlib.crc32(feature.encode("utf-8"))
+            index = hashed % self.dim
+            sign = 1.0 if hashed & 0x80000000 else -1.0
+            vector[index] = vector.get(index, 0.0) + sign * weight
+        norm = math.sqrt(sum(value * value for value in vector.values())) or 1.0
+        return {index: value / norm for index, value in vector.items() if value}
+
+
+class ModelEmbedder:
+    """Dense embeddings from a local sentence-transformers model (requires numpy)"""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.name = model_name
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self._model.get_sentence_embedding_dimension()
+
+    def embed(self, normalized: str):
+        return self._model.encode(normalized, normalize_embeddings=True).astype(np.float32)
+
+
+class VectorIndex:
+    """Nearest-neighbour index over unit vectors (cosine similarity = dot product)"""
+
+    def __init__(self, dim: int, use_ann: bool = False):
+        self.dim = dim
+        self.ids: list = []
+        self._rows = 0
+        self._matrix = None
+        self._sparse: list = []
+        self._ann = None
+        self._deleted = 0
+        if use_ann:
+            import hnswlib
+
+            self._densify()
+            self._ann = hnswlib.Index(space="ip", dim=dim)
+            self._ann.init_index(max_elements=1024, ef_construction=200, M=16)
+            self._ann.set_ef(64)
+
+    def __len__(self) -> int:
+        return len(self.ids) - self._deleted
+
+    @property
+    def dense(self) -> bool:
+        return self._matrix is not None
+
+    def _densify(self):
+        """Move the sparse rows into a dense matrix, when NumPy is available"""
+        if load_numpy() is None:
+            return
+        self._matrix = np.zeros((max(64, 2 * self._rows), self.dim), dtype=np.float32)
+        for row, vector in enumerate(self._sparse):
+            self._matrix[row] = self._dense(vector)
+        self._sparse = []
+
+    def _dense(self, vector):
+        if isinstance(vector, dict):
+            dense = np.zeros(self.dim, dtype=np.float32)
+            for index, value in vector.items():
+                dense[index] = value
+            return dense
+        return vector
+
+    def add(self, entry_id: int, vector):
+        if self._matrix is None and (self._rows >= DENSE_MIN_ENTRIES or not isinstance(vector, dict)):
+            self._densify()
+        if self._matrix is None:
+            self._sparse.append(vector)
+        else:
+            if self._rows == len(self._matrix):
+                self._matrix = np.vstack([self._matrix, np.zeros_like(self._matrix)])
+            self._matrix[self._rows] = self._dense(vector)
+            if self._ann is not None:
+                if self._ann.get_current_count() == self._ann.get_max_elements():
+                    self._ann.resize_index(self._ann.get_max_elements() * 2)
+                self._ann.add_items(self._matrix[self._rows:self._rows + 1], [self._rows])
+        self._rows += 1
+        self.ids.append(entry_id)
+
+    def remove(self, entry_id: int):
+        """Drop an entry: the last row moves into its place (hnswlib marks it deleted)"""
+        row = self.ids.index(entry_id)
+        if self._ann is not None:
+            self._ann.mark_deleted(row)
+            self.ids[row] = None
+            self._deleted += 1
+            return
+        last = self._rows - 1
+        if self._matrix is None:
+            self._sparse[row] = self._sparse[last]
+            self._sparse.pop()
+        else:
+            self._matrix[row] = self._matrix[last]
+        self.ids[row] = self.ids[last]
+        self.ids.pop()
+        self._rows -= 1
+
+    def nearest(self, vector) -> Optional[tuple]:
+        """Return (entry_id, similarity) of the closest vector, or None when empty"""
+        if not len(self):
+            return None
+
+        if self._matrix is None:
+            best_row, best_score = 0, -1.0
+            for row, candidate in enumerate(self._sparse):
+                small, large = (candidate, vector) if len(candidate) < len(vector) else (vector, candidate)
+                score = sum(value * large.get(index, 0.0) for index, value in small.items())
+                if score > best_score:
+                    best_row, best_score = row, score
+            return self.ids[best_row], best_score
+
+        query = self._dense(vector)
+        if self._ann is not None:
+            labels, distances = self._ann.knn_query(query, k=1)
+            row = int(labels[0][0])
+            return self.ids[row], 1.0 - float(distances[0][0])
+        scores = self._matrix[:self._rows] @ query
+        row = int(np.argmax(scores))
+        return self.ids[row], float(scores[row])
+
+
+@dataclass
+class SemanticHit:
+    """A cached review matched to a new query"""
+    review: dict
+    matched_query: str
+    similarity: float
+    cached_at: float
+
+    def provenance(self) -> dict:
+        return {
+            "source": "semantic_cache",
+            "matched_query": self.matched_query,
+            "similarity": round(self.similarity, 4),
+            "cached_at": self.cached_at,
+        }
+
+
+class SemanticCache:
+    """Near-duplicate query cache of complete reviews, partitioned by namespace"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        ttl: float = 7 * 24 * 3600,
+        embedder=None,
+        use_ann: bool = False,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file for persisted entries (None keeps memory only)
+            threshold: Minimum cosine similarity for a hit
+            ttl: Seconds before an entry stops matching (0 disables expiry)
+            embedder: Query embedder (defaults to HashingEmbedder)
+            use_ann: Use an hnswlib index instead of brute force (requires numpy and hnswlib)
+        """
+        self.threshold = threshold
+        self.ttl = ttl
+        self.embedder = embedder or HashingEmbedder()
+        self.use_ann = use_ann and load_numpy() is not None
+        self.stats = {"lookups": 0, "hits": 0, "misses": 0, "lookup_seconds": 0.0}
+
+        self._indexes: dict = {}
+        self._entries: dict = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS semantic_reviews ("
+                "id INTEGER PRIMARY KEY, namespace TEXT NOT NULL, query TEXT NOT NULL, "
+                "review TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+            self._load()
+
+    def _load(self):
+        """Re-embed persisted queries (vectors are not stored, so the embedder can change)"""
+        horizon = time.time() - self.ttl if self.ttl else 0
+        rows = self._db.execute(
+            "SELECT id, namespace, query, created FROM semantic_reviews WHERE created >= ? ORDER BY id", (horizon,)
+        )
+        for entry_id, namespace, query, created in rows:
+            self._index(entry_id, namespace, query, created)
+            self._next_id = max(self._next_id, entry_id + 1)
+
+    def _index(self, entry_id: int, namespace: str, query: str, created: float, review: Optional[dict] = None):
+        index = self._indexes.get(namespace)
+        if index is None:
+            index = self._indexes[namespace] = VectorIndex(self.embedder.dim, self.use_ann)
+        index.add(entry_id, self.embedder.embed(normalize_query(query)))
+        self._entries[entry_id] = (query, created, review)
+
+    def lookup(self, query: str, namespace: str = "") -> Optional[SemanticHit]:
+        """Return the cached review of the most similar earlier query, if above the threshold"""
+        started = time.perf_counter()
+        hit = None
+        with self._lock:
+            index = self._indexes.get(namespace)
+            vector = self.embedder.embed(normalize_query(query)) if index is not None else None
+            while index is not None:
+                match = index.nearest(vector)
+                if match is None or match[1] < self.threshold:
+                    break
+                entry_id, similarity = match
+                matched_query, created, review = self._entries[entry_id]
+                if self.ttl and time.time() - created > self.ttl:
+                    # An expired entry would keep shadowing a fresher one for
+                    # the same query, so drop it and look again
+                    self._evict(index, entry_id)
+                    continue
+                if review is None and self._db is not None:
+                    row = self._db.execute("SELECT review FROM semantic_reviews WHERE id = ?", (entry_id,)).fetchone()
+                    review = json.loads(row[0]) if row else None
+                if review is not None:
+                    hit = SemanticHit(review, matched_query, similarity, created)
+                break
+
+            elapsed = time.perf_counter() - started
+            self.stats["lookups"] += 1
+            self.stats["hits" if hit else "misses"] += 1
+            self.stats["lookup_seconds"] += elapsed
+
+        metrics.inc("semantic_cache_lookups_total", result="hit" if hit else "miss")
+        metrics.record_stage("semantic_lookup", elapsed)
+        return hit
+
+    def _evict(self, index: VectorIndex, entry_id: int):
+        index.remove(entry_id)
+        del self._entries[entry_id]
+        if self._db is not None:
+            self._db.execute("DELETE FROM semantic_reviews WHERE id = ?", (entry_id,))
+            self._db.commit()
+
+    def add(self, query: str, review: dict, namespace: str = ""):
+        """Remember a freshly generated review for future near-duplicate queries"""
+        now = time.time()
+        with self._lock:
+            if self._db is not None:
+                cursor = self._db.execute(
+                    "INSERT INTO semantic_reviews (namespace, query, review, created) VALUES (?, ?, ?, ?)",
+                    (namespace, query, json.dumps(review), now),
+                )
+                self._db.commit()
+                entry_id = cursor.lastrowid
+                # Reviews live in SQLite; only the query is kept in memory
+                self._index(entry_id, namespace, query, now)
+            else:
+                entry_id = self._next_id
+                self._index(entry_id, namespace, query, now, review)
+            self._next_id = max(self._next_id, entry_id + 1)
+
+    def get_review(self, query: str, namespace: str = "") -> Optional[LiteratureReview]:
+        """Look up a near-duplicate query and return its review tagged with provenance"""
+        hit = self.lookup(query, namespace)
+        if hit is None:
+            return None
+        review = hit.review
+        return LiteratureReview(
+            query=query,
+            articles=review["articles"],
+            synthesis=review["synthesis"],
+            generated_at=review["generated_at"],
+            provenance=hit.provenance(),
+        )
+
+    def put_review(self, review: LiteratureReview, namespace: str = ""):
+        """Remember a freshly generated LiteratureReview"""
+        self.add(review.query, {
+            "articles": review.articles,
+            "synthesis": review.synthesis,
+            "generated_at": review.generated_at,
+        }, namespace)
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        return self.stats["hits"] / self.stats["lookups"] if self.stats["lookups"] else 0.0
+
+    def summary(self) -> dict:
+        """Hit rate, mean lookup latency and index size"""
+        lookups = self.stats["lookups"]
+        return {
+            "entries": len(self._entries),
+            "lookups": lookups,
+            "hits": self.stats["hits"],
+            "hit_rate": round(self.hit_rate(), 4),
+            "mean_lookup_ms": round(self.stats["lookup_seconds"] / lookups * 1000, 3) if lookups else 0.0,
+            "embedder": self.embedder.name,
+            "backend": "hnswlib" if self.use_ann else (
+                "numpy" if any(index.dense for index in self._indexes.values()) else "python"
+            ),
+        }
+
+
+_default_cache: Optional[SemanticCache] = None
+_default_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """Return the process-wide semantic cache configured from environment, or None when disabled"""
+    global _default_cache
+    if os.getenv("LITREVIEW_SEMANTIC_CACHE", "1") == "0":
+        return None
+
+    with _default_lock:
+        if _default_cache is None:
+            model_name = os.getenv("LITREVIEW_SEMANTIC_MODEL")
+            _default_cache = SemanticCache(
+                path=os.getenv("LITREVIEW_SEMANTIC_CACHE_PATH", DEFAULT_SEMANTIC_CACHE_PATH) or None,
+                threshold=float(os.getenv("LITREVIEW_SEMANTIC_THRESHOLD", str(DEFAULT_THRESHOLD))),
+                ttl=float(os.getenv("LITREVIEW_CACHE_TTL", str(7 * 24 * 3600))),
+                embedder=ModelEmbedder(model_name) if model_name and load_numpy() is not None else None,
+                use_ann=os.getenv("LITREVIEW_SEMANTIC_ANN") == "1",
+            )
+        return _default_cache
@@ -0,0 +1,122 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers asking for the same key share one in-flight call (or one
+in-flight event stream) instead of each starting their own
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Iterator, Optional
+
+from review_metrics import metrics
+
+
+class SharedStream:
+    """Events of one producer, replayed from the start to every subscriber"""
+
+    def __init__(self):
+        self.events = []
+        self.finished = False
+        self.error: Optional[BaseException] = None
+        self._condition = threading.Condition()
+
+    def publish(self, event):
+        with self._condition:
+            self.events.append(event)
+            self._condition.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None):
+        with self._condition:
+            self.finished = True
+            self.error = error
+            self._condition.notify_all()
+
+    def subscribe(self) -> Iterator:
+        """Yield every event published so far, then new ones until the producer finishes"""
+        index = 0
+        while True:
+            with self._condition:
+                while index >= len(self.events) and not self.finished:
+                    self._condition.wait()
+                if index < len(self.events):
+                    event = self.events[index]
+                    index += 1
+                elif self.error is not None:
+                    raise self.error
+                else:
+                    return
+            yield event
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls and streams by key"""
+
+    def __init__(self):
+        self._calls: dict = {}
+        self._streams: dict = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn: Callable[[], object]):
+        """
+        Run fn, or wait for the identical call already in flight under key
+
+        Every caller receives the leader's result, or its exception.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            metrics.inc("coalesced_requests_total", mode="call")
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stream(self, key, start: Callable[[], Iterator]) -> Iterator:
+        """
+        Subscribe to the stream in flight under key, starting it when there is none
+
+        The producer runs on its own thread, so one subscriber disconnecting
+        does not cut the stream short for the others. A subscriber joining
+        late first receives the events it missed.
+        """
+        with self._lock:
+            shared = self._streams.get(key)
+            leader = shared is None
+            if leader:
+                shared = self._streams[key] = SharedStream()
+        if leader:
+            threading.Thread(target=self._produce, args=(key, shared, start), daemon=True).start()
+        else:
+            metrics.inc("coalesced_requests_total", mode="stream")
+        return shared.subscribe()
+
+    def _produce(self, key, shared: SharedStream, start: Callable[[], Iterator]):
+        try:
+            for event in start():
+                shared.publish(event)
+        except Exception as e:
+            shared.finish(e)
+        else:
+            shared.finish()
+        finally:
+            with self._lock:
+                del self._streams[key]
+
+    def in_flight(self) -> dict:
+        with self._lock:
+            return {"calls": len(self._calls), "streams": len(self._streams)}
+
+
+metrics.describe("coalesced_requests_total", "Requests served by attaching to an identical in-flight request")
@@ -0,0 +1,152 @@
+"""
+Incremental Review Parser
+Consumes a streamed LLM completion chunk by chunk and emits each article as
+soon as its JSON object closes, and each synthesis field as soon as its
+string value closes
+"""
+
+import json
+from typing import Optional
+
+
+class _Frame:
+    """One open JSON container on the parser stack"""
+
+    __slots__ = ("kind", "start", "name", "key", "expecting_key", "role")
+
+    def __init__(self, kind: str, start: int, name: Optional[str], role: Optional[str]):
+        self.kind = kind  # "{" or "["
+        self.start = start
+        self.name = name  # key this container is stored under in its parent object
+        self.key: Optional[str] = None  # most recent key read inside this object
+        self.expecting_key = kind == "{"
+        self.role = role  # "articles", "article", "synthesis" or None
+
+
+class IncrementalReviewParser:
+    """
+    Single-pass streaming parser for review completions
+
+    Articles are recognized either as elements of a top-level array (generator
+    script) or of the "articles" array of a top-level object (service script).
+    Prose before the JSON is skipped, including bracketed asides: a value that
+    closes without producing any event does not end the parse.
+    feed() returns the events completed by the new chunk as
+    (kind, key, value) tuples:
+
+        ("article_title", None, "...")    an article's title closed (before its body)
+        ("article", None, {...})          an article object closed
+        ("synthesis_field", name, "...")  a synthesis string field closed
+        ("synthesis", None, {...})        the synthesis object closed
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.done = False
+        self._pos = 0
+        self._stack: list[_Frame] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._started = False
+        # Whether the current top-level value has produced an event yet
+        self._emitted = False
+
+    def feed(self, chunk: str) -> list:
+        """Append a chunk of completion text and return newly completed events"""
+        self.buffer += chunk
+        events = []
+        buffer = self.buffer
+        i = self._pos
+
+        while i < len(buffer) and not self.done:
+            char = buffer[i]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._close_string(buffer, i, events)
+            elif not self._started:
+                # Skip prose or a markdown fence before the JSON value; a bracket
+                # only opens it when a string, object or array follows
+                if char in "{[":
+                    j = i + 1
+                    while j < len(buffer) and buffer[j].isspace():
+                        j += 1
+                    if j == len(buffer):
+                        break  # wait for the next chunk to decide
+                    if buffer[j] in '"{[':
+                        self._started = True
+                        self._open(char, i)
+            elif char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char in "{[":
+                self._open(char, i)
+            elif char in "}]":
+                self._close(buffer, i, events)
+            elif char == ":" and self._stack:
+                self._stack[-1].expecting_key = False
+            elif char == "," and self._stack and self._stack[-1].kind == "{":
+                self._stack[-1].expecting_key = True
+            i += 1
+
+        self._pos = i
+        return events
+
+    def _open(self, kind: str, index: int):
+        parent = self._stack[-1] if self._stack else None
+        name = parent.key if parent is not None and parent.kind == "{" else None
+
+        role = None
+        if kind == "[" and (parent is None or (name == "articles" and len(self._stack) == 1)):
+            role = "articles"
+        elif kind == "{" and parent is not None and parent.role == "articles":
+            role = "article"
+        elif kind == "{" and name == "synthesis" and len(self._stack) == 1:
+            role = "synthesis"
+
+        self._stack.append(_Frame(kind, index, name, role))
+
+    def _close(self, buffer: str, index: int, events: list):
+        if not self._stack:
+            return
+        frame = self._stack.pop()
+
+        if frame.role in ("article", "synthesis"):
+            try:
+                value = json.loads(buffer[frame.start:index + 1])
+            except json.JSONDecodeError:
+                value = None
+            if isinstance(value, dict):
+                events.append((frame.role, None, value))
+                self._emitted = True
+
+        if not self._stack:
+            if self._emitted:
+                self.done = True
+            else:
+                # A bracketed aside in prose, not the review: keep looking
+                self._started = False
+
+    def _close_string(self, buffer: str, index: int, events: list):
+        if not self._stack or self._stack[-1].kind != "{":
+            return
+        frame = self._stack[-1]
+        try:
+            value = json.loads(buffer[self._string_start:index + 1])
+        except json.JSONDecodeError:
+            return
+
+        if frame.expecting_key:
+            frame.key = value
+        elif frame.role == "article" and frame.key == "title":
+            events.append(("article_title", None, value))
+            self._emitted = True
+        elif frame.role == "synthesis":
+            events.append(("synthesis_field", frame.key, value))
+            self._emitted = True
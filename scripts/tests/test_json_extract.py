@@ -0,0 +1,31 @@
+from json_extract import extract_json
+from review_core import normalize_article, normalize_title, parse_articles, parse_review
+
+
+def test_truncated_inside_nested_list_drops_half_written_article():
+    text = '[{"title":"A","authors":["Ann Lee"]},{"title":"B","authors":["Jane Doe", "John'
+    assert [article.title for article in parse_articles(text)] == ["A"]
+
+
+def test_truncated_inside_wrapped_articles_keywords():
+    text = '{"articles":[{"title":"A"},{"title":"B","keywords":["ocr","hist'
+    assert extract_json(text) == {"articles": [{"title": "A"}]}
+
+
+def test_truncated_scalar_array_keeps_complete_items():
+    assert extract_json('["a", "b", "c') == ["a", "b"]
+
+
+def test_null_or_scalar_articles_parse_as_no_articles():
+    assert parse_articles('{"articles": null}') == []
+    assert parse_articles('{"articles": 3}') == []
+    assert parse_review('{"articles": null, "synthesis": null}')[0] == []
+
+
+def test_article_fields_are_coerced_to_strings():
+    article = normalize_article({"title": 123, "venue": ["ICDAR"], "authors": ["Ann Lee", 7, None], "keywords": 5})
+    assert article.title == "123"
+    assert article.venue == "['ICDAR']"
+    assert article.authors == ["Ann Lee", "7"]
+    assert article.keywords == []
+    assert normalize_title(article.title) == "123"
@@ -0,0 +1,22 @@
+import time
+
+from model_router import ModelRouter
+
+
+def test_losing_attempt_latency_is_recorded_as_lower_bound():
+    router = ModelRouter(["slow", "fast"], min_samples=1)
+
+    def attempt(model, token):
+        if model == "slow":
+            while not token.cancelled:
+                time.sleep(0.01)
+        return model
+
+    started = time.perf_counter()
+    assert router.run(attempt) == ("fast", "fast")
+    assert time.perf_counter() - started < 2.0
+
+    slow = router.stats("slow")
+    assert slow.samples == 0
+    assert slow.latency_samples == 1
+    assert router.hedge_delay("slow") >= slow.percentile(0.9) > 0.5
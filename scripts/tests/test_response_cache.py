@@ -0,0 +1,83 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_openrouter import MockConfig, start_mock_server  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from review_core import RequestEngine, TwoPhaseStrategy  # noqa: E402
+
+
+def test_repeat_query_is_cached_after_budget_adapts():
+    server = start_mock_server(MockConfig(latency=0.0, jitter=0.0))
+    try:
+        engine = RequestEngine("test", base_url=f"{server.base_url}/chat/completions", cache=ResponseCache(), router=None)
+        strategy = TwoPhaseStrategy()
+        before = (engine.budget.articles_max_tokens(3), engine.budget.synthesis_max_tokens())
+        strategy.run(engine, "historical document recognition", 3)
+        after = (engine.budget.articles_max_tokens(3), engine.budget.synthesis_max_tokens())
+        upstream = server.requests
+
+        strategy.run(engine, "historical document recognition", 3)
+
+        assert after != before
+        assert server.requests == upstream
+    finally:
+        server.shutdown()
+
+
+class TruncatedTransport:
+    """Answers every completion with two articles cut off at max_tokens"""
+
+    content = '[{"title":"A"},{"title":"B"},{"title":"C","authors":["Jo'
+
+    def __init__(self):
+        self.requests = 0
+
+    def post(self, url, api_key, payload, timeout=None, stream=False):
+        self.requests += 1
+        return TruncatedResponse(self.content, stream)
+
+
+class TruncatedResponse:
+    status_code = 200
+    text = ""
+    raw = None
+
+    def __init__(self, content, stream):
+        self.content = content
+        self.stream = stream
+
+    def json(self):
+        return {"choices": [{"message": {"content": self.content}, "finish_reason": "length"}]}
+
+    def iter_lines(self, decode_unicode=False):
+        yield "data: " + json.dumps({"choices": [{"delta": {"content": self.content}}]})
+        yield "data: " + json.dumps({"choices": [{"delta": {}, "finish_reason": "length"}]})
+        yield "data: [DONE]"
+
+    def close(self):
+        pass
+
+
+def test_completion_cut_off_at_max_tokens_is_not_cached():
+    transport = TruncatedTransport()
+    engine = RequestEngine("test", transport=transport, cache=ResponseCache(), router=None)
+    strategy = TwoPhaseStrategy()
+
+    assert len(strategy.fetch_articles(engine, "historical document recognition", 5)) == 2
+    strategy.fetch_articles(engine, "historical document recognition", 5)
+
+    assert transport.requests == 2
+
+
+def test_streamed_completion_cut_off_at_max_tokens_is_not_cached():
+    transport = TruncatedTransport()
+    engine = RequestEngine("test", transport=transport, cache=ResponseCache(), router=None)
+    payload = engine.build_payload("list articles")
+
+    "".join(engine.stream(payload))
+    "".join(engine.stream(payload))
+
+    assert transport.requests == 2
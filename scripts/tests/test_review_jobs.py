@@ -0,0 +1,36 @@
+import pytest
+
+import review_jobs
+from review_core import LiteratureReview
+from review_jobs import JobQueue, JobRunner
+from review_store import ReviewStore
+
+
+def test_job_killed_between_store_and_complete_is_not_stored_twice(monkeypatch):
+    store = ReviewStore(":memory:")
+    monkeypatch.setattr(review_jobs, "get_review_store", lambda: store)
+    queue = JobQueue(":memory:")
+    queue.submit("run", ["ocr"])
+    generated = []
+
+    def generate(query, num_articles):
+        generated.append(query)
+        return LiteratureReview(query=query, articles=[{"title": "A"}], synthesis={}, generated_at=f"t{len(generated)}")
+
+    def killed(*args):
+        raise RuntimeError("killed")
+
+    runner = JobRunner(queue, "run", generate)
+    # The review reaches the store but the process dies before the job is marked done
+    monkeypatch.setattr(queue, "complete", killed)
+    with pytest.raises(RuntimeError):
+        runner._process(queue.claim("run", "w1"))
+
+    monkeypatch.undo()
+    monkeypatch.setattr(review_jobs, "get_review_store", lambda: store)
+    queue.recover("run")
+    runner._process(queue.claim("run", "w2"))
+
+    assert generated == ["ocr"]
+    assert store._db.execute("SELECT COUNT(*) FROM reviews").fetchone()[0] == 1
+    assert queue.counts("run")["done"] == 1
@@ -0,0 +1,26 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_openrouter import MockConfig, start_mock_server  # noqa: E402
+from review_core import RequestEngine, TwoPhaseStrategy  # noqa: E402
+from review_metrics import metrics, trace  # noqa: E402
+
+
+def test_fanned_out_stage_logs_carry_trace_id(monkeypatch, capsys):
+    monkeypatch.setattr(metrics, "log_json", True)
+    server = start_mock_server(MockConfig(latency=0.0, jitter=0.0))
+    try:
+        engine = RequestEngine("test", base_url=f"{server.base_url}/chat/completions")
+        engine.cache = None
+        with trace(query="ocr") as trace_id:
+            TwoPhaseStrategy(fan_out=3).fetch_articles(engine, "historical document recognition", 6)
+    finally:
+        server.shutdown()
+
+    records = [json.loads(line) for line in capsys.readouterr().err.splitlines() if line.startswith("{")]
+    requests = [record for record in records if record.get("stage") == "request"]
+    assert len(requests) == 3
+    assert all(record.get("trace_id") == trace_id for record in requests)
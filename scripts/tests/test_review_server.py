@@ -0,0 +1,27 @@
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from review_server import ReviewServer, flight_key
+
+
+def test_flight_key_separates_api_keys():
+    assert flight_key(" OCR  Survey", "m", "key-a") == flight_key("ocr survey", "m", "key-a")
+    assert flight_key("ocr survey", "m", "key-a") != flight_key("ocr survey", "m", "key-b")
+    assert "key-a" not in flight_key("ocr survey", "m", "key-a")
+
+
+def test_non_object_body_is_rejected():
+    server = ReviewServer(("127.0.0.1", 0), pool=None)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        for body in (b"[]", b'"ocr"', b"3", b"null"):
+            request = urllib.request.Request(f"http://127.0.0.1:{server.server_port}/review", data=body, method="POST")
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(request, timeout=5)
+            assert error.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,24 @@
+import time
+
+import pytest
+
+import semantic_cache
+from review_core import LiteratureReview
+from semantic_cache import SemanticCache
+
+
+def make_review(query: str, generated_at: str) -> LiteratureReview:
+    return LiteratureReview(query=query, articles=[], synthesis={}, generated_at=generated_at)
+
+
+@pytest.mark.parametrize("dense_min_entries", [256, 0])
+def test_regenerated_review_replaces_expired_entry(tmp_path, monkeypatch, dense_min_entries):
+    monkeypatch.setattr(semantic_cache, "DENSE_MIN_ENTRIES", dense_min_entries)
+    cache = SemanticCache(path=str(tmp_path / "semantic.sqlite3"), ttl=0.2)
+    cache.put_review(make_review("transformer OCR", "first"))
+    time.sleep(0.3)
+    # Re-generated after expiry: ties with the expired entry at similarity 1.0
+    cache.put_review(make_review("transformer OCR", "second"))
+    review = cache.get_review("transformer OCR")
+    assert review is not None and review.generated_at == "second"
+    assert cache.summary()["entries"] == 1
@@ -0,0 +1,50 @@
+import json
+
+from stream_parser import IncrementalReviewParser
+
+REVIEW = {
+    "articles": [
+        {"title": 'Quoted \\"OCR\\" {and} [brackets]', "authors": ["Ann Lee"]},
+        {"title": "B", "authors": []},
+    ],
+    "synthesis": {"overview": "Escapes \\\\ and \\n survive", "gaps": "none"},
+}
+
+
+def feed_all(text: str, size: int) -> tuple:
+    parser = IncrementalReviewParser()
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return parser, events
+
+
+def test_every_chunk_boundary_yields_the_same_events():
+    text = json.dumps(REVIEW)
+    _, expected = feed_all(text, len(text))
+    for size in range(1, 12):
+        parser, events = feed_all(text, size)
+        assert events == expected
+        assert parser.done
+    assert [value["title"] for kind, _, value in expected if kind == "article"] == [
+        REVIEW["articles"][0]["title"], "B",
+    ]
+    assert ("synthesis_field", "overview", REVIEW["synthesis"]["overview"]) in expected
+
+
+def test_escaped_quotes_and_brackets_inside_strings():
+    parser, events = feed_all('[{"title": "a \\"]}\\" b"}]', 3)
+    assert events[-1] == ("article", None, {"title": 'a "]}" b'})
+    assert parser.done
+
+
+def test_bracketed_prose_before_the_json_is_skipped():
+    for text in (
+        'Here are [some] articles: [{"title":"a"}]',
+        'See [1] and {note} first.\n```json\n[{"title":"a"}]\n```',
+        'Results ["draft"] follow: {"articles": [{"title":"a"}]}',
+    ):
+        for size in (1, 4, len(text)):
+            parser, events = feed_all(text, size)
+            assert ("article", None, {"title": "a"}) in events
+            assert parser.done
@@ -0,0 +1,206 @@
+"""
+Token Budget Planner
+Local token estimates, completion ceilings sized from observed per-article
+usage, a compact schema notation for prompts and a packer that fits article
+abstracts into a synthesis prompt's context budget
+"""
+
+import re
+import threading
+from typing import Optional
+
+try:
+    import tiktoken
+except ImportError:  # the regex estimate below is used instead
+    tiktoken = None
+
+# Priors until real completions have been observed (tokens)
+DEFAULT_ARTICLE_TOKENS = 400
+DEFAULT_SYNTHESIS_TOKENS = 450
+# JSON brackets, keys of the wrapper object and the occasional preamble
+COMPLETION_OVERHEAD = 64
+# Headroom over the expected completion so long answers are not truncated
+SAFETY_MARGIN = 1.3
+# Ceilings are rounded up to this step so the response cache key stays stable
+TOKEN_STEP = 256
+MIN_MAX_TOKENS = 512
+# Article context sent with a synthesis request
+SYNTHESIS_CONTEXT_TOKENS = 1500
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+_encoding = None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text without calling the API
+
+    Uses tiktoken's cl100k_base encoding when installed. Otherwise counts
+    words (long words as several tokens), digit groups and punctuation,
+    which tracks BPE tokenizers to within ~10% on English prose and JSON.
+    """
+    global _encoding
+    if not text:
+        return 0
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        return len(_encoding.encode(text, disallowed_special=()))
+    return sum((len(piece) + 5) // 6 if piece.isalpha() else 1 for piece in _TOKEN_PATTERN.findall(text))
+
+
+def compact_schema(fields: dict) -> str:
+    """
+    Render a one-line schema such as {"title":str,"authors":[str]}
+
+    Args:
+        fields: Field name -> type hint ("str", "int", "[str]" or a literal
+            alternative list like "high|medium|low")
+    """
+    return "{" + ",".join(f'"{name}":{hint}' for name, hint in fields.items()) + "}"
+
+
+def _round_up(tokens: float) -> int:
+    return int(-(-tokens // TOKEN_STEP) * TOKEN_STEP)
+
+
+class TokenBudget:
+    """
+    Completion ceilings sized from the article count and observed usage
+
+    Per-article and synthesis completion sizes are tracked as exponential
+    moving averages of the usage blocks the API reports. A completion cut off
+    by its ceiling yields fewer (salvaged) articles for the same tokens, which
+    raises the per-article average and so widens the next ceiling.
+    """
+
+    def __init__(
+        self,
+        ceiling: int = 4000,
+        article_tokens: float = DEFAULT_ARTICLE_TOKENS,
+        synthesis_tokens: float = DEFAULT_SYNTHESIS_TOKENS,
+        margin: float = SAFETY_MARGIN,
+        smoothing: float = 0.2,
+    ):
+        """
+        Args:
+            ceiling: Largest max_tokens ever requested
+            article_tokens: Prior completion tokens per article
+            synthesis_tokens: Prior completion tokens per synthesis
+            margin: Headroom multiplier over the expected completion
+            smoothing: Weight of each new observation in the moving averages
+        """
+        self.ceiling = ceiling
+        self.article_tokens = article_tokens
+        self.synthesis_tokens = synthesis_tokens
+        self.margin = margin
+        self.smoothing = smoothing
+        self.observations = 0
+        self._lock = threading.Lock()
+
+    def _limit(self, expected: float) -> int:
+        planned = _round_up((expected + COMPLETION_OVERHEAD) * self.margin)
+        return max(min(MIN_MAX_TOKENS, self.ceiling), min(planned, self.ceiling))
+
+    def articles_max_tokens(self, num_articles: int) -> int:
+        """max_tokens for a completion returning num_articles articles"""
+        return self._limit(self.article_tokens * num_articles)
+
+    def synthesis_max_tokens(self) -> int:
+        """max_tokens for a synthesis completion"""
+        return self._limit(self.synthesis_tokens)
+
+    def review_max_tokens(self, num_articles: int) -> int:
+        """max_tokens for a single completion with articles and synthesis"""
+        return self._limit(self.article_tokens * num_articles + self.synthesis_tokens)
+
+    def observe_articles(self, num_articles: int, usage: Optional[dict], synthesis: bool = False):
+        """
+        Fold one fresh completion's usage into the per-article average
+
+        Args:
+            num_articles: Articles parsed from the completion
+            usage: The API's usage block (cache hits have none and are ignored)
+            synthesis: The completion also contained a synthesis, whose
+                expected size is subtracted first
+        """
+        completion = (usage or {}).get("completion_tokens")
+        if not completion or num_articles <= 0:
+            return
+        if synthesis:
+            completion = max(completion - self.synthesis_tokens, completion / 2)
+        with self._lock:
+            self.article_tokens += self.smoothing * (completion / num_articles - self.article_tokens)
+            self.observations += 1
+
+    def observe_synthesis(self, usage: Optional[dict]):
+        """Fold one fresh synthesis completion's usage into its average"""
+        completion = (usage or {}).get("completion_tokens")
+        if not completion:
+            return
+        with self._lock:
+            self.synthesis_tokens += self.smoothing * (completion - self.synthesis_tokens)
+            self.observations += 1
+
+    def summary(self) -> dict:
+        return {
+            "article_tokens": round(self.article_tokens, 1),
+            "synthesis_tokens": round(self.synthesis_tokens, 1),
+            "observations": self.observations,
+        }
+
+
+def _clip(text: str, tokens: int) -> str:
+    """Cut text to roughly the given number of tokens at a word boundary"""
+    if tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= tokens:
+        return text
+    words = text.split()
+    # Start from the ~0.75 words/token ratio of English and shrink to fit
+    keep = max(1, int(tokens * 0.75))
+    while keep > 1 and estimate_tokens(" ".join(words[:keep])) > tokens:
+        keep = int(keep * 0.85)
+    return " ".join(words[:keep]) + "…"
+
+
+def pack_articles(articles: list, budget: int = SYNTHESIS_CONTEXT_TOKENS) -> str:
+    """
+    Render articles as synthesis context lines within a token budget
+
+    Every article keeps its title line; the budget left over is shared evenly
+    between the abstracts, and an abstract shorter than its share passes the
+    remainder on to the articles after it.
+
+    Args:
+        articles: Article objects (or dicts) or bare title strings
+        budget: Token budget for all lines together
+    """
+    heads = []
+    abstracts = []
+    for article in articles:
+        if isinstance(article, str):
+            heads.append(f"- {article}")
+            abstracts.append("")
+            continue
+        get = article.get if isinstance(article, dict) else lambda name: getattr(article, name, None)
+        details = ", ".join(str(value) for value in (get("publication_year"), get("venue")) if value and value != "Unknown")
+        heads.append(f"- {get('title')} ({details})" if details else f"- {get('title')}")
+        abstracts.append(get("abstract") or "")
+
+    remaining = budget - sum(estimate_tokens(head) for head in heads)
+    lines = []
+    pending = sum(1 for abstract in abstracts if abstract)
+    for head, abstract in zip(heads, abstracts):
+        if not abstract:
+            lines.append(head)
+            continue
+        share = remaining // pending if remaining > 0 else 0
+        pending -= 1
+        clipped = _clip(abstract, share)
+        if not clipped:
+            lines.append(head)
+            continue
+        remaining -= estimate_tokens(clipped) + 1
+        lines.append(f"{head}: {clipped}")
+    return "\n".join(lines)